@@ -12,10 +12,23 @@ __version__ = VERSION
 # --------------------------------------------------------------------------- #
 
 from .basesettings import BaseSettings
+from .circuitbreaker import CircuitBreaker
+from .circuitbreaker import CircuitBreakerRegistry
+from .circuitbreaker import RetryPolicy
 from .field import Field
+from .loadreport import LoadReport
 from .settingsconfigdict import SettingsConfigDict
+from .secretcache import SecretCache
+from .secretsnapshot import SecretSnapshot
+from .sharedsecrets import SharedSecrets
+from .settingssources import SecretLoadTimeoutError
+from .settingssources import SecretUnavailableError
 
 
 # --------------------------------------------------------------------------- #
 # Objects                                                                     #
 # --------------------------------------------------------------------------- #
+
+from .circuitbreaker import circuit_breakers
+from .secretcache import secret_cache
+from .sharedsecrets import shared_secrets
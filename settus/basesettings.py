@@ -1,26 +1,88 @@
 from __future__ import annotations as _annotations
 
+import contextlib
+import threading
+import time
+import warnings
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
 from pathlib import Path
-from collections import defaultdict
+from typing import TYPE_CHECKING
 from typing import Any
+from typing import Callable
+from typing import ClassVar
+from typing import Hashable
+from typing import Iterable
 from typing import Tuple
 from typing import Type
+from typing import TypeVar
+from typing import Union
 from pydantic import ConfigDict
-from pydantic import AliasChoices
+from pydantic import BaseModel as _BaseModel
+from pydantic import PrivateAttr
 from pydantic._internal._utils import deep_update
 from pydantic_settings import BaseSettings as _BaseSettings
 from pydantic_settings import PydanticBaseSettingsSource
 from pydantic_settings.sources import (
     ENV_FILE_SENTINEL,
-    DotEnvSettingsSource,
     DotenvType,
-    EnvSettingsSource,
     InitSettingsSource,
-    SecretsSettingsSource,
 )
 
+from settus.loadreport import FieldReport
+from settus.loadreport import LoadReport
+from settus.loadreport import SourceReport
+from settus.resolutionplan import ResolutionPlan
+from settus.secretsnapshot import SecretSnapshot
+from settus.sharedsecrets import shared_secrets
+from settus.settingssources.cloudsettingssource import CloudSettingsSource
+from settus.settingssources.cloudsettingssource import RequestExchange
+from settus.settingssources.cloudsettingssource import SecretLoadTimeoutError
+from settus.settingssources.cloudsettingssource import SecretUnavailableError
 from settus.settingssources.azurekeyvault import AzureKeyVault
 from settus.settingssources.awssecretsmanager import AWSSecretsManager
+from settus.settingssources.databrickssecrets import DatabricksSecrets
+from settus.settingssources.dotenvsettingssource import CachedDotEnvSettingsSource
+from settus.settingssources.envsettingssource import IndexedEnvSettingsSource
+from settus.settingssources.gcpsecretmanager import GCPSecretManager
+from settus.settingssources.secretsdirsettingssource import SecretsDirSettingsSource
+
+Model = TypeVar("Model", bound="BaseSettings")
+
+_variants_lock = threading.Lock()
+
+# Request exchange of the loads run by `load_many`
+_load_exchange: ContextVar[Union[RequestExchange, None]] = ContextVar(
+    "settus_load_exchange", default=None
+)
+
+DEFAULT_LOAD_CONCURRENCY = 8
+# Maximum number of `load_many` config variants kept per settings class
+MAX_LOAD_VARIANTS = 64
+
+
+def _freeze(value: Any) -> Hashable:
+    """
+    Hashable form of a config value, equal for equal values. Dicts, lists,
+    tuples and sets are frozen recursively.
+    """
+    if isinstance(value, dict):
+        items = sorted(
+            ((k, _freeze(v)) for k, v in value.items()), key=lambda i: repr(i[0])
+        )
+        return dict, tuple(items)
+    if isinstance(value, (list, tuple)):
+        return type(value), tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset, frozenset(_freeze(v) for v in value)
+    try:
+        hash(value)
+    except TypeError:
+        raise TypeError(
+            f"Config value {value!r} of type {type(value).__name__} is not" f" hashable"
+        ) from None
+    return value
 
 
 class BaseSettings(_BaseSettings):
@@ -51,17 +113,108 @@ class BaseSettings(_BaseSettings):
 
     model_config = ConfigDict(populate_by_name=True, extra="forbid")
 
+    _settus_plan: ClassVar[Union[ResolutionPlan, None]] = None
+    # Subclasses with model config overrides, created by `load_many`
+    _settus_variants: ClassVar[Union[OrderedDict, None]] = None
+
+    # Sources called during load and their values, used for refresh
+    _settus_sources: Tuple[PydanticBaseSettingsSource, ...] = PrivateAttr(default=())
+    _settus_values: list = PrivateAttr(default_factory=list)
+    _settus_refresher: Any = PrivateAttr(default=None)
+    _settus_report: Union[LoadReport, None] = PrivateAttr(default=None)
+    # Raw instrumentation of the load, turned into `_settus_report` on access
+    _settus_report_data: Any = PrivateAttr(default=None)
+    # Lazy fields not resolved yet, missing from `__dict__`
+    _settus_lazy: set = PrivateAttr(default_factory=set)
+    # Lock of refresh and lazy fields resolution
+    _settus_lock: Any = PrivateAttr(default_factory=threading.RLock)
+
+    def __init__(
+        __pydantic_self__,
+        _case_sensitive: bool | None = None,
+        _env_prefix: str | None = None,
+        _env_file: DotenvType | None = ENV_FILE_SENTINEL,
+        _env_file_encoding: str | None = None,
+        _env_nested_delimiter: str | None = None,
+        _secrets_dir: str | Path | None = None,
+        **values: Any,
+    ) -> None:
+        # Uses something other than `self` the first arg to allow "self" as a
+        # settable attribute
+        t0 = time.perf_counter()
+        records = []
+        with __pydantic_self__._settus_span(
+            "settus.load", settings=type(__pydantic_self__).__name__
+        ):
+            sources = __pydantic_self__._settus_build_sources(
+                values,
+                _case_sensitive=_case_sensitive,
+                _env_prefix=_env_prefix,
+                _env_file=_env_file,
+                _env_file_encoding=_env_file_encoding,
+                _env_nested_delimiter=_env_nested_delimiter,
+                _secrets_dir=_secrets_dir,
+            )
+            _sources = __pydantic_self__._settus_call_sources(sources, records)
+            values = __pydantic_self__._settus_merge_values(_sources)
+            _BaseModel.__init__(__pydantic_self__, **values)
+        __pydantic_self__._settus_sources = tuple(sources[: len(_sources)])
+        __pydantic_self__._settus_values = _sources
+        lazy = __pydantic_self__._settus_defer_lazy(values)
+        __pydantic_self__._settus_set_report(records, lazy, t0)
+
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs: Any) -> None:
+        super().__pydantic_init_subclass__(**kwargs)
+
+        # Compile resolution plan, including default cloud sources routes
+        plan = cls.settings_resolution_plan()
+        for source_cls in [
+            AzureKeyVault,
+            AWSSecretsManager,
+            GCPSecretManager,
+            DatabricksSecrets,
+        ]:
+            plan.get_routes(source_cls(cls))
+
+    @classmethod
+    def settings_resolution_plan(cls) -> ResolutionPlan:
+        """
+        Get the resolution plan of the settings class: aliases mapping and
+        cloud sources routing of each field. The plan is compiled once, when
+        the class is created, and re-used for every instantiation.
+
+        Returns
+        -------
+        :
+            Resolution plan
+        """
+        plan = cls.__dict__.get("_settus_plan")
+        if plan is None or plan.model_fields is not cls.model_fields:
+            plan = ResolutionPlan(cls)
+            cls._settus_plan = plan
+        return plan
+
     @property
     def model_field_alias(self) -> list:
-        aliases = []
-        for k, f in self.model_fields.items():
-            alias = f.alias
-            if isinstance(alias, str):
-                aliases += [(k, alias)]
-            elif isinstance(alias, AliasChoices):
-                for a in alias.choices:
-                    aliases += [(k, a)]
-        return aliases
+        return self._model_field_alias()
+
+    @classmethod
+    def _model_field_alias(cls) -> list:
+        return list(cls.settings_resolution_plan().field_aliases)
+
+    @property
+    def model_load_report(self) -> Union[LoadReport, None]:
+        """
+        Instrumentation of the load that built the settings instance:
+        duration, provider calls and cache hits/misses of each source and
+        field, and the source providing each field value. Built on first
+        access, unless a `load_report_callback` is set in the model config.
+        """
+        if self._settus_report is None and self._settus_report_data is not None:
+            with self._settus_lock:
+                self._settus_build_report()
+        return self._settus_report
 
     @classmethod
     def settings_customise_sources(
@@ -78,8 +231,12 @@ class BaseSettings(_BaseSettings):
 
         * Init values
         * Environment variables
+        * Dotenv files
+        * Secrets directory files
         * Azure keyvault settings
         * AWS Secrets Manager
+        * GCP Secret Manager
+        * Databricks secrets
 
         Parameters
         ----------
@@ -98,11 +255,405 @@ class BaseSettings(_BaseSettings):
         return (
             init_settings,
             env_settings,
+            dotenv_settings,
+            file_secret_settings,
             AzureKeyVault(settings_cls),
             AWSSecretsManager(settings_cls),
-            # file_secret_settings,
+            GCPSecretManager(settings_cls),
+            DatabricksSecrets(settings_cls),
         )
 
+    @classmethod
+    async def aload(
+        cls: Type[Model],
+        _case_sensitive: bool | None = None,
+        _env_prefix: str | None = None,
+        _env_file: DotenvType | None = ENV_FILE_SENTINEL,
+        _env_file_encoding: str | None = None,
+        _env_nested_delimiter: str | None = None,
+        _secrets_dir: str | Path | None = None,
+        **values: Any,
+    ) -> Model:
+        """
+        Build settings asynchronously. Sources providing an `acall` coroutine
+        (all settus cloud sources) are awaited, other sources are called
+        directly. Cloud lookups are gathered concurrently and the event loop
+        is never blocked by a cloud provider SDK. Lazy fields (`secret_lazy`)
+        are resolved during load, as resolving them on first access would
+        block the event loop.
+
+        Parameters
+        ----------
+        values:
+            Fields init values
+
+        Returns
+        -------
+        :
+            Settings instance
+
+        Examples
+        --------
+        ```py
+        import asyncio
+        import os
+        from settus import BaseSettings
+        from settus import Field
+
+        os.environ["MY_ENV"] = "my_value"
+
+        class Settings(BaseSettings):
+            my_env: str = Field(default="undefined")
+
+        settings = asyncio.run(Settings.aload())
+        print(settings)
+        #> my_env='my_value'
+        ```
+        """
+        t0 = time.perf_counter()
+        records = []
+        with cls._settus_span("settus.load", settings=cls.__name__):
+            sources = cls._settus_build_sources(
+                values,
+                _case_sensitive=_case_sensitive,
+                _env_prefix=_env_prefix,
+                _env_file=_env_file,
+                _env_file_encoding=_env_file_encoding,
+                _env_nested_delimiter=_env_nested_delimiter,
+                _secrets_dir=_secrets_dir,
+            )
+
+            _sources = await cls._settus_acall_sources(sources, records)
+
+            # Sources are already resolved, so the pydantic-settings
+            # constructor is bypassed to only run validation.
+            settings = cls.__new__(cls)
+            values = cls._settus_merge_values(_sources)
+            _BaseModel.__init__(settings, **values)
+        settings._settus_sources = tuple(sources[: len(_sources)])
+        settings._settus_values = _sources
+        settings._settus_set_report(records, [], t0)
+        return settings
+
+    @classmethod
+    def load_many(
+        cls: Type[Model],
+        variations: Iterable[dict[str, Any]],
+        concurrency: int | None = None,
+    ) -> list[Union[Model, Exception]]:
+        """
+        Build many settings instances at once, typically one per tenant or
+        environment. Each variation provides the init values of an instance,
+        including `_env_prefix`, `_env_file`, etc., and may override the
+        model config (`keyvault_url`, `aws_secret_name`, etc.) with a
+        `_config` dictionary.
+
+        Instances are built concurrently and share their provider requests:
+        a secret required by multiple instances is fetched only once.
+        Provider clients and credentials are shared through the client
+        pools. A subclass of the settings class is created once for each
+        distinct `_config`, compared by value, and re-used by later calls
+        (up to `MAX_LOAD_VARIANTS` per class, least recently used first
+        discarded).
+        `_config` values must be hashable, or dicts, lists, tuples or sets of
+        hashable values.
+
+        Parameters
+        ----------
+        variations:
+            Init values of each instance
+        concurrency:
+            Number of instances built concurrently. 8 if `None`.
+
+        Returns
+        -------
+        :
+            Settings instance of each variation, in order, or the exception
+            raised while building it
+
+        Examples
+        --------
+        ```py
+        import os
+        from settus import BaseSettings
+        from settus import Field
+
+        os.environ["DEV_MY_ENV"] = "dev_value"
+        os.environ["PRD_MY_ENV"] = "prd_value"
+
+        class Settings(BaseSettings):
+            my_env: str = Field(default="undefined")
+
+        variations = [{"_env_prefix": "dev_"}, {"_env_prefix": "prd_"}]
+        settings = Settings.load_many(variations)
+        print([s.my_env for s in settings])
+        #> ['dev_value', 'prd_value']
+        ```
+        """
+        variations = [dict(v) for v in variations]
+        if not variations:
+            return []
+        exchange = RequestExchange()
+
+        def _load(values: dict[str, Any]) -> Model:
+            token = _load_exchange.set(exchange)
+            try:
+                settings_cls = cls._settus_variant(values.pop("_config", None))
+                return settings_cls(**values)
+            finally:
+                _load_exchange.reset(token)
+
+        concurrency = min(concurrency or DEFAULT_LOAD_CONCURRENCY, len(variations))
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [executor.submit(_load, v) for v in variations]
+
+        # Errors are returned in place of the instances, except interrupts
+        results = []
+        for f in futures:
+            error = f.exception()
+            results += [error if isinstance(error, Exception) else f.result()]
+        return results
+
+    @classmethod
+    def _settus_variant(cls, config: dict[str, Any] | None) -> Type[BaseSettings]:
+        """
+        Get the subclass of the settings class overriding its model config
+        with `config`. Subclasses are created once per distinct config, as
+        compared by value, and the `MAX_LOAD_VARIANTS` most recently used
+        are kept.
+        """
+        if not config:
+            return cls
+
+        key = _freeze(config)
+
+        with _variants_lock:
+            variants = cls.__dict__.get("_settus_variants")
+            if variants is None:
+                variants = cls._settus_variants = OrderedDict()
+            variant = variants.get(key)
+            if variant is not None:
+                variants.move_to_end(key)
+            else:
+                variant = variants[key] = type(
+                    cls.__name__,
+                    (cls,),
+                    {
+                        "__module__": cls.__module__,
+                        "__qualname__": cls.__qualname__,
+                        "model_config": dict(config),
+                    },
+                )
+                while len(variants) > MAX_LOAD_VARIANTS:
+                    variants.popitem(last=False)
+        return variant
+
+    def refresh(self) -> list[str]:
+        """
+        Refresh fields values provided by cloud sources. Version metadata of
+        the secrets used during load is requested from the providers and
+        only rotated secrets are fetched again. Affected fields are validated
+        and updated in place.
+
+        Returns
+        -------
+        :
+            Names of the fields with an updated value
+
+        Examples
+        --------
+        ```py
+        from settus import BaseSettings
+        from settus import Field
+        from settus import SettingsConfigDict
+
+        class Settings(BaseSettings):
+            model_config = SettingsConfigDict(
+                keyvault_url="https://o3-kv-settus-dev.vault.azure.net/"
+            )
+            my_azure_secret: str = Field(default="undefined", alias="my-secret")
+
+        settings = Settings()
+        print(settings.refresh())
+        #> []
+        ```
+        """
+        with self._settus_lock:
+            # Sources statistics are about to change
+            self._settus_build_report()
+            _sources = list(self._settus_values)
+            updated = False
+            for i, s in enumerate(self._settus_sources):
+                if isinstance(s, CloudSettingsSource) and s.refresh():
+                    _sources[i] = self._settus_map_aliases(s())
+                    updated = True
+
+            if not updated:
+                return []
+
+            new = self.__class__.__new__(self.__class__)
+            _BaseModel.__init__(new, **self._settus_merge_values(_sources))
+            self._settus_values = _sources
+
+            changed = []
+            for k in self.model_fields:
+                if k in self._settus_lazy:
+                    continue
+                if new.__dict__[k] != self.__dict__[k]:
+                    self.__dict__[k] = new.__dict__[k]
+                    changed += [k]
+
+        return changed
+
+    def start_refresher(
+        self,
+        interval: float,
+        callback: Callable[[list[str]], Any] | None = None,
+    ) -> None:
+        """
+        Start a background thread calling `refresh` periodically.
+
+        Parameters
+        ----------
+        interval:
+            Time (in seconds) between two refreshes
+        callback:
+            Function called with the names of the updated fields after each
+            refresh updating at least one field.
+        """
+        self.stop_refresher()
+
+        stop = threading.Event()
+
+        def _run():
+            while not stop.wait(interval):
+                # Any provider or callback error is reported, the thread
+                # keeps running
+                try:
+                    changed = self.refresh()
+                    if changed and callback is not None:
+                        callback(changed)
+                except Exception as e:  # noqa: BLE001
+                    warnings.warn(f"Settings refresh failed: {e!r}")
+
+        thread = threading.Thread(
+            target=_run, name=f"settus-refresher-{id(self)}", daemon=True
+        )
+        self._settus_refresher = (thread, stop)
+        thread.start()
+
+    def stop_refresher(self, timeout: float | None = None) -> None:
+        """
+        Stop background refresher thread, if started.
+
+        Parameters
+        ----------
+        timeout:
+            Maximum time (in seconds) to wait for the thread to terminate.
+        """
+        if self._settus_refresher is None:
+            return
+        thread, stop = self._settus_refresher
+        self._settus_refresher = None
+        stop.set()
+        if thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def resolve_lazy_fields(self, field_names: list[str] | None = None) -> list[str]:
+        """
+        Resolve lazy fields not accessed yet. Lazy fields are otherwise
+        resolved on first access, or all at once when the model is dumped,
+        compared or copied.
+
+        Parameters
+        ----------
+        field_names:
+            Names of the fields to resolve. All pending lazy fields if
+            `None`.
+
+        Returns
+        -------
+        :
+            Names of the resolved fields
+
+        Examples
+        --------
+        ```py
+        from settus import BaseSettings
+        from settus import Field
+        from settus import SettingsConfigDict
+
+        class Settings(BaseSettings):
+            model_config = SettingsConfigDict(
+                keyvault_url="https://o3-kv-settus-dev.vault.azure.net/",
+                secret_lazy=True,
+            )
+            my_azure_secret: str = Field(default="undefined", alias="my-secret")
+
+        settings = Settings()
+        print(settings.model_load_report.calls)
+        #> 0
+        print(settings.my_azure_secret)
+        #> secretsauce
+        ```
+        """
+        return self._settus_resolve_lazy(field_names)
+
+    if not TYPE_CHECKING:
+
+        def __getattr__(self, name: str) -> Any:
+            # Pending lazy fields are missing from `__dict__`
+            if not name.startswith("_"):
+                try:
+                    pending = self.__pydantic_private__["_settus_lazy"]
+                except (AttributeError, KeyError, TypeError):
+                    pending = ()
+                if name in pending:
+                    self._settus_resolve_lazy([name])
+                    return self.__dict__[name]
+            return super().__getattr__(name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Assigned lazy fields are no longer pending
+        if not name.startswith("_"):
+            private = getattr(self, "__pydantic_private__", None) or {}
+            private.get("_settus_lazy", set()).discard(name)
+        super().__setattr__(name, value)
+
+    def model_dump(self, *args, **kwargs) -> dict[str, Any]:
+        self._settus_resolve_lazy()
+        return super().model_dump(*args, **kwargs)
+
+    def model_dump_json(self, *args, **kwargs) -> str:
+        self._settus_resolve_lazy()
+        return super().model_dump_json(*args, **kwargs)
+
+    def __eq__(self, other: Any) -> bool:
+        self._settus_resolve_lazy()
+        if isinstance(other, BaseSettings):
+            other._settus_resolve_lazy()
+        return super().__eq__(other)
+
+    def __iter__(self) -> Any:
+        self._settus_resolve_lazy()
+        return super().__iter__()
+
+    def __repr_args__(self) -> Any:
+        self._settus_resolve_lazy()
+        return super().__repr_args__()
+
+    def __copy__(self: Model) -> Model:
+        self._settus_resolve_lazy()
+        return super().__copy__()
+
+    def __deepcopy__(self: Model, memo: dict[int, Any] | None = None) -> Model:
+        self._settus_resolve_lazy()
+        return super().__deepcopy__(memo)
+
+    def __getstate__(self) -> dict[Any, Any]:
+        self._settus_resolve_lazy()
+        return super().__getstate__()
+
     def _settings_build_values(
         self,
         init_kwargs: dict[str, Any],
@@ -113,25 +664,47 @@ class BaseSettings(_BaseSettings):
         _env_nested_delimiter: str | None = None,
         _secrets_dir: str | Path | None = None,
     ) -> dict[str, Any]:
+        sources = self._settus_build_sources(
+            init_kwargs,
+            _case_sensitive=_case_sensitive,
+            _env_prefix=_env_prefix,
+            _env_file=_env_file,
+            _env_file_encoding=_env_file_encoding,
+            _env_nested_delimiter=_env_nested_delimiter,
+            _secrets_dir=_secrets_dir,
+        )
+        return self._settus_merge_values(self._settus_call_sources(sources))
+
+    @classmethod
+    def _settus_build_sources(
+        cls,
+        init_kwargs: dict[str, Any],
+        _case_sensitive: bool | None = None,
+        _env_prefix: str | None = None,
+        _env_file: DotenvType | None = None,
+        _env_file_encoding: str | None = None,
+        _env_nested_delimiter: str | None = None,
+        _secrets_dir: str | Path | None = None,
+    ) -> Tuple[PydanticBaseSettingsSource, ...]:
         # ------------------------------------------------------------------- #
         # Settus-specific validation                                          #
         # ------------------------------------------------------------------- #
 
         # Config
-        if not self.model_config["populate_by_name"]:
+        if not cls.model_config["populate_by_name"]:
             raise ValueError(
                 "Model configuration `populate_by_name` must be set to False"
                 " when using settus.BaseSettings"
             )
 
         # Initialization values
-        for k in init_kwargs:
-            for f, a in self.model_field_alias:
-                if k == a:
-                    raise AttributeError(
-                        f"Attribute {a} is an alias and should not be set in the class"
-                        f"initialization. Instead set {f} to avoid conflicts."
-                    )
+        plan = cls.settings_resolution_plan()
+        for a in plan.aliases.intersection(init_kwargs):
+            f = plan.alias_map[a][0]
+            raise AttributeError(
+                f"Attribute {a} is an alias and should not be set in the class"
+                f"initialization. Instead set {f} to avoid conflicts."
+            )
 
         # ------------------------------------------------------------------- #
         # END-OF-VALIDATION                                                   #
@@ -141,44 +714,44 @@ class BaseSettings(_BaseSettings):
         case_sensitive = (
             _case_sensitive
             if _case_sensitive is not None
-            else self.model_config.get("case_sensitive")
+            else cls.model_config.get("case_sensitive")
         )
         env_prefix = (
             _env_prefix
             if _env_prefix is not None
-            else self.model_config.get("env_prefix")
+            else cls.model_config.get("env_prefix")
         )
         env_file = (
             _env_file
             if _env_file != ENV_FILE_SENTINEL
-            else self.model_config.get("env_file")
+            else cls.model_config.get("env_file")
         )
         env_file_encoding = (
             _env_file_encoding
             if _env_file_encoding is not None
-            else self.model_config.get("env_file_encoding")
+            else cls.model_config.get("env_file_encoding")
         )
         env_nested_delimiter = (
             _env_nested_delimiter
             if _env_nested_delimiter is not None
-            else self.model_config.get("env_nested_delimiter")
+            else cls.model_config.get("env_nested_delimiter")
         )
         secrets_dir = (
             _secrets_dir
             if _secrets_dir is not None
-            else self.model_config.get("secrets_dir")
+            else cls.model_config.get("secrets_dir")
         )
 
         # Configure built-in sources
-        init_settings = InitSettingsSource(self.__class__, init_kwargs=init_kwargs)
-        env_settings = EnvSettingsSource(
-            self.__class__,
+        init_settings = InitSettingsSource(cls, init_kwargs=init_kwargs)
+        env_settings = IndexedEnvSettingsSource(
+            cls,
             case_sensitive=case_sensitive,
             env_prefix=env_prefix,
             env_nested_delimiter=env_nested_delimiter,
         )
-        dotenv_settings = DotEnvSettingsSource(
-            self.__class__,
+        dotenv_settings = CachedDotEnvSettingsSource(
+            cls,
             env_file=env_file,
             env_file_encoding=env_file_encoding,
             case_sensitive=case_sensitive,
@@ -186,53 +759,427 @@ class BaseSettings(_BaseSettings):
             env_nested_delimiter=env_nested_delimiter,
         )
 
-        file_secret_settings = SecretsSettingsSource(
-            self.__class__,
+        file_secret_settings = SecretsDirSettingsSource(
+            cls,
             secrets_dir=secrets_dir,
             case_sensitive=case_sensitive,
             env_prefix=env_prefix,
         )
         # Provide a hook to set built-in sources priority and add / remove sources
-        sources = self.settings_customise_sources(
-            self.__class__,
+        sources = cls.settings_customise_sources(
+            cls,
             init_settings=init_settings,
             env_settings=env_settings,
             dotenv_settings=dotenv_settings,
             file_secret_settings=file_secret_settings,
         )
-        if sources:
-            # --------------------------------------------------------------- #
-            # Settus-specific parsing                                         #
-            # --------------------------------------------------------------- #
-
-            # This section is re-written from base class to map all alias to
-            # field names. This helps prevent issues when a value is found for
-            # both the field name and the alias(es). A common scenario is when
-            # a value is found for both an environment variable matching the
-            # alias and an init value matching the field name.
-
-            # Build map
-            _map = defaultdict(lambda: [])
-            for k, f in self.model_fields.items():
-                alias = f.alias
-                if isinstance(alias, str):
-                    _map[alias] += [k]
-                elif isinstance(alias, AliasChoices):
-                    for a in alias.choices:
-                        _map[a] += [k]
+        return sources
+
+    @classmethod
+    def _settus_call_sources(
+        cls,
+        sources: Tuple[PydanticBaseSettingsSource, ...],
+        records: list[tuple] | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Call sources in priority order and return their values, with aliases
+        mapped to field names. Sources instrumentation is added to `records`
+        if provided.
+        """
+        cls._settus_set_deadline(sources)
+        snapshot = cls._settus_load_snapshot(sources)
+
+        _sources = []
+        durations = []
+        for s in sources:
+            if not cls._settus_restrict_source(s, _sources):
+                break
+            t0 = time.perf_counter()
+            with cls._settus_span("settus.source", source=type(s).__name__):
+                _sources += [cls._settus_map_aliases(s())]
+            durations += [time.perf_counter() - t0]
+
+        cls._settus_save_snapshot(snapshot, sources)
+
+        if records is not None:
+            records += cls._settus_record_sources(sources, durations)
+
+        cls._settus_check_timeouts(sources)
+
+        return _sources
+
+    @classmethod
+    async def _settus_acall_sources(
+        cls,
+        sources: Tuple[PydanticBaseSettingsSource, ...],
+        records: list[tuple] | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Asynchronous version of `_settus_call_sources`.
+        """
+        cls._settus_set_deadline(sources)
+        snapshot = cls._settus_load_snapshot(sources)
+
+        _sources = []
+        durations = []
+        for s in sources:
+            if not cls._settus_restrict_source(s, _sources, defer_lazy=False):
+                break
+            t0 = time.perf_counter()
+            with cls._settus_span("settus.source", source=type(s).__name__):
+                if hasattr(s, "acall"):
+                    _sources += [cls._settus_map_aliases(await s.acall())]
+                else:
+                    _sources += [cls._settus_map_aliases(s())]
+            durations += [time.perf_counter() - t0]
+
+        cls._settus_save_snapshot(snapshot, sources)
+
+        if records is not None:
+            records += cls._settus_record_sources(sources, durations)
+
+        cls._settus_check_timeouts(sources)
+
+        return _sources
+
+    @classmethod
+    def _settus_set_deadline(
+        cls, sources: Tuple[PydanticBaseSettingsSource, ...]
+    ) -> None:
+        """
+        Set the deadline of cloud sources from `secret_load_timeout`, and the
+        request exchange shared by the loads of `load_many`.
+        """
+        timeout = cls.model_config.get("secret_load_timeout")
+        deadline = None if timeout is None else time.monotonic() + timeout
+        exchange = _load_exchange.get()
+        for s in sources:
+            if isinstance(s, CloudSettingsSource):
+                s.deadline = deadline
+                s.exchange = exchange
+
+    @classmethod
+    def _settus_check_timeouts(
+        cls, sources: Tuple[PydanticBaseSettingsSource, ...]
+    ) -> None:
+        """
+        Clear cloud sources deadline and exchange, and raise an error for the
+        fields that timed out or whose provider was unavailable with a `raise`
+        policy.
+        """
+        fields = {}
+        unavailable = {}
+        for s in sources:
+            if not isinstance(s, CloudSettingsSource):
+                continue
+            s.deadline = None
+            s.exchange = None
+            for k, policy in s.timed_out_fields.items():
+                if policy == "raise":
+                    fields.setdefault(k, s.provider)
+            for k, policy in s.unavailable_fields.items():
+                if policy == "raise":
+                    unavailable.setdefault(k, s.provider)
+        if fields:
+            raise SecretLoadTimeoutError(
+                cls.model_config["secret_load_timeout"], fields
+            )
+        if unavailable:
+            raise SecretUnavailableError(unavailable)
+
+    @classmethod
+    def _settus_span(cls, name: str, **attributes: Any) -> Any:
+        """
+        Open a span with the `load_span_hook` set in the model config, if
+        any.
+        """
+        hook = cls.model_config.get("load_span_hook")
+        if hook is None:
+            return contextlib.nullcontext()
+        return hook(name, {f"settus.{k}": v for k, v in attributes.items()})
+
+    @classmethod
+    def _settus_record_sources(
+        cls,
+        sources: Tuple[PydanticBaseSettingsSource, ...],
+        durations: list[float],
+    ) -> list[tuple]:
+        """
+        Record the duration of each called source and, for cloud sources, the
+        statistics and failures that later resolutions would reset.
+        """
+        records = []
+        for s, duration in zip(sources, durations):
+            stats = None
+            if isinstance(s, CloudSettingsSource):
+                stats = (
+                    s.get_stats(),
+                    {str(k): v for k, v in s.errors.items()},
+                    set(s.timed_out_fields),
+                    set(s.unavailable_fields),
+                )
+            records += [(duration, stats)]
+        return records
+
+    def _settus_set_report(
+        self, records: list[tuple], lazy: list[str], t0: float
+    ) -> None:
+        """
+        Store load instrumentation and send the load report to the
+        `load_report_callback` set in the model config, if any. Otherwise the
+        report is only built on first access to `model_load_report`.
+        """
+        self._settus_report = None
+        self._settus_report_data = (time.perf_counter() - t0, records, lazy)
+        callback = self.model_config.get("load_report_callback")
+        if callback is not None:
+            callback(self.model_load_report)
+
+    def _settus_build_report(self) -> None:
+        """
+        Build the load report from the recorded instrumentation, if not built
+        yet. The value of a field is provided by the highest priority source
+        returning it.
+        """
+        if self._settus_report_data is None:
+            return
+        duration, records, lazy = self._settus_report_data
+        self._settus_report_data = None
+
+        fields = type(self).model_fields
+        report = LoadReport(settings=type(self).__name__, duration=duration)
+        winners = {}
+        cloud_sources = []
+        for s, d, (_duration, _stats) in zip(
+            self._settus_sources, self._settus_values, records
+        ):
+            source_report = SourceReport(
+                name=type(s).__name__,
+                duration=_duration,
+                fields=[k for k in d if k in fields],
+            )
+            if _stats is not None:
+                stats, errors, timed_out, unavailable = _stats
+                source_report.calls = stats["calls"]
+                source_report.cache_hits = stats["cache_hits"]
+                source_report.cache_misses = stats["cache_misses"]
+                source_report.errors = errors
+                cloud_sources += [(s, timed_out, unavailable)]
+            for k in source_report.fields:
+                winners.setdefault(k, source_report.name)
+            report.sources += [source_report]
+
+        for k in fields:
+            field_report = FieldReport(source=winners.get(k), lazy=k in lazy)
+            for s, timed_out, unavailable in cloud_sources:
+                stats = s.get_field_stats(k)
+                field_report.duration += stats["duration"]
+                field_report.calls += stats["calls"]
+                field_report.cache_hits += stats["cache_hits"]
+                field_report.cache_misses += stats["cache_misses"]
+                field_report.timed_out |= k in timed_out
+                field_report.unavailable |= (
+                    k in unavailable or k in s.unavailable_fields
+                )
+            report.fields[k] = field_report
+        self._settus_report = report
+
+    def _settus_defer_lazy(self, values: dict[str, Any]) -> list[str]:
+        """
+        Remove lazy fields not resolved by the load from the instance, so that
+        they are resolved on first access, and return their names.
+        """
+        lazy = self.settings_resolution_plan().lazy_fields
+        if not lazy:
+            return []
+        deferred = list(lazy.difference(values))
+        for k in deferred:
+            del self.__dict__[k]
+            self._settus_lazy.add(k)
+        return deferred
+
+    def _settus_resolve_lazy(self, field_names: list[str] | None = None) -> list[str]:
+        """
+        Resolve pending lazy fields from the cloud sources called during load
+        and validate their values. Requests already fetched by the sources
+        are not sent again.
+        """
+        if not self._settus_lazy:
+            return []
+
+        with self._settus_lock:
+            if field_names is None:
+                field_names = list(self._settus_lazy)
+            field_names = [k for k in field_names if k in self._settus_lazy]
+            if not field_names:
+                return []
 
             _sources = []
-            for d in [s() for s in sources]:
-                for k, v in list(d.items()):
-                    if k in _map:
-                        for _v in _map[k]:
-                            d[_v] = v
-                            if _v not in d:
-                                d[_v] = v
-                        del d[k]
+            unresolved = list(field_names)
+            for i, s in enumerate(self._settus_sources):
+                if not isinstance(s, CloudSettingsSource) or not unresolved:
+                    _sources += [{}]
+                    continue
+                s.reset_failures()
+                names = s.field_names
+                s.field_names = unresolved
+                try:
+                    d = self._settus_map_aliases(s())
+                finally:
+                    if names is not None:
+                        s.field_names = names + unresolved
+                self._settus_values[i].update(d)
                 _sources += [d]
+                unresolved = [k for k in unresolved if k not in d]
+            self._settus_check_timeouts(self._settus_sources)
+
+            values = self._settus_merge_values(_sources)
+            for k in field_names:
+                if k in values:
+                    self.__pydantic_validator__.validate_assignment(self, k, values[k])
+                else:
+                    field = type(self).model_fields[k]
+                    self.__dict__[k] = field.get_default(call_default_factory=True)
+                self._settus_lazy.discard(k)
+                self._settus_report_lazy(k, _sources)
+
+        return field_names
+
+    def _settus_report_lazy(
+        self, field_name: str, values: list[dict[str, Any]]
+    ) -> None:
+        """
+        Update the load report of a lazy field once resolved.
+        """
+        report = self._settus_report
+        if report is None:
+            return
+        field_report = report.fields[field_name]
+        for s, d in zip(self._settus_sources, values):
+            if not isinstance(s, CloudSettingsSource):
+                continue
+            if field_name in d and field_report.source is None:
+                field_report.source = type(s).__name__
+            stats = s.get_field_stats(field_name)
+            field_report.duration += stats["duration"]
+            field_report.calls += stats["calls"]
+            field_report.cache_hits += stats["cache_hits"]
+            field_report.cache_misses += stats["cache_misses"]
+            field_report.unavailable |= field_name in s.unavailable_fields
+
+    @classmethod
+    def _settus_load_snapshot(
+        cls, sources: Tuple[PydanticBaseSettingsSource, ...]
+    ) -> SecretSnapshot | None:
+        """
+        Warm-start cloud sources from the values shared by a parent process
+        and from the secret snapshot, if configured and fresh.
+        """
+        values = shared_secrets.attach()
+        snapshot = SecretSnapshot.from_config(cls.model_config)
+        if snapshot is None and values is None:
+            return None
+
+        if snapshot is not None:
+            _values = snapshot.load()
+            if _values is not None:
+                values = {**_values, **(values or {})}
+        for s in sources:
+            if isinstance(s, CloudSettingsSource):
+                s.snapshot = values
+        return snapshot
+
+    @classmethod
+    def _settus_save_snapshot(
+        cls,
+        snapshot: SecretSnapshot | None,
+        sources: Tuple[PydanticBaseSettingsSource, ...],
+    ) -> None:
+        """
+        Write values fetched by cloud sources to the secret snapshot, with
+        the values read from the snapshot keeping their fetch time. The
+        snapshot is only re-written when at least one value was fetched.
+        """
+        if snapshot is None:
+            return
+
+        values = {}
+        fetched = {}
+        for s in sources:
+            if isinstance(s, CloudSettingsSource):
+                values.update(s.snapshot or {})
+                fetched.update(s.fetched)
+
+        if fetched:
+            snapshot.save({**values, **fetched}, fetched=fetched)
 
-            return deep_update(*reversed(_sources))
+    @classmethod
+    def _settus_restrict_source(
+        cls,
+        source: PydanticBaseSettingsSource,
+        values: list[dict[str, Any]],
+        defer_lazy: bool = True,
+    ) -> bool:
+        """
+        Restrict a source to the fields not resolved by the higher priority
+        sources. A field with a dict value is not considered resolved as it
+        might be completed by a lower priority source.
+
+        Returns `False` if all fields are already resolved, in which case the
+        source (and all lower priority sources) should not be called. Cloud
+        sources are only given the fields routed to their provider by the
+        resolution plan, and skip lazy fields if `defer_lazy` is `True`.
+        """
+        resolved = set()
+        for d in values:
+            for k, v in d.items():
+                if not isinstance(v, dict):
+                    resolved.add(k)
+
+        if all(k in resolved for k in cls.model_fields):
+            return False
+
+        # Cloud sources are restricted to the fields routed to their
+        # provider. Lazy fields are resolved on first access, but the source
+        # is still called so that it's kept for later resolution.
+        if isinstance(source, CloudSettingsSource):
+            plan = cls.settings_resolution_plan()
+            lazy = plan.lazy_fields if defer_lazy else ()
+            source.field_names = [
+                k
+                for k in plan.get_routed_fields(source)
+                if k not in resolved and k not in lazy
+            ]
+        elif isinstance(source, SecretsDirSettingsSource):
+            source.field_names = [k for k in cls.model_fields if k not in resolved]
+
+        return True
+
+    @classmethod
+    def _settus_map_aliases(cls, d: dict[str, Any]) -> dict[str, Any]:
+        # --------------------------------------------------------------- #
+        # Settus-specific parsing                                         #
+        # --------------------------------------------------------------- #
+
+        # This section is re-written from base class to map all alias to
+        # field names. This helps prevent issues when a value is found for
+        # both the field name and the alias(es). A common scenario is when
+        # a value is found for both an environment variable matching the
+        # alias and an init value matching the field name.
+        _map = cls.settings_resolution_plan().alias_map
+        for k, v in list(d.items()):
+            if k in _map:
+                for _v in _map[k]:
+                    d[_v] = v
+                    if _v not in d:
+                        d[_v] = v
+                del d[k]
+        return d
+
+    @classmethod
+    def _settus_merge_values(cls, sources: list[dict[str, Any]]) -> dict[str, Any]:
+        if sources:
+            return deep_update(*reversed(sources))
 
         else:
             # no one should mean to do this, but I think returning an empty dict is marginally preferable
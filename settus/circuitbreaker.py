@@ -0,0 +1,236 @@
+import random
+import threading
+import time
+from typing import Any, Dict, Hashable, Iterator, List, Tuple, Union
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker of a cloud secrets provider endpoint. After
+    `threshold` consecutive failures, the circuit opens and requests are not
+    sent for `cooldown` seconds. A single trial request is then allowed
+    (half-open): its success closes the circuit, its failure opens it again.
+
+    Parameters
+    ----------
+    threshold:
+        Number of consecutive failures opening the circuit
+    cooldown:
+        Time (in seconds) during which an open circuit rejects requests
+    """
+
+    def __init__(self, threshold: int, cooldown: float = 30.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Union[float, None] = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Circuit state: `closed`, `open` or `half_open`"""
+        if self.opened_at is None:
+            return CLOSED
+        if time.monotonic() - self.opened_at < self.cooldown:
+            return OPEN
+        return HALF_OPEN
+
+    def allow(self) -> bool:
+        """
+        Check if a request can be sent.
+
+        Returns
+        -------
+        :
+            `True` if the circuit is closed, or if half-open and no trial
+            request is pending.
+        """
+        with self._lock:
+            state = self.state
+            if state == CLOSED:
+                return True
+            if state == OPEN or self._trial:
+                return False
+            self._trial = True
+            return True
+
+    def record_success(self) -> None:
+        """
+        Record a successful request, closing the circuit.
+        """
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def release(self) -> None:
+        """
+        Release the pending trial request without recording its outcome, when
+        it failed with an error unrelated to the endpoint health. Another
+        trial request is allowed.
+        """
+        with self._lock:
+            self._trial = False
+
+    def record_failure(self) -> None:
+        """
+        Record a failed request, opening the circuit if the threshold is
+        reached or if the trial request failed.
+        """
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+            self._trial = False
+
+
+class CircuitBreakerRegistry:
+    """
+    Process-wide registry of circuit breakers, with one breaker per provider
+    endpoint (keyvault URL, AWS region, etc.).
+
+    Circuit breakers are enabled per settings class through
+    `SettingsConfigDict`:
+
+    * `secret_breaker_threshold`: number of consecutive failures opening the
+      circuit
+    * `secret_breaker_cooldown`: time (in seconds) during which requests are
+      not sent to an endpoint with an open circuit
+
+    Examples
+    --------
+    ```py
+    from settus import circuit_breakers
+
+    # Health check
+    unhealthy = [b for b in circuit_breakers.states() if b["state"] != "closed"]
+    ```
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._breakers: Dict[Tuple[str, Hashable], CircuitBreaker] = {}
+
+    def get(
+        self, provider: str, endpoint: Hashable, threshold: int, cooldown: float
+    ) -> CircuitBreaker:
+        """
+        Get circuit breaker of an endpoint, created on first request.
+        Threshold and cooldown are updated with the provided values.
+
+        Parameters
+        ----------
+        provider:
+            Provider name
+        endpoint:
+            Provider endpoint
+        threshold:
+            Number of consecutive failures opening the circuit
+        cooldown:
+            Time (in seconds) during which an open circuit rejects requests
+
+        Returns
+        -------
+        :
+            Circuit breaker
+        """
+        key = (provider, endpoint)
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                breaker = self._breakers[key] = CircuitBreaker(threshold, cooldown)
+            breaker.threshold = threshold
+            breaker.cooldown = cooldown
+            return breaker
+
+    def states(self) -> List[Dict[str, Any]]:
+        """
+        Get the state of all circuit breakers, for health checks.
+
+        Returns
+        -------
+        :
+            Provider, endpoint, state and number of consecutive failures of
+            each breaker
+        """
+        with self._lock:
+            items = list(self._breakers.items())
+        return [
+            {
+                "provider": provider,
+                "endpoint": endpoint,
+                "state": b.state,
+                "failures": b.failures,
+            }
+            for (provider, endpoint), b in items
+        ]
+
+    def reset(self) -> None:
+        """
+        Remove all circuit breakers, closing all circuits.
+        """
+        with self._lock:
+            self._breakers = {}
+
+    def __len__(self) -> int:
+        return len(self._breakers)
+
+
+circuit_breakers = CircuitBreakerRegistry()
+
+
+class RetryPolicy:
+    """
+    Retry policy of failed provider calls, with exponential backoff and full
+    jitter: the delay before retry `i` is drawn uniformly between 0 and
+    `min(max_backoff, backoff * 2 ** i)`.
+
+    Parameters
+    ----------
+    attempts:
+        Maximum number of attempts, including the first call
+    backoff:
+        Base delay (in seconds)
+    max_backoff:
+        Maximum delay (in seconds)
+    """
+
+    def __init__(self, attempts: int = 1, backoff: float = 0.1, max_backoff=2.0):
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    @classmethod
+    def from_config(cls, config: dict) -> "RetryPolicy":
+        """
+        Build retry policy from settings config.
+
+        Parameters
+        ----------
+        config:
+            Settings config
+
+        Returns
+        -------
+        :
+            Retry policy. A single attempt is made if `secret_retry_attempts`
+            is not set.
+        """
+        kwargs = {
+            "attempts": config.get("secret_retry_attempts"),
+            "backoff": config.get("secret_retry_backoff"),
+            "max_backoff": config.get("secret_retry_max_backoff"),
+        }
+        return cls(**{k: v for k, v in kwargs.items() if v is not None})
+
+    def delays(self) -> Iterator[float]:
+        """
+        Delays (in seconds) before each retry.
+        """
+        for i in range(self.attempts - 1):
+            yield random.uniform(0, min(self.max_backoff, self.backoff * 2**i))
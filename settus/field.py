@@ -1,19 +1,17 @@
 from typing import Union
-from typing import Any
+from typing import TYPE_CHECKING
 from pydantic import Field as _Field
 from pydantic.fields import FieldInfo as _FieldInfo
 
 
-C = Any
-try:
-    from azure.core.credentials import TokenCredential as C
-except ModuleNotFoundError:
-    pass
+if TYPE_CHECKING:
+    # Type annotations only, azure SDK is imported by the keyvault source
+    from azure.core.credentials import TokenCredential
 
 
 class FieldInfo(_FieldInfo):
     kayvault_url: Union[str, None] = None
-    kayvault_credentials: Union[C, None] = None
+    kayvault_credentials: Union["TokenCredential", None] = None
     aws_secret_name: Union[str, None] = None
     # TODO: Fix and use
 
@@ -21,7 +19,7 @@ class FieldInfo(_FieldInfo):
 def Field(
     *args,
     keyvault_url: str = None,
-    keyvault_credentials: C = None,
+    keyvault_credentials: "TokenCredential" = None,
     **kwargs,
 ) -> _Field:
     """
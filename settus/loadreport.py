@@ -0,0 +1,125 @@
+from typing import Dict, List, Union
+
+from pydantic import BaseModel
+from pydantic import Field
+
+
+class FieldReport(BaseModel):
+    """
+    Instrumentation of a field resolution.
+
+    Attributes
+    ----------
+    source:
+        Name of the source providing the field value. `None` if the default
+        value is used.
+    duration:
+        Time (in seconds) spent in provider calls the field depends on
+    calls:
+        Number of provider calls the field depends on
+    cache_hits:
+        Number of requests served by the secrets cache or snapshot, including
+        keys known to be missing
+    cache_misses:
+        Number of requests not found in the secrets cache or snapshot
+    timed_out:
+        `True` if a provider call required by the field did not complete
+        within `secret_load_timeout`
+    unavailable:
+        `True` if a provider call required by the field kept failing or was
+        rejected by an open circuit breaker
+    lazy:
+        `True` if the field was not resolved by the load, but on first
+        access. Statistics are updated once the field is resolved.
+    """
+
+    source: Union[str, None] = None
+    duration: float = 0.0
+    calls: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    timed_out: bool = False
+    unavailable: bool = False
+    lazy: bool = False
+
+
+class SourceReport(BaseModel):
+    """
+    Instrumentation of a settings source call.
+
+    Attributes
+    ----------
+    name:
+        Source name
+    duration:
+        Time (in seconds) spent calling the source
+    calls:
+        Number of provider calls
+    cache_hits:
+        Number of requests served by the secrets cache or snapshot, including
+        keys known to be missing
+    cache_misses:
+        Number of requests not found in the secrets cache or snapshot
+    fields:
+        Names of the fields provided by the source
+    errors:
+        Provider errors of the secrets considered missing (access denied,
+        etc.), keyed by secret
+    """
+
+    name: str
+    duration: float = 0.0
+    calls: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    fields: List[str] = Field(default_factory=list)
+    errors: Dict[str, str] = Field(default_factory=dict)
+
+
+class LoadReport(BaseModel):
+    """
+    Instrumentation of a settings load, available from
+    `BaseSettings.model_load_report` and sent to the `load_report_callback`
+    set in the model config.
+
+    Attributes
+    ----------
+    settings:
+        Settings class name
+    duration:
+        Total load time (in seconds), including validation
+    sources:
+        Report of each called source, in priority order. Sources not called
+        because all fields were already resolved are not listed.
+    fields:
+        Report of each field
+
+    Examples
+    --------
+    ```py
+    import os
+    from settus import BaseSettings
+    from settus import Field
+
+    os.environ["MY_ENV"] = "my_value"
+
+    class Settings(BaseSettings):
+        my_env: str = Field(default="undefined")
+        my_other_env: str = Field(default="undefined")
+
+    settings = Settings()
+    report = settings.model_load_report
+    print(report.fields["my_env"].source, report.fields["my_other_env"].source)
+    #> IndexedEnvSettingsSource None
+    ```
+    """
+
+    settings: str
+    duration: float = 0.0
+    sources: List[SourceReport] = Field(default_factory=list)
+    fields: Dict[str, FieldReport] = Field(default_factory=dict)
+
+    @property
+    def calls(self) -> int:
+        """Total number of provider calls"""
+        return sum(s.calls for s in self.sources)
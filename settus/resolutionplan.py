@@ -0,0 +1,171 @@
+import threading
+from types import MappingProxyType
+from typing import Any, Dict, Hashable, Mapping, NamedTuple, Tuple
+
+from pydantic import AliasChoices
+
+
+class FieldRoute(NamedTuple):
+    """
+    Routing of a field for a given cloud settings source.
+
+    Attributes
+    ----------
+    location:
+        Provider location (keyvault, secret name, etc.). `None` if the field
+        is not stored by the provider.
+    candidates:
+        Field key, secret key and is_complex of each candidate, in order of
+        priority.
+    requests:
+        Provider request of each candidate
+    """
+
+    location: Any
+    candidates: Tuple[Tuple[str, str, bool], ...]
+    requests: Tuple[Hashable, ...]
+
+
+class ResolutionPlan:
+    """
+    Resolution plan of a settings class. It is computed once per class and
+    re-used for every instantiation. It holds:
+
+    * the field name(s) associated with each alias
+    * the set of aliases that can't be used as init values
+    * the set of lazy fields, resolved by cloud sources on first access
+    * the routing of each field for each cloud settings source, and the
+      fields routed to each of them
+    * the environment variable names of each field for each environment
+      settings source
+
+    Routes and names are compiled on first use for each kind of source, as
+    returned by the source `get_route_key`.
+
+    Parameters
+    ----------
+    settings_cls:
+        Settings class
+    """
+
+    def __init__(self, settings_cls: type):
+        self.model_fields = settings_cls.model_fields
+
+        field_aliases = []
+        for k, f in self.model_fields.items():
+            alias = f.alias
+            if isinstance(alias, str):
+                field_aliases += [(k, alias)]
+            elif isinstance(alias, AliasChoices):
+                for a in alias.choices:
+                    field_aliases += [(k, a)]
+
+        alias_map: Dict[str, Tuple[str, ...]] = {}
+        for k, a in field_aliases:
+            alias_map[a] = alias_map.get(a, ()) + (k,)
+
+        self.field_aliases: Tuple[Tuple[str, str], ...] = tuple(field_aliases)
+        self.alias_map: Mapping[str, Tuple[str, ...]] = MappingProxyType(alias_map)
+        self.aliases = frozenset(alias_map)
+
+        # Required fields must be validated when the model is built
+        lazy = settings_cls.model_config.get("secret_lazy") or False
+        lazy_fields = []
+        for k, f in self.model_fields.items():
+            extra = f.json_schema_extra if isinstance(f.json_schema_extra, dict) else {}
+            if extra.get("secret_lazy", lazy) and not f.is_required():
+                lazy_fields += [k]
+        self.lazy_fields = frozenset(lazy_fields)
+
+        self._routes: Dict[Hashable, Mapping[str, FieldRoute]] = {}
+        self._routed: Dict[Hashable, Mapping[str, FieldRoute]] = {}
+        self._field_infos: Dict[
+            Hashable, Mapping[str, Tuple[Tuple[str, str, bool], ...]]
+        ] = {}
+        self._lock = threading.Lock()
+
+    def get_routes(self, source: Any) -> Mapping[str, FieldRoute]:
+        """
+        Get fields routes for a cloud settings source. Routes are compiled on
+        first request for each kind of source.
+
+        Parameters
+        ----------
+        source:
+            Cloud settings source
+
+        Returns
+        -------
+        :
+            Route of each field
+        """
+        key = source.get_route_key()
+        routes = self._routes.get(key)
+        if routes is None:
+            routes = MappingProxyType(
+                {k: source.compile_route(f, k) for k, f in self.model_fields.items()}
+            )
+            with self._lock:
+                routes = self._routes.setdefault(key, routes)
+        return routes
+
+    def get_routed_fields(self, source: Any) -> Mapping[str, FieldRoute]:
+        """
+        Get the routes of the fields stored by a cloud settings source, in
+        fields definition order. Empty if no field is stored by the provider,
+        in which case the source has nothing to resolve.
+
+        Parameters
+        ----------
+        source:
+            Cloud settings source
+
+        Returns
+        -------
+        :
+            Route of each field stored by the provider
+        """
+        key = source.get_route_key()
+        routed = self._routed.get(key)
+        if routed is None:
+            routed = MappingProxyType(
+                {
+                    k: r
+                    for k, r in self.get_routes(source).items()
+                    if r.location is not None
+                }
+            )
+            with self._lock:
+                routed = self._routed.setdefault(key, routed)
+        return routed
+
+    def get_field_infos(
+        self, source: Any
+    ) -> Mapping[str, Tuple[Tuple[str, str, bool], ...]]:
+        """
+        Get fields environment variable names for an environment settings
+        source. Names are compiled on first request for each kind of source.
+
+        Parameters
+        ----------
+        source:
+            Environment settings source
+
+        Returns
+        -------
+        :
+            Field key, environment variable name and is_complex of each
+            candidate of each field
+        """
+        key = source.get_route_key()
+        infos = self._field_infos.get(key)
+        if infos is None:
+            infos = MappingProxyType(
+                {
+                    k: source.compile_field_info(f, k)
+                    for k, f in self.model_fields.items()
+                }
+            )
+            with self._lock:
+                infos = self._field_infos.setdefault(key, infos)
+        return infos
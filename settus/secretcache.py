@@ -0,0 +1,201 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Tuple, Union
+
+
+class SecretCache:
+    """
+    Process-wide, thread-safe cache of values fetched from cloud secrets
+    providers. Entries are keyed by `(provider, location, key)` where
+    location is a keyvault URL, a secret name, etc.
+
+    Caching is configured per settings class through `SettingsConfigDict`:
+
+    * `secret_cache_ttl`: time to live (in seconds) of found values
+    * `secret_cache_negative_ttl`: time to live (in seconds) of missing values.
+      Missing secrets and missing keys of secret documents are remembered per
+      keyvault and secret, and skipped by later loads.
+    * `secret_cache_maxsize`: maximum number of entries. Least recently used
+      entries are evicted first.
+
+    Examples
+    --------
+    ```py
+    from settus import BaseSettings
+    from settus import Field
+    from settus import SettingsConfigDict
+    from settus import secret_cache
+
+    class Settings(BaseSettings):
+        model_config = SettingsConfigDict(
+            keyvault_url="https://o3-kv-settus-dev.vault.azure.net/",
+            secret_cache_ttl=300,
+        )
+        my_azure_secret: str = Field(default="undefined", alias="my-secret")
+
+    settings = Settings()  # Fetched from keyvault
+    settings = Settings()  # Fetched from cache
+
+    # Force refresh
+    secret_cache.invalidate(provider="azure")
+    settings = Settings()  # Fetched from keyvault
+    ```
+    """
+
+    _STATS = ("hits", "negative_hits", "misses", "evictions")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, Tuple[Any, float]] = OrderedDict()
+        self._stats = dict.fromkeys(self._STATS, 0)
+
+    def get(
+        self,
+        key: Tuple[str, Any, Any],
+        ttl: Union[float, None] = None,
+        negative_ttl: Union[float, None] = None,
+    ) -> Tuple[bool, Any]:
+        """
+        Get cached value.
+
+        Parameters
+        ----------
+        key:
+            Provider, location and key
+        ttl:
+            Maximum age (in seconds) of a found value.
+        negative_ttl:
+            Maximum age (in seconds) of a missing (`None`) value.
+
+        Returns
+        -------
+        hit, value
+            `True` and cached value if a valid entry is found, `False` and
+            `None` otherwise.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return False, None
+
+            value, stored_at = entry
+            max_age = ttl if value is not None else negative_ttl
+            if not max_age or time.monotonic() - stored_at > max_age:
+                self._stats["misses"] += 1
+                return False, None
+
+            self._entries.move_to_end(key)
+            if value is None:
+                self._stats["negative_hits"] += 1
+            else:
+                self._stats["hits"] += 1
+            return True, value
+
+    def set(
+        self, key: Tuple[str, Any, Any], value: Any, maxsize: Union[int, None] = None
+    ) -> None:
+        """
+        Set cached value.
+
+        Parameters
+        ----------
+        key:
+            Provider, location and key
+        value:
+            Value. `None` for missing values.
+        maxsize:
+            Maximum number of entries. Least recently used entries are
+            evicted when exceeded.
+        """
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            if maxsize is not None:
+                while len(self._entries) > maxsize:
+                    self._entries.popitem(last=False)
+                    self._stats["evictions"] += 1
+
+    def invalidate(
+        self,
+        provider: Union[str, None] = None,
+        location: Any = None,
+        key: Any = None,
+    ) -> int:
+        """
+        Remove cached entries matching all the provided arguments. All
+        entries are removed if no argument is provided.
+
+        Locations scoped to a region or endpoint, such as AWS secret names
+        cached as `"{region}/{secret_name}"`, are matched by their full
+        location, or by the unscoped location for all regions and endpoints.
+
+        Parameters
+        ----------
+        provider:
+            Provider name (`"azure"`, `"aws"`, etc.)
+        location:
+            Provider location (keyvault URL, secret name, etc.)
+        key:
+            Secret key
+
+        Returns
+        -------
+        :
+            Number of removed entries
+        """
+        suffix = None
+        if isinstance(location, str):
+            location = location.rstrip("/")
+            suffix = f"/{location}"
+
+        def _match(k: Tuple) -> bool:
+            if provider is not None and k[0] != provider:
+                return False
+            if key is not None and k[2] != key:
+                return False
+            if location is None or k[1] == location:
+                return True
+            # Location scoped to a region or endpoint
+            return suffix is not None and str(k[1]).endswith(suffix)
+
+        with self._lock:
+            keys = [k for k in self._entries if _match(k)]
+            for k in keys:
+                del self._entries[k]
+
+        return len(keys)
+
+    def clear(self) -> None:
+        """
+        Remove all cached entries.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        Get cache counters since creation or last reset.
+
+        Returns
+        -------
+        :
+            Number of `hits` (found values), `negative_hits` (missing
+            values), `misses` and `evictions`.
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def reset_stats(self) -> None:
+        """
+        Reset cache counters.
+        """
+        with self._lock:
+            self._stats = dict.fromkeys(self._STATS, 0)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+secret_cache = SecretCache()
@@ -0,0 +1,172 @@
+import json
+import os
+import tempfile
+import time
+import warnings
+from pathlib import Path
+from typing import Any, Dict, Iterable, Tuple, Union
+
+SNAPSHOT_KEY_ENV = "SETTUS_SNAPSHOT_KEY"
+
+
+class SecretSnapshot:
+    """
+    Encrypted local snapshot of values fetched from cloud secrets providers.
+    When a fresh snapshot is available, cloud sources are warm-started from
+    it and no request is sent to the providers. Each value is stored with the
+    time it was fetched: stale values are ignored and fetched again, and a
+    missing or corrupt snapshot is ignored and rebuilt from live values.
+
+    The snapshot is encrypted with [Fernet](https://cryptography.io/en/latest/fernet/)
+    which requires the `cryptography` package. The key is read from the
+    model config (`secret_snapshot_key`) or from the `SETTUS_SNAPSHOT_KEY`
+    environment variable.
+
+    Parameters
+    ----------
+    path:
+        Snapshot file path
+    key:
+        Fernet encryption key. If `None`, read from `SETTUS_SNAPSHOT_KEY`.
+    max_age:
+        Maximum age (in seconds) of each snapshot value. Never stale if
+        `None`.
+
+    Examples
+    --------
+    ```py
+    from cryptography.fernet import Fernet
+    from settus import BaseSettings
+    from settus import Field
+    from settus import SettingsConfigDict
+
+    class Settings(BaseSettings):
+        model_config = SettingsConfigDict(
+            keyvault_url="https://o3-kv-settus-dev.vault.azure.net/",
+            secret_snapshot_path="/tmp/settus.snapshot",
+            secret_snapshot_key=Fernet.generate_key(),
+            secret_snapshot_max_age=3600,
+        )
+        my_azure_secret: str = Field(default="undefined", alias="my-secret")
+
+    settings = Settings()  # Fetched from keyvault and written to snapshot
+    settings = Settings()  # Read from snapshot
+    ```
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        key: Union[str, bytes, None] = None,
+        max_age: Union[float, None] = None,
+    ):
+        self.path = Path(path).expanduser()
+        self.key = key
+        self.max_age = max_age
+        self.times: Dict[Tuple, float] = {}
+
+    @classmethod
+    def from_config(cls, config: dict) -> Union["SecretSnapshot", None]:
+        """
+        Build snapshot from settings config.
+
+        Parameters
+        ----------
+        config:
+            Settings config
+
+        Returns
+        -------
+        :
+            Snapshot. `None` if `secret_snapshot_path` is not set.
+        """
+        path = config.get("secret_snapshot_path")
+        if path is None:
+            return None
+        return cls(
+            path=path,
+            key=config.get("secret_snapshot_key"),
+            max_age=config.get("secret_snapshot_max_age"),
+        )
+
+    def _get_fernet(self):
+        from cryptography.fernet import Fernet
+
+        key = self.key
+        if key is None:
+            key = os.getenv(SNAPSHOT_KEY_ENV)
+        if key is None:
+            raise ValueError(
+                f"Secret snapshot key must be provided with `secret_snapshot_key` "
+                f"or `{SNAPSHOT_KEY_ENV}` environment variable"
+            )
+        return Fernet(key)
+
+    def load(self) -> Union[Dict[Tuple, Any], None]:
+        """
+        Read snapshot. The fetch time of each value is stored in `times`.
+
+        Returns
+        -------
+        :
+            Values keyed by secrets cache key, without the stale ones. `None`
+            if snapshot is missing or corrupt.
+        """
+        from cryptography.fernet import InvalidToken
+
+        fernet = self._get_fernet()
+
+        try:
+            token = self.path.read_bytes()
+        except OSError:
+            return None
+
+        try:
+            items = json.loads(fernet.decrypt(token))
+            created = fernet.extract_timestamp(token)
+        except (InvalidToken, ValueError):
+            return None
+
+        # Values written without fetch time are as old as the snapshot
+        now = time.time()
+        values = {}
+        self.times = {}
+        for k, v, *t in items:
+            t = t[0] if t else created
+            if self.max_age is not None and now - t > self.max_age:
+                continue
+            values[tuple(k)] = v
+            self.times[tuple(k)] = t
+        return values
+
+    def save(
+        self, values: Dict[Tuple, Any], fetched: Union[Iterable[Tuple], None] = None
+    ) -> None:
+        """
+        Write snapshot. The file is replaced atomically and only readable by
+        its owner. Failures are reported as warnings. Values read from the
+        snapshot keep their fetch time, other values are stored as fetched
+        now.
+
+        Parameters
+        ----------
+        values:
+            Values keyed by secrets cache key
+        """
+        fernet = self._get_fernet()
+        now = time.time()
+        items = [[k, v, self.times.get(k, now)] for k, v in values.items()]
+        token = fernet.encrypt(json.dumps(items).encode())
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name)
+            try:
+                with os.fdopen(fd, "wb") as fp:
+                    fp.write(token)
+                os.replace(tmp, self.path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except OSError as e:
+            warnings.warn(f"Could not write secret snapshot {self.path}: {e}")
@@ -1,13 +1,17 @@
 from typing import Union
 from typing import Any
+from typing import TYPE_CHECKING
+from typing import Callable
+from typing import ContextManager
+from typing import Dict
 from pydantic_settings import SettingsConfigDict as _SettingsConfigDict
 from pydantic_settings.main import config_keys
 
-C = Any
-try:
-    from azure.core.credentials import TokenCredential as C
-except ModuleNotFoundError:
-    pass
+from settus.loadreport import LoadReport
+
+if TYPE_CHECKING:
+    # Type annotations only, azure SDK is imported by the keyvault source
+    from azure.core.credentials import TokenCredential
 
 
 class SettingsConfigDict(_SettingsConfigDict, total=False):
@@ -22,6 +26,109 @@ class SettingsConfigDict(_SettingsConfigDict, total=False):
         Azure Token credentials
     aws_secret_name:
         AWS secret name
+    aws_region:
+        AWS region of the secrets. Read from `AWS_REGION` environment variable
+        if `None`.
+    aws_endpoint_url:
+        AWS secrets manager endpoint URL (VPC endpoint, local emulator, etc.).
+        Default regional endpoint if `None`.
+    aws_profile:
+        AWS shared credentials profile. Default credentials chain if `None`.
+    aws_max_pool_connections:
+        Maximum number of HTTP connections of each AWS secrets manager
+        client. 20 if `None`.
+    gcp_project_id:
+        GCP project id. Read from `GOOGLE_CLOUD_PROJECT` environment variable
+        if `None` and `gcp_secret_name` is set.
+    gcp_secret_name:
+        GCP secret storing a JSON document of key/value pairs. If `None`, each
+        field key is read from its own secret.
+    gcp_secret_version:
+        GCP secret version. `latest` if `None`.
+    gcp_credentials:
+        Google credentials. Application default credentials are used if
+        `None`.
+    databricks_secret_scope:
+        Databricks secret scope
+    databricks_host:
+        Databricks workspace URL. Read from `DATABRICKS_HOST` environment
+        variable if `None`.
+    databricks_token:
+        Databricks personal access token. Read from `DATABRICKS_TOKEN`
+        environment variable if `None`.
+    databricks_dbutils:
+        Databricks utilities used to read secrets instead of the REST API.
+        Created automatically when running on a Databricks cluster without a
+        configured workspace.
+    secret_fetch_concurrency:
+        Maximum number of concurrent requests sent to a cloud secrets provider.
+        When set, all the requests required to build the model are sent
+        upfront using a thread pool. Fetched sequentially if `None`.
+    secret_cache_ttl:
+        Time to live (in seconds) of secrets stored in the process-wide
+        secrets cache. Found secrets are not cached if `None`.
+    secret_cache_negative_ttl:
+        Time to live (in seconds) of missing secrets stored in the
+        process-wide secrets cache. Missing secrets are not cached if `None`.
+    secret_cache_maxsize:
+        Maximum number of entries of the process-wide secrets cache. Least
+        recently used entries are evicted first. Unbounded if `None`.
+    secret_load_timeout:
+        Time budget (in seconds) for fetching cloud secrets during a settings
+        load, shared by all provider calls. Calls still running when the
+        budget is exhausted are abandoned and `secret_timeout_policy` is
+        applied to the affected fields. Unlimited if `None`.
+    secret_timeout_policy:
+        Policy applied to fields that could not be fetched within
+        `secret_load_timeout`: `default` (field default or lower priority
+        source), `cached` (last value from secrets cache or snapshot,
+        regardless of its age) or `raise` (`SecretLoadTimeoutError` listing
+        all affected fields). Also applied to fields whose provider is
+        unavailable, raising `SecretUnavailableError`. Can be overwritten for
+        a given field. `default` if `None`.
+    secret_lazy:
+        If `True`, fields with a default value are only resolved by cloud
+        sources (and validated) when first accessed, instead of when the
+        model is built. Init and environment values are still resolved
+        eagerly. Fields are always resolved when the model is built with
+        `aload`. Can be overwritten for a given field.
+    secret_retry_attempts:
+        Maximum number of attempts of a provider call failing with a
+        transient error (throttling, server or connection error), including
+        the first call. `1` if `None`.
+    secret_retry_backoff:
+        Base delay (in seconds) between attempts. The delay before retry `i`
+        is drawn uniformly between 0 and `secret_retry_backoff * 2 ** i`.
+        `0.1` if `None`.
+    secret_retry_max_backoff:
+        Maximum delay (in seconds) between attempts. `2.0` if `None`.
+    secret_breaker_threshold:
+        Number of consecutive failed calls to a provider endpoint (keyvault,
+        AWS region, etc.) opening its process-wide circuit breaker. Requests
+        are not sent to an endpoint with an open circuit. Disabled if `None`.
+    secret_breaker_cooldown:
+        Time (in seconds) during which an open circuit rejects requests,
+        after which a single trial request is sent. `30` if `None`.
+    secret_snapshot_path:
+        Path of the encrypted local snapshot of cloud secrets. When set,
+        fetched secrets are written to the snapshot and later loads are
+        warm-started from it.
+    secret_snapshot_key:
+        Fernet key used to encrypt the snapshot. Read from
+        `SETTUS_SNAPSHOT_KEY` environment variable if `None`.
+    secret_snapshot_max_age:
+        Maximum age (in seconds) of each snapshot value before it is fetched
+        again from live sources. Never stale if `None`.
+    load_report_callback:
+        Function called with the `LoadReport` of each settings load. Can be
+        used to forward load durations, provider calls and cache statistics
+        to a metrics system.
+    load_span_hook:
+        Function called with a span name and attributes and returning a
+        context manager. It is entered around the whole load
+        (`settus.load`), each source call (`settus.source`) and each provider
+        call (`settus.fetch`). With OpenTelemetry:
+        `lambda name, attrs: tracer.start_as_current_span(name, attributes=attrs)`
 
     Examples
     --------
@@ -43,8 +150,37 @@ class SettingsConfigDict(_SettingsConfigDict, total=False):
     """
 
     keyvault_url: Union[str, None]
-    keyvault_credentials: Union[C, None]
+    keyvault_credentials: Union["TokenCredential", None]
     aws_secret_name: Union[str, None]
+    aws_region: Union[str, None]
+    aws_endpoint_url: Union[str, None]
+    aws_profile: Union[str, None]
+    aws_max_pool_connections: Union[int, None]
+    gcp_project_id: Union[str, None]
+    gcp_secret_name: Union[str, None]
+    gcp_secret_version: Union[str, int, None]
+    gcp_credentials: Union[Any, None]
+    databricks_secret_scope: Union[str, None]
+    databricks_host: Union[str, None]
+    databricks_token: Union[str, None]
+    databricks_dbutils: Union[Any, None]
+    secret_fetch_concurrency: Union[int, None]
+    secret_cache_ttl: Union[float, None]
+    secret_cache_negative_ttl: Union[float, None]
+    secret_cache_maxsize: Union[int, None]
+    secret_load_timeout: Union[float, None]
+    secret_timeout_policy: Union[str, None]
+    secret_lazy: Union[bool, None]
+    secret_retry_attempts: Union[int, None]
+    secret_retry_backoff: Union[float, None]
+    secret_retry_max_backoff: Union[float, None]
+    secret_breaker_threshold: Union[int, None]
+    secret_breaker_cooldown: Union[float, None]
+    secret_snapshot_path: Union[str, None]
+    secret_snapshot_key: Union[str, bytes, None]
+    secret_snapshot_max_age: Union[float, None]
+    load_report_callback: Union[Callable[[LoadReport], Any], None]
+    load_span_hook: Union[Callable[[str, Dict[str, Any]], ContextManager], None]
 
 
 config_keys |= set(SettingsConfigDict.__annotations__.keys())
@@ -1,2 +1,32 @@
+from .cloudsettingssource import AsyncSecretTransport
+from .cloudsettingssource import CloudSettingsSource
+from .cloudsettingssource import CredentialClients
+from .cloudsettingssource import RequestExchange
+from .cloudsettingssource import SecretLoadTimeoutError
+from .cloudsettingssource import SecretUnavailableError
+from .azurekeyvault import AsyncAzureKeyVault
 from .azurekeyvault import AzureKeyVault
+from .azurekeyvault import KeyVaultAsyncTransport
+from .azurekeyvault import KeyVaultClientPool
+from .azurekeyvault import keyvault_client_pool
+from .awssecretsmanager import AWSClientPool
+from .awssecretsmanager import AsyncAWSSecretsManager
 from .awssecretsmanager import AWSSecretsManager
+from .awssecretsmanager import aws_client_pool
+from .dotenvsettingssource import CachedDotEnvSettingsSource
+from .dotenvsettingssource import DotEnvFileCache
+from .dotenvsettingssource import dotenv_cache
+from .envsettingssource import EnvIndex
+from .envsettingssource import IndexedEnvSettingsSource
+from .envsettingssource import get_env_index
+from .databrickssecrets import DatabricksApiError
+from .databrickssecrets import DatabricksClientPool
+from .databrickssecrets import DatabricksSecrets
+from .databrickssecrets import DatabricksSecretsClient
+from .databrickssecrets import databricks_client_pool
+from .gcpsecretmanager import GCPClientPool
+from .gcpsecretmanager import GCPSecretManager
+from .gcpsecretmanager import gcp_client_pool
+from .secretsdirsettingssource import SecretsDirIndex
+from .secretsdirsettingssource import SecretsDirSettingsSource
+from .secretsdirsettingssource import get_secrets_dir_index
@@ -1,102 +1,514 @@
 import os
 import json
-from typing import Any, Dict, Tuple, Union
+import threading
+from typing import Any, Dict, List, Set, Tuple, Union
 
 from pydantic.fields import FieldInfo
-from pydantic_settings.sources import PydanticBaseEnvSettingsSource
+from pydantic_settings import BaseSettings
 
+from settus.settingssources.cloudsettingssource import AsyncSecretTransport
+from settus.settingssources.cloudsettingssource import CloudSettingsSource
+from settus.settingssources.cloudsettingssource import TRANSIENT_STATUS_CODES
 
-class AWSSecretsManager(PydanticBaseEnvSettingsSource):
+TRANSIENT_ERROR_CODES = (
+    "InternalServiceError",
+    "InternalFailure",
+    "ServiceUnavailable",
+    "ThrottlingException",
+    "Throttling",
+    "TooManyRequestsException",
+    "RequestTimeout",
+)
+# Errors of a `BatchGetSecretValue` call meaning batch retrieval is not
+# permitted or not supported by the endpoint
+BATCH_DENIED_ERROR_CODES = (
+    "AccessDeniedException",
+    "UnknownOperationException",
+)
+
+# Concurrent requests sent when falling back from batch retrieval
+DEFAULT_MAX_POOL_CONNECTIONS = 20
+
+
+class AWSClientPool:
+    """
+    Thread-safe pool of boto3 sessions and secrets manager clients.
+
+    Creating a boto3 session loads credentials and service models, and
+    sessions can't be safely shared across threads. The pool ensures that a
+    single session is created per process for each profile, under a lock,
+    and that a single client is created for each region, endpoint, profile
+    and connection pool size. Clients are thread-safe and shared across
+    fields, settings classes and settings instances.
+
+    The pool also remembers the region, endpoint and profile combinations
+    for which batch retrieval is not permitted, so that later loads fetch
+    their secrets individually without trying a batch first.
+
+    Examples
+    --------
+    ```py
+    from settus.settingssources import aws_client_pool
+
+    # Drop all cached clients
+    aws_client_pool.clear()
+    ```
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions: Dict[Union[str, None], Any] = {}
+        self._clients: Dict[Tuple, Any] = {}
+        self._batch_denied: Set[Tuple] = set()
+
+    @staticmethod
+    def _create_session(profile: Union[str, None] = None):
+        # Default credentials
+        # https://boto3.amazonaws.com/v1/documentation/api/latest/guide/credentials.html
+        # The most common approach here is to set the following environment variables:
+        #  - AWS_ACCESS_KEY_ID
+        #  - AWS_SECRET_ACCESS_KEY
+        #  - AWS_REGION
+        import boto3
+
+        return boto3.session.Session(profile_name=profile)
+
+    @staticmethod
+    def _create_client(
+        session: Any,
+        region: Union[str, None],
+        endpoint_url: Union[str, None],
+        max_pool_connections: Union[int, None],
+    ):
+        from botocore.config import Config
+
+        config = None
+        if max_pool_connections is not None:
+            config = Config(max_pool_connections=max_pool_connections)
+        return session.client(
+            service_name="secretsmanager",
+            region_name=region,
+            endpoint_url=endpoint_url,
+            config=config,
+        )
+
+    def get_client(
+        self,
+        region: str = None,
+        endpoint_url: str = None,
+        profile: str = None,
+        max_pool_connections: int = None,
+    ) -> Any:
+        """
+        Get secrets manager client. Sessions and clients are created on first
+        request and re-used afterward.
+
+        Parameters
+        ----------
+        region:
+            AWS region. Read from `AWS_REGION` environment variable if `None`.
+        endpoint_url:
+            Secrets manager endpoint URL (VPC endpoint, local emulator, etc.).
+            Default regional endpoint if `None`.
+        profile:
+            Profile from the AWS shared credentials file. Default credentials
+            chain if `None`.
+        max_pool_connections:
+            Maximum number of HTTP connections kept by the client. botocore
+            default if `None`.
+
+        Returns
+        -------
+        :
+            Secrets manager client
+        """
+        if region is None:
+            region = os.getenv("AWS_REGION")
+        key = (region, endpoint_url, profile, max_pool_connections)
+        with self._lock:
+            if key not in self._clients:
+                if profile not in self._sessions:
+                    self._sessions[profile] = self._create_session(profile)
+                self._clients[key] = self._create_client(
+                    self._sessions[profile], region, endpoint_url, max_pool_connections
+                )
+            return self._clients[key]
+
+    def is_batch_denied(
+        self, region: str = None, endpoint_url: str = None, profile: str = None
+    ) -> bool:
+        """
+        Check if batch retrieval was found not permitted for a region,
+        endpoint and profile.
+
+        Parameters
+        ----------
+        region:
+            AWS region. Read from `AWS_REGION` environment variable if `None`.
+        endpoint_url:
+            Secrets manager endpoint URL
+        profile:
+            Profile from the AWS shared credentials file
+
+        Returns
+        -------
+        :
+            `True` if batch retrieval is not permitted
+        """
+        if region is None:
+            region = os.getenv("AWS_REGION")
+        return (region, endpoint_url, profile) in self._batch_denied
+
+    def deny_batch(
+        self, region: str = None, endpoint_url: str = None, profile: str = None
+    ) -> None:
+        """
+        Remember that batch retrieval is not permitted for a region, endpoint
+        and profile.
+
+        Parameters
+        ----------
+        region:
+            AWS region. Read from `AWS_REGION` environment variable if `None`.
+        endpoint_url:
+            Secrets manager endpoint URL
+        profile:
+            Profile from the AWS shared credentials file
+        """
+        if region is None:
+            region = os.getenv("AWS_REGION")
+        with self._lock:
+            self._batch_denied.add((region, endpoint_url, profile))
+
+    def clear(self) -> None:
+        """
+        Remove all sessions and clients from the pool, and forget batch
+        retrieval denials.
+        """
+        with self._lock:
+            self._sessions = {}
+            self._clients = {}
+            self._batch_denied = set()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+
+aws_client_pool = AWSClientPool()
+
+
+class AWSSecretsManager(CloudSettingsSource):
     """
     AWS Secrets settings source class that loads variables from an AWS
     secrets manager resource.
+
+    Each secret document is fetched and parsed only once per load, no matter
+    how many fields (or aliases) are pointing to it. All the secret documents
+    required by a load are retrieved upfront with `BatchGetSecretValue`, in
+    batches of up to 20 secrets. When batch retrieval is not permitted,
+    secrets are fetched individually and concurrently with `GetSecretValue`.
+
+    A secret is identified by its name, region and endpoint URL, which can
+    be set for each field, so that secrets spread over multiple regions are
+    loaded by the same model. Clients are shared through `aws_client_pool`.
+
+    Errors returned by the provider for secrets considered missing (access
+    denied, decryption failure, etc.) are listed in `errors`.
     """
 
-    def get_field_value(
-        self, field: FieldInfo, field_name: str
-    ) -> Tuple[Any, str, bool]:
+    provider = "aws"
+    batch_size = 20
+
+    def get_field_location(
+        self, field: FieldInfo
+    ) -> Union[Tuple[str, Union[str, None], Union[str, None]], None]:
         """
-        Get field value from AWS Secrets Manager
+        Get the secret storing the value of a field. Field settings have
+        precedence over model config.
 
         Parameters
         ----------
         field:
             Field
-        field_name
-            Field name
 
         Returns
         -------
-        field_value, field_key, is_complex
-            Output used in `__call__` method
+        :
+            Secret name, region and endpoint URL. Region and endpoint are
+            `None` when not set, in which case the default region and
+            endpoint are used.
         """
-        secret_name = None
+        extra = field.json_schema_extra or {}
 
-        # Get keyvault from field
-        if field.json_schema_extra is not None:
-            secret_name = field.json_schema_extra.get("aws_secret_name")
-
-        # Get keyvault from config
+        # Get secret name from field or config
+        secret_name = extra.get("aws_secret_name")
         if secret_name is None:
             secret_name = self.config.get("aws_secret_name")
-
         if secret_name is None:
-            return None, field_name, False
+            return None
 
-        # Default credentials
-        # https://boto3.amazonaws.com/v1/documentation/api/latest/guide/credentials.html
-        # The most common approach here is to set the following environment variables:
-        #  - AWS_ACCESS_KEY_ID
-        #  - AWS_SECRET_ACCESS_KEY
-        #  - AWS_REGION
-        import boto3
-        from botocore.exceptions import ClientError
+        region = extra.get("aws_region") or self.config.get("aws_region")
+        endpoint_url = extra.get("aws_endpoint_url") or self.config.get(
+            "aws_endpoint_url"
+        )
+        return secret_name, region, endpoint_url
+
+    def get_request(
+        self, location: Tuple[str, Union[str, None], Union[str, None]], key: str
+    ) -> Tuple[str, Union[str, None], Union[str, None]]:
+        # The whole secret document is fetched at once
+        return location
+
+    def _get_location_key(
+        self, location: Tuple[str, Union[str, None], Union[str, None]]
+    ) -> str:
+        # Secret name, prefixed by endpoint or region when set
+        secret_name, region, endpoint_url = location
+        prefix = endpoint_url.rstrip("/") if endpoint_url else region
+        return secret_name if prefix is None else f"{prefix}/{secret_name}"
+
+    def get_cache_key(
+        self, request: Tuple[str, Union[str, None], Union[str, None]]
+    ) -> Tuple[str, str, None]:
+        return self.provider, self._get_location_key(request), None
+
+    def get_key_cache_key(
+        self, location: Tuple[str, Union[str, None], Union[str, None]], key: str
+    ) -> Tuple[str, str, str]:
+        return self.provider, self._get_location_key(location), key
+
+    def get_credential_key(
+        self, request: Tuple[str, Union[str, None], Union[str, None]]
+    ) -> Union[str, None]:
+        # Shared credentials profile
+        return self.config.get("aws_profile")
 
-        # Session
-        session = boto3.session.Session()
+    def _get_client(
+        self, request: Tuple[str, Union[str, None], Union[str, None]]
+    ) -> Any:
+        _, region, endpoint_url = request
+        max_pool_connections = self.config.get("aws_max_pool_connections")
+        return aws_client_pool.get_client(
+            region=region,
+            endpoint_url=endpoint_url,
+            profile=self.config.get("aws_profile"),
+            max_pool_connections=max_pool_connections or DEFAULT_MAX_POOL_CONNECTIONS,
+        )
 
-        # Client
-        client = session.client(
-            service_name="secretsmanager", region_name=os.getenv("AWS_REGION")
+    def is_missing_error(self, error: Exception) -> bool:
+        # `botocore.exceptions.ClientError`
+        return isinstance(getattr(error, "response", None), dict) and (
+            "Error" in error.response
         )
 
-        env_val: Union[str, None] = None
-        for field_key, env_name, value_is_complex in self._extract_field_info(
-            field, field_name
-        ):
+    def is_transient_error(self, error: Exception) -> bool:
+        # Throttling or server `ClientError`, and connection errors
+        # (`botocore.exceptions.ConnectionError`, `HTTPClientError`)
+        if self.is_missing_error(error):
+            code = error.response["Error"].get("Code")
+            status_code = error.response.get("ResponseMetadata", {}).get(
+                "HTTPStatusCode"
+            )
+            return (
+                code in TRANSIENT_ERROR_CODES or status_code in TRANSIENT_STATUS_CODES
+            )
+        names = {c.__name__ for c in type(error).__mro__}
+        if names & {"ConnectionError", "HTTPClientError"}:
+            return True
+        return super().is_transient_error(error)
+
+    def get_endpoint(
+        self, request: Tuple[str, Union[str, None], Union[str, None]]
+    ) -> Union[str, None]:
+        # Endpoint URL or region
+        _, region, endpoint_url = request
+        return endpoint_url or region or os.getenv("AWS_REGION")
+
+    def fetch(
+        self, request: Tuple[str, Union[str, None], Union[str, None]]
+    ) -> Union[Dict[str, Any], None]:
+        """
+        Fetch and parse a secret document.
+
+        Parameters
+        ----------
+        request:
+            Secret name, region and endpoint URL
+
+        Returns
+        -------
+        :
+            Secret key/value pairs. `None` if secret could not be retrieved.
+        """
+        secret_name = request[0]
+        try:
+            response = self._get_client(request).get_secret_value(SecretId=secret_name)
+        except Exception as e:
+            if self.is_transient_error(e) or not self.is_missing_error(e):
+                raise
+            error = e.response["Error"]
+            if error.get("Code") != "ResourceNotFoundException":
+                self.errors[secret_name] = (
+                    f"{error.get('Code')}: {error.get('Message')}"
+                )
+            self.versions[request] = None
+            return None
+        return self._parse(request, response)
+
+    def _parse(
+        self,
+        request: Tuple[str, Union[str, None], Union[str, None]],
+        response: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        self.versions[request] = response.get("VersionId")
+
+        var = json.loads(response["SecretString"])
+        if not isinstance(var, dict):
+            raise TypeError("Secret variable should by type key/value pair")
+
+        return var
+
+    def fetch_batch(
+        self, requests: List[Tuple[str, Union[str, None], Union[str, None]]]
+    ) -> Dict[Tuple[str, Union[str, None], Union[str, None]], Any]:
+        """
+        Fetch and parse up to 20 secret documents from the same endpoint with
+        a single `BatchGetSecretValue` call.
+
+        Parameters
+        ----------
+        requests:
+            Secret name (or ARN), region and endpoint URL of each secret
+
+        Returns
+        -------
+        :
+            Secret key/value pairs for each secret. `None` if secret does not
+            exist or could not be retrieved. Empty if the batch call failed,
+            in which case secrets are fetched individually. Batch retrieval
+            is disabled for the rest of the process when not permitted or not
+            supported by the endpoint or botocore version.
+        """
+        _, region, endpoint_url = requests[0]
+        profile = self.config.get("aws_profile")
+        if aws_client_pool.is_batch_denied(region, endpoint_url, profile):
+            return {}
+
+        client = self._get_client(requests[0])
+        if not hasattr(client, "batch_get_secret_value"):
+            # botocore version without batch retrieval
+            aws_client_pool.deny_batch(region, endpoint_url, profile)
+            return {}
+
+        ids = {r[0]: r for r in requests}
+        responses = []
+        errors = []
+        kwargs = {"SecretIdList": list(ids)}
+        while True:
             try:
-                var = client.get_secret_value(SecretId=secret_name)["SecretString"]
-                try:
-                    var = json.loads(var)
-                    try:
-                        env_val = var[env_name]
-                    except KeyError as e:
-                        pass
-                except TypeError as e:
-                    raise TypeError("Secret variable should by type key/value pair")
-            except ClientError as e:
-                pass
-            if env_val is not None:
+                response = client.batch_get_secret_value(**kwargs)
+            except Exception as e:
+                if self.is_transient_error(e) or not self.is_missing_error(e):
+                    raise
+                code = e.response["Error"].get("Code")
+                if code in BATCH_DENIED_ERROR_CODES:
+                    aws_client_pool.deny_batch(region, endpoint_url, profile)
+                # Other errors (validation, expired token, etc.) only fall back
+                # to individual retrieval for this call
+                return {}
+            responses += response.get("SecretValues", [])
+            errors += response.get("Errors", [])
+            if not response.get("NextToken"):
                 break
+            kwargs["NextToken"] = response["NextToken"]
 
-        return env_val, field_key, value_is_complex
+        # Secrets are returned with their name and ARN, but requested by
+        # either of them
+        values = {}
+        for r in responses:
+            secret_name = r.get("Name") if r.get("Name") in ids else r.get("ARN")
+            if secret_name in ids:
+                values[ids[secret_name]] = self._parse(ids[secret_name], r)
+        for e in errors:
+            secret_name = e.get("SecretId")
+            code = e.get("ErrorCode")
+            if secret_name not in ids or code in TRANSIENT_ERROR_CODES:
+                # Fetched again individually
+                continue
+            if code != "ResourceNotFoundException":
+                self.errors[secret_name] = f"{code}: {e.get('ErrorMessage')}"
+            self.versions[ids[secret_name]] = None
+            values[ids[secret_name]] = None
+        return values
 
-    def prepare_field_value(
-        self, field_name: str, field: FieldInfo, value: Any, value_is_complex: bool
-    ) -> Any:
-        return value
+    def get_versions(
+        self, requests: List[Tuple[str, Union[str, None], Union[str, None]]]
+    ) -> Dict[Tuple[str, Union[str, None], Union[str, None]], Union[str, None]]:
+        """
+        Get the current version id (`AWSCURRENT` stage) of secrets.
 
-    def __call__(self) -> Dict[str, Any]:
-        d: Dict[str, Any] = {}
+        Parameters
+        ----------
+        requests:
+            Secret name, region and endpoint URL of each secret
 
-        for field_name, field in self.settings_cls.model_fields.items():
-            field_value, field_key, value_is_complex = self.get_field_value(
-                field, field_name
-            )
-            field_value = self.prepare_field_value(
-                field_name, field, field_value, value_is_complex
+        Returns
+        -------
+        :
+            Version id for each secret. `None` if secret could not be
+            described.
+        """
+        versions = {}
+        for request in requests:
+            try:
+                stages = (
+                    self._get_client(request)
+                    .describe_secret(SecretId=request[0])
+                    .get("VersionIdsToStages", {})
+                )
+            except Exception as e:
+                if not self.is_missing_error(e):
+                    raise
+                versions[request] = None
+                continue
+            versions[request] = next(
+                (v for v, s in stages.items() if "AWSCURRENT" in s), None
             )
-            if field_value is not None:
-                d[field_key] = field_value
+        return versions
+
+    def extract_value(self, value: Dict[str, Any], key: str) -> Any:
+        return value.get(key)
+
+
+class AsyncAWSSecretsManager(AWSSecretsManager):
+    """
+    Asynchronous AWS Secrets settings source class. When awaited with
+    `acall`, all the secrets required to build the model are gathered
+    concurrently.
+
+    Parameters
+    ----------
+    settings_cls:
+        Settings class
+    transport:
+        Asynchronous transport receiving secret name, region and endpoint URL
+        requests and returning parsed secrets. If `None`, the boto3 client is
+        called from worker threads.
+    """
+
+    def __init__(
+        self,
+        settings_cls: type[BaseSettings],
+        *args,
+        transport: Union[AsyncSecretTransport, None] = None,
+        **kwargs,
+    ):
+        super().__init__(settings_cls, *args, **kwargs)
+        self.transport = transport
 
-        return d
+    async def afetch(
+        self, request: Tuple[str, Union[str, None], Union[str, None]]
+    ) -> Union[Dict[str, Any], None]:
+        if self.transport is None:
+            return await super().afetch(request)
+        return await self.transport.fetch(request)
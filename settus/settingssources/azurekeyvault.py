@@ -1,32 +1,158 @@
-from typing import Any, Dict, Tuple, Union
+import threading
+from typing import Any, Dict, Hashable, List, Tuple, Union
 
 from pydantic.fields import FieldInfo
-from pydantic_settings.sources import PydanticBaseEnvSettingsSource
+from pydantic_settings import BaseSettings
 
+from settus.settingssources.cloudsettingssource import AsyncSecretTransport
+from settus.settingssources.cloudsettingssource import CloudSettingsSource
+from settus.settingssources.cloudsettingssource import CredentialClients
+from settus.settingssources.cloudsettingssource import TRANSIENT_STATUS_CODES
 
-class AzureKeyVault(PydanticBaseEnvSettingsSource):
+
+class KeyVaultClientPool:
+    """
+    Thread-safe pool of Azure credentials and keyvault secret clients.
+
+    Building a `DefaultAzureCredential` runs through the whole credential
+    chain and fetches a new token. The pool ensures that a single default
+    credential is created per process and that a single `SecretClient` is
+    created per keyvault URL and credential, shared across fields, settings
+    classes and settings instances.
+
+    Examples
+    --------
+    ```py
+    from settus.settingssources import keyvault_client_pool
+
+    # Close and drop all cached clients and credentials
+    keyvault_client_pool.clear()
+    ```
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._default_credential = None
+        self._clients = CredentialClients()
+
+    @staticmethod
+    def _create_default_credential():
+        # Default credentials
+        # https://learn.microsoft.com/en-us/azure/developer/python/sdk/authentication-overview#sequence-of-authentication-methods-when-you-use-defaultazurecredential
+        # The most common approach here is to set the following environment variables:
+        #  - AZURE_TENANT_ID
+        #  - AZURE_CLIENT_ID
+        #  - AZURE_CLIENT_SECRET
+        from azure.identity import DefaultAzureCredential
+
+        return DefaultAzureCredential()
+
+    @staticmethod
+    def _create_client(vault_url: str, credential: Any):
+        from azure.keyvault.secrets import SecretClient
+
+        return SecretClient(vault_url=vault_url, credential=credential)
+
+    def get_credential(self, credential: Any = None) -> Any:
+        """
+        Get credential. If `credential` is `None`, the process-wide default
+        credential is returned and created if required.
+
+        Parameters
+        ----------
+        credential:
+            Azure token credential
+
+        Returns
+        -------
+        :
+            Azure token credential
+        """
+        if credential is not None:
+            return credential
+        with self._lock:
+            if self._default_credential is None:
+                self._default_credential = self._create_default_credential()
+            return self._default_credential
+
+    def get_client(self, vault_url: str, credential: Any = None) -> Any:
+        """
+        Get secret client for a given keyvault and credential. Clients are
+        created on first request and re-used afterward.
+
+        Parameters
+        ----------
+        vault_url:
+            Keyvault URL
+        credential:
+            Azure token credential. Default credential is used if `None`.
+
+        Returns
+        -------
+        :
+            Secret client
+        """
+        with self._lock:
+            credential = self.get_credential(credential)
+            return self._clients.get(
+                vault_url.rstrip("/").lower(),
+                credential,
+                lambda: self._create_client(vault_url, credential),
+            )
+
+    def clear(self, close: bool = True) -> None:
+        """
+        Remove all clients and credentials from the pool.
+
+        Parameters
+        ----------
+        close:
+            If `True`, pooled clients and default credential are closed.
+        """
+        with self._lock:
+            clients = self._clients.clear()
+            credential = self._default_credential
+            self._default_credential = None
+
+        if not close:
+            return
+
+        for o in clients + [credential]:
+            if hasattr(o, "close"):
+                o.close()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+
+keyvault_client_pool = KeyVaultClientPool()
+
+
+class AzureKeyVault(CloudSettingsSource):
     """
     Azure Key Vault settings source class that loads variables from an azure
     secrets manager resource.
+
+    Credentials and secret clients are shared across all fields and
+    settings instances through `keyvault_client_pool`.
     """
 
-    def get_field_value(
-        self, field: FieldInfo, field_name: str
-    ) -> Tuple[Any, str, bool]:
+    provider = "azure"
+
+    def get_field_location(self, field: FieldInfo) -> Union[Tuple[str, Any], None]:
         """
-        Get field value from keyvault
+        Get keyvault URL and credentials for a field. Field settings have
+        precedence over model config.
 
         Parameters
         ----------
         field:
             Field
-        field_name
-            Field name
 
         Returns
         -------
-        field_value, field_key, is_complex
-            Output used in `__call__` method
+        :
+            Keyvault URL and credentials
         """
         keyvault_url = None
         keyvault_credentials = None
@@ -41,58 +167,223 @@ class AzureKeyVault(PydanticBaseEnvSettingsSource):
             keyvault_url = self.config.get("keyvault_url")
 
         if keyvault_url is None:
-            return None, field_name, False
+            return None
 
         if keyvault_credentials is None:
             keyvault_credentials = self.config.get("keyvault_credentials")
 
-        # Default credentials
-        # https://learn.microsoft.com/en-us/azure/developer/python/sdk/authentication-overview#sequence-of-authentication-methods-when-you-use-defaultazurecredential
-        # The most common approach here is to set the following environment variables:
-        #  - AZURE_TENANT_ID
-        #  - AZURE_CLIENT_ID
-        #  - AZURE_CLIENT_SECRET
-        from azure.core.exceptions import ResourceNotFoundError
-        from azure.core.exceptions import HttpResponseError
-        from azure.identity import DefaultAzureCredential
-        from azure.keyvault.secrets import SecretClient
+        return keyvault_url, keyvault_credentials
 
-        if keyvault_credentials is None:
-            keyvault_credentials = DefaultAzureCredential()
+    def get_field_candidates(
+        self, field: FieldInfo, field_name: str
+    ) -> List[Tuple[str, str, bool]]:
+        # Keyvault secret names can't include underscores
+        return [
+            c for c in self._extract_field_info(field, field_name) if "_" not in c[1]
+        ]
+
+    def get_request(self, location: Tuple[str, Any], key: str) -> Tuple[str, Any, str]:
+        return location + (key,)
+
+    def get_cache_key(self, request: Tuple[str, Any, str]) -> Tuple[str, str, str]:
+        keyvault_url, _, secret_name = request
+        return self.provider, keyvault_url.rstrip("/"), secret_name
+
+    def get_credential_key(self, request: Tuple[str, Any, str]) -> Hashable:
+        # Credentials object, as in `keyvault_client_pool`
+        keyvault_credentials = request[1]
+        return None if keyvault_credentials is None else id(keyvault_credentials)
+
+    def is_missing_error(self, error: Exception) -> bool:
+        # `azure.core.exceptions.HttpResponseError`, including
+        # `ResourceNotFoundError`
+        return hasattr(error, "status_code") and hasattr(error, "response")
+
+    def is_transient_error(self, error: Exception) -> bool:
+        # Throttling or server `HttpResponseError`, and connection errors
+        # (`ServiceRequestError`, `ServiceResponseError`)
+        if getattr(error, "status_code", None) in TRANSIENT_STATUS_CODES:
+            return True
+        names = {c.__name__ for c in type(error).__mro__}
+        if names & {"ServiceRequestError", "ServiceResponseError"}:
+            return True
+        return super().is_transient_error(error)
+
+    def fetch(self, request: Tuple[str, Any, str]) -> Union[str, None]:
+        """
+        Fetch a secret from keyvault.
+
+        Parameters
+        ----------
+        request:
+            Keyvault URL, credentials and secret name
+
+        Returns
+        -------
+        :
+            Secret value. `None` if not found.
+        """
+        keyvault_url, keyvault_credentials, secret_name = request
 
         # Keyvault client
-        client = SecretClient(vault_url=keyvault_url, credential=keyvault_credentials)
-        env_val: Union[str, None] = None
-        for field_key, env_name, value_is_complex in self._extract_field_info(
-            field, field_name
-        ):
-            if "_" in env_name:
-                continue
+        client = keyvault_client_pool.get_client(keyvault_url, keyvault_credentials)
+        try:
+            secret = client.get_secret(secret_name)
+        except Exception as e:
+            if self.is_transient_error(e) or not self.is_missing_error(e):
+                raise
+            self.versions[request] = None
+            return None
+        self.versions[request] = secret.properties.updated_on
+        return secret.value
+
+    def get_versions(
+        self, requests: List[Tuple[str, Any, str]]
+    ) -> Dict[Tuple[str, Any, str], Any]:
+        """
+        Get the last update time of secrets. A single listing request is sent
+        for each keyvault.
+
+        Parameters
+        ----------
+        requests:
+            Keyvault URL, credentials and secret name
+
+        Returns
+        -------
+        :
+            Last update time for each request. `None` if secret does not
+            exist.
+        """
+        locations = {}
+        for r in requests:
+            locations.setdefault(r[:2], []).append(r)
+
+        versions = {}
+        for (keyvault_url, keyvault_credentials), _requests in locations.items():
+            client = keyvault_client_pool.get_client(keyvault_url, keyvault_credentials)
             try:
-                env_val = client.get_secret(env_name).value
-            except (ResourceNotFoundError, HttpResponseError):
-                env_val = None
-            if env_val is not None:
-                break
+                updated_on = {
+                    p.name.lower(): p.updated_on
+                    for p in client.list_properties_of_secrets()
+                }
+            except Exception as e:
+                if not self.is_missing_error(e):
+                    raise
+                # Listing not permitted. Secrets will be fetched again.
+                continue
+            for r in _requests:
+                versions[r] = updated_on.get(r[2].lower())
 
-        return env_val, field_key, value_is_complex
+        return versions
 
-    def prepare_field_value(
-        self, field_name: str, field: FieldInfo, value: Any, value_is_complex: bool
-    ) -> Any:
-        return value
 
-    def __call__(self) -> Dict[str, Any]:
-        d: Dict[str, Any] = {}
+class KeyVaultAsyncTransport:
+    """
+    Asynchronous keyvault transport using `azure.keyvault.secrets.aio`
+    clients. One client is created per keyvault URL and credential and
+    re-used for all requests until the transport is closed. Explicit
+    credentials must be asynchronous (`azure.core.credentials_async`).
+    """
 
-        for field_name, field in self.settings_cls.model_fields.items():
-            field_value, field_key, value_is_complex = self.get_field_value(
-                field, field_name
-            )
-            field_value = self.prepare_field_value(
-                field_name, field, field_value, value_is_complex
-            )
-            if field_value is not None:
-                d[field_key] = field_value
+    def __init__(self):
+        self._default_credential = None
+        self._clients = CredentialClients()
+
+    def _get_client(self, vault_url: str, credential: Any) -> Any:
+        from azure.identity.aio import DefaultAzureCredential
+        from azure.keyvault.secrets.aio import SecretClient
+
+        if credential is None:
+            if self._default_credential is None:
+                self._default_credential = DefaultAzureCredential()
+            credential = self._default_credential
+
+        return self._clients.get(
+            vault_url.rstrip("/").lower(),
+            credential,
+            lambda: SecretClient(vault_url=vault_url, credential=credential),
+        )
+
+    async def fetch(self, request: Tuple[str, Any, str]) -> Union[str, None]:
+        from azure.core.exceptions import ResourceNotFoundError
+        from azure.core.exceptions import HttpResponseError
+
+        keyvault_url, keyvault_credentials, secret_name = request
+        client = self._get_client(keyvault_url, keyvault_credentials)
+        try:
+            return (await client.get_secret(secret_name)).value
+        except (ResourceNotFoundError, HttpResponseError) as e:
+            if e.status_code in TRANSIENT_STATUS_CODES:
+                raise
+            return None
+
+    async def close(self) -> None:
+        """
+        Close all clients and the default credential.
+        """
+        clients = self._clients.clear()
+        credential = self._default_credential
+        self._default_credential = None
+        for o in clients + [credential]:
+            if o is not None:
+                await o.close()
+
+
+class AsyncAzureKeyVault(AzureKeyVault):
+    """
+    Asynchronous Azure Key Vault settings source class. When awaited with
+    `acall`, all the keyvault requests required to build the model are
+    gathered concurrently.
+
+    Parameters
+    ----------
+    settings_cls:
+        Settings class
+    transport:
+        Asynchronous transport. If `None`, a `KeyVaultAsyncTransport` is
+        created and closed for each load.
+
+    Examples
+    --------
+    ```py
+    from settus import BaseSettings
+    from settus.settingssources import AsyncAzureKeyVault
+
+    class Settings(BaseSettings):
+        @classmethod
+        def settings_customise_sources(
+            cls,
+            settings_cls,
+            init_settings,
+            env_settings,
+            dotenv_settings,
+            file_secret_settings,
+        ):
+            return init_settings, env_settings, AsyncAzureKeyVault(settings_cls)
+    ```
+    """
+
+    def __init__(
+        self,
+        settings_cls: type[BaseSettings],
+        *args,
+        transport: Union[AsyncSecretTransport, None] = None,
+        **kwargs,
+    ):
+        super().__init__(settings_cls, *args, **kwargs)
+        self.transport = transport
+
+    async def afetch(self, request: Tuple[str, Any, str]) -> Union[str, None]:
+        return await self.transport.fetch(request)
+
+    async def acall(self) -> Dict[str, Any]:
+        if self.transport is not None:
+            return await super().acall()
 
-        return d
+        self.transport = KeyVaultAsyncTransport()
+        try:
+            return await super().acall()
+        finally:
+            await self.transport.close()
+            self.transport = None
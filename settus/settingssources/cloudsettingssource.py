@@ -0,0 +1,1342 @@
+import asyncio
+import contextlib
+import threading
+import time
+from abc import abstractmethod
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures import wait
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Protocol, Tuple, Union
+
+from pydantic.fields import FieldInfo
+from pydantic_settings import BaseSettings
+from pydantic_settings.sources import PydanticBaseEnvSettingsSource
+
+from settus.circuitbreaker import RetryPolicy
+from settus.circuitbreaker import circuit_breakers
+from settus.resolutionplan import FieldRoute
+from settus.secretcache import secret_cache
+
+_STATS = ("duration", "calls", "cache_hits", "cache_misses")
+
+TIMEOUT_POLICIES = ("default", "cached", "raise")
+
+TRANSIENT_STATUS_CODES = (408, 429, 500, 502, 503, 504)
+
+
+class SecretLoadTimeoutError(TimeoutError):
+    """
+    Raised when cloud secrets could not be fetched within the
+    `secret_load_timeout` of a settings load, for fields with a `raise`
+    timeout policy.
+
+    Parameters
+    ----------
+    timeout:
+        Load time budget (in seconds)
+    fields:
+        Provider of each field that timed out
+    """
+
+    def __init__(self, timeout: float, fields: Dict[str, str]):
+        self.timeout = timeout
+        self.fields = fields
+        _fields = ", ".join(f"{k} ({v})" for k, v in fields.items())
+        super().__init__(
+            f"Settings load exceeded secret_load_timeout of {timeout}s. Values"
+            f" could not be fetched for fields {_fields}"
+        )
+
+
+class SecretUnavailableError(ConnectionError):
+    """
+    Raised when cloud secrets could not be fetched because their provider
+    kept failing or its circuit breaker was open, for fields with a `raise`
+    timeout policy.
+
+    Parameters
+    ----------
+    fields:
+        Provider of each field that could not be fetched
+    """
+
+    def __init__(self, fields: Dict[str, str]):
+        self.fields = fields
+        _fields = ", ".join(f"{k} ({v})" for k, v in fields.items())
+        super().__init__(
+            f"Secrets provider unavailable. Values could not be fetched for"
+            f" fields {_fields}"
+        )
+
+
+class AsyncSecretTransport(Protocol):
+    """
+    Asynchronous transport used to send requests to a cloud secrets
+    provider. Any object implementing a `fetch` coroutine can be used, which
+    makes it possible to substitute a provider with an in-process fake.
+    """
+
+    async def fetch(self, request: Hashable) -> Any:
+        """
+        Fetch a request from the provider.
+
+        Parameters
+        ----------
+        request:
+            Request, as returned by `CloudSettingsSource.get_request`
+
+        Returns
+        -------
+        :
+            Fetched value. `None` if not found.
+        """
+        ...
+
+
+class RequestExchange:
+    """
+    Registry of the provider requests in flight across the sources of
+    multiple settings loads, used by `BaseSettings.load_many` to send each
+    request only once. Requests are identified by their cache key, so that
+    sources of different settings classes share the requests they have in
+    common.
+
+    The first source claiming a request fetches it and publishes its value.
+    Other sources wait for the published value and fetch the request
+    themselves if the first source could not.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._futures: Dict[Tuple, Future] = {}
+
+    def claim(self, keys: List[Tuple]) -> Tuple[List[Tuple], Dict[Tuple, Future]]:
+        """
+        Claim requests to fetch.
+
+        Parameters
+        ----------
+        keys:
+            Cache key of each request
+
+        Returns
+        -------
+        :
+            Keys claimed by the caller, which must be published with
+            `publish`, and futures of the keys claimed by other sources,
+            resolving to a `(found, value)` tuple.
+        """
+        claimed = []
+        waits = {}
+        with self._lock:
+            for k in keys:
+                future = self._futures.get(k)
+                if future is None:
+                    self._futures[k] = Future()
+                    claimed += [k]
+                else:
+                    waits[k] = future
+        return claimed, waits
+
+    def publish(self, key: Tuple, found: bool, value: Any = None) -> None:
+        """
+        Publish the value of a claimed request.
+
+        Parameters
+        ----------
+        key:
+            Cache key of the request
+        found:
+            `False` if the request could not be fetched, in which case the
+            waiting sources fetch it themselves.
+        value:
+            Fetched value
+        """
+        self._futures[key].set_result((found, value))
+
+    def __len__(self) -> int:
+        return len(self._futures)
+
+
+class CredentialClients:
+    """
+    Provider clients keyed by a location and the identity (`id`) of the
+    credentials object they were created with, used by the client pools.
+    The credentials object is kept with its client, so that its `id` is not
+    re-used by another object while the entry exists. Not thread-safe: the
+    pools hold their own lock.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[Hashable, int], Tuple[Any, Any]] = {}
+
+    def get(self, location: Hashable, credentials: Any, create: Callable) -> Any:
+        """
+        Get the client of a location and credentials, created with `create`
+        on first request.
+
+        Parameters
+        ----------
+        location:
+            Provider location (keyvault URL, etc.). `None` if clients are not
+            specific to a location.
+        credentials:
+            Credentials object
+        create:
+            Function returning a new client
+
+        Returns
+        -------
+        :
+            Client
+        """
+        key = (location, id(credentials))
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = (create(), credentials)
+        return entry[0]
+
+    def clear(self) -> List[Any]:
+        """
+        Remove all clients.
+
+        Returns
+        -------
+        :
+            Removed clients
+        """
+        clients = [c for c, _ in self._entries.values()]
+        self._entries = {}
+        return clients
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CloudSettingsSource(PydanticBaseEnvSettingsSource):
+    """
+    Base settings source class for loading variables from a cloud secrets
+    provider.
+
+    A field is routed to a provider location (a keyvault, a secret document,
+    etc.) and each of its keys (field name or aliases) is converted into a
+    request. Each request is fetched at most once for the lifetime of the
+    source.
+
+    By default, requests are fetched sequentially and only when required. If
+    `secret_fetch_concurrency` is set in the model config, all requests
+    required to build the model are sent upfront using a thread pool of that
+    size. In both cases, fields and aliases priority is preserved. Providers
+    may set `fetch_concurrency` to fetch concurrently when the model config
+    does not, and `batch_size` to send all requests upfront in batches.
+
+    Only fields listed in `field_names` are resolved, which is used by
+    `BaseSettings` to skip fields already resolved by higher priority
+    sources. All fields are resolved when `None`.
+
+    When awaited with `acall`, all requests are gathered concurrently on the
+    event loop using `afetch`.
+
+    Fetched values are stored in the process-wide `secret_cache` when
+    `secret_cache_ttl` or `secret_cache_negative_ttl` is set in the model
+    config, scoped to the credentials returned by `get_credential_key`.
+    Values found in `snapshot` (keyed by cache key) are never fetched, and
+    values fetched from the provider are recorded in `fetched`.
+
+    Secret keys found missing are remembered for `secret_cache_negative_ttl`
+    and skipped by later loads without sending a request.
+
+    Providers may record the version of each fetched request in `versions`
+    and implement `get_versions` so that `refresh` only fetches again the
+    requests that changed.
+
+    Duration, provider calls and cache hits/misses are recorded for each
+    request and summarized per field and for the whole source by
+    `get_field_stats` and `get_stats`. Each provider call is wrapped in the
+    span returned by `load_span_hook` when set in the model config.
+
+    When `deadline` is set (a `time.monotonic` value), provider calls are
+    run in worker threads and abandoned once the deadline is reached.
+    Requests that could not complete are listed in `timed_out`, and the
+    timeout policy of affected fields is applied: field default, last cached
+    value or error, as listed in `timed_out_fields`.
+
+    Calls failing with a transient error (throttling, server or connection
+    error) are retried according to `secret_retry_attempts`, with
+    exponential backoff and jitter. When `secret_breaker_threshold` is set,
+    failures are tracked by the process-wide circuit breaker of the provider
+    endpoint and requests are not sent while it is open. Requests that
+    could not be fetched are listed in `unavailable`, are not cached, and the
+    timeout policy of affected fields is applied, as listed in
+    `unavailable_fields`. Providers may record in `errors` the error
+    returned for secrets considered missing (access denied, etc.).
+
+    When `exchange` is set, requests are shared with the other sources of
+    the exchange and only fetched by the first source requiring them.
+    """
+
+    provider: str = None
+    fetch_concurrency: Union[int, None] = None
+    batch_size: Union[int, None] = None
+
+    def __init__(self, settings_cls: type[BaseSettings], *args, **kwargs):
+        super().__init__(settings_cls, *args, **kwargs)
+        self._values: Dict[Hashable, Any] = {}
+        self.field_names: Union[List[str], None] = None
+        self.snapshot: Union[Dict[Tuple, Any], None] = None
+        self.fetched: Dict[Tuple, Any] = {}
+        self.versions: Dict[Hashable, Any] = {}
+        self.request_stats: Dict[Hashable, Dict[str, float]] = {}
+        self._field_requests: Dict[str, List[Hashable]] = {}
+        self._field_skips: Dict[str, int] = {}
+        self._stats_lock = threading.Lock()
+        self.deadline: Union[float, None] = None
+        self.timed_out: set = set()
+        self.timed_out_fields: Dict[str, str] = {}
+        self.unavailable: set = set()
+        self.unavailable_fields: Dict[str, str] = {}
+        self.errors: Dict[Hashable, str] = {}
+        self.exchange: Union[RequestExchange, None] = None
+
+    def _get_concurrency(self) -> Union[int, None]:
+        return self.config.get("secret_fetch_concurrency") or self.fetch_concurrency
+
+    def _get_fields(self) -> List[Tuple[str, FieldInfo]]:
+        # Only fields routed to the provider, as listed by the resolution plan
+        fields = self.settings_cls.model_fields
+        get_plan = getattr(self.settings_cls, "settings_resolution_plan", None)
+        if get_plan is None:
+            names = fields if self.field_names is None else self.field_names
+        elif self.field_names is None:
+            names = get_plan().get_routed_fields(self)
+        else:
+            routed = get_plan().get_routed_fields(self)
+            names = [k for k in self.field_names if k in routed]
+        return [(k, fields[k]) for k in names]
+
+    # ----------------------------------------------------------------------- #
+    # Provider-specific                                                       #
+    # ----------------------------------------------------------------------- #
+
+    @abstractmethod
+    def get_field_location(self, field: FieldInfo) -> Any:
+        """
+        Get provider location storing the value of a field. Field setting
+        should have precedence over model config.
+
+        Parameters
+        ----------
+        field:
+            Field
+
+        Returns
+        -------
+        :
+            Location. `None` if field is not stored by the provider.
+        """
+
+    @abstractmethod
+    def get_request(self, location: Any, key: str) -> Hashable:
+        """
+        Get the request to send to the provider to retrieve a given key from
+        a given location.
+
+        Parameters
+        ----------
+        location:
+            Provider location
+        key:
+            Secret key
+
+        Returns
+        -------
+        :
+            Request
+        """
+
+    @abstractmethod
+    def fetch(self, request: Hashable) -> Any:
+        """
+        Fetch a request from the provider. This method might be called from
+        multiple threads.
+
+        Parameters
+        ----------
+        request:
+            Request
+
+        Returns
+        -------
+        :
+            Fetched value. `None` if not found.
+        """
+
+    def fetch_batch(self, requests: List[Hashable]) -> Dict[Hashable, Any]:
+        """
+        Fetch a batch of up to `batch_size` requests from the provider in a
+        single call. Only used when `batch_size` is set. This method might
+        be called from multiple threads.
+
+        Parameters
+        ----------
+        requests:
+            Requests
+
+        Returns
+        -------
+        :
+            Fetched value for each request. `None` if not found. Requests
+            not returned are fetched individually with `fetch`.
+        """
+        return {}
+
+    def get_cache_key(self, request: Hashable) -> Tuple[str, Any, Any]:
+        """
+        Get the key identifying a request in the secrets cache.
+
+        Parameters
+        ----------
+        request:
+            Request
+
+        Returns
+        -------
+        :
+            Provider, location and key
+        """
+        return self.provider, request, None
+
+    def get_key_cache_key(self, location: Any, key: str) -> Tuple[str, Any, Any]:
+        """
+        Get the key identifying a single secret key in the secrets cache. It
+        is used to remember missing keys. Defaults to the cache key of the
+        request.
+
+        Parameters
+        ----------
+        location:
+            Provider location
+        key:
+            Secret key
+
+        Returns
+        -------
+        :
+            Provider, location and key
+        """
+        return self.get_cache_key(self.get_request(location, key))
+
+    def get_credential_key(self, request: Hashable) -> Hashable:
+        """
+        Get the identity of the credentials used to send a request. Values
+        fetched with other credentials are not shared through the secrets
+        cache or between the loads of `load_many`, so that a caller denied
+        access to a secret can't read it from another caller's fetch.
+
+        Parameters
+        ----------
+        request:
+            Request
+
+        Returns
+        -------
+        :
+            Credentials identity. `None` for the provider default
+            credentials.
+        """
+        return None
+
+    def _scope_key(self, key: Tuple, request: Hashable) -> Tuple:
+        # Key of a request in the secrets cache and request exchange
+        credential = self.get_credential_key(request)
+        return key if credential is None else key + (credential,)
+
+    def get_versions(self, requests: List[Hashable]) -> Dict[Hashable, Any]:
+        """
+        Get current version of requests from the provider, without fetching
+        their values. Requests without a returned version are always fetched
+        again on refresh.
+
+        Parameters
+        ----------
+        requests:
+            Requests
+
+        Returns
+        -------
+        :
+            Version for each request
+        """
+        return {}
+
+    def extract_value(self, value: Any, key: str) -> Any:
+        """
+        Extract the value of a key from a fetched value.
+
+        Parameters
+        ----------
+        value:
+            Fetched value
+        key:
+            Secret key
+
+        Returns
+        -------
+        :
+            Key value
+        """
+        return value
+
+    def is_missing_error(self, error: Exception) -> bool:
+        """
+        Check if an error raised by the provider client means that the
+        requested secret can't be retrieved, in which case the value is
+        considered missing instead of the error being raised. Errors are
+        inspected by attributes, not by type, so that clients other than the
+        provider SDK (test doubles, custom transports) can be used without
+        the SDK being installed.
+
+        Parameters
+        ----------
+        error:
+            Error raised by the provider client
+
+        Returns
+        -------
+        :
+            `True` if the value should be considered missing
+        """
+        return False
+
+    def is_transient_error(self, error: Exception) -> bool:
+        """
+        Check if an error raised by the provider client is transient
+        (throttling, server or connection error), in which case the call is
+        retried and counted as a failure by the circuit breaker instead of
+        the value being considered missing. Errors are inspected by
+        attributes, as in `is_missing_error`.
+
+        Parameters
+        ----------
+        error:
+            Error raised by the provider client
+
+        Returns
+        -------
+        :
+            `True` if the call may succeed when retried
+        """
+        return isinstance(error, (ConnectionError, TimeoutError))
+
+    def get_endpoint(self, request: Hashable) -> Hashable:
+        """
+        Get the provider endpoint serving a request, used to share a circuit
+        breaker between requests. Defaults to the request location in the
+        secrets cache.
+
+        Parameters
+        ----------
+        request:
+            Request
+
+        Returns
+        -------
+        :
+            Endpoint
+        """
+        return self.get_cache_key(request)[1]
+
+    def get_field_candidates(
+        self, field: FieldInfo, field_name: str
+    ) -> List[Tuple[str, str, bool]]:
+        """
+        Get candidate keys for a field, in order of priority.
+
+        Parameters
+        ----------
+        field:
+            Field
+        field_name
+            Field name
+
+        Returns
+        -------
+        :
+            List of field_key, key and is_complex
+        """
+        return self._extract_field_info(field, field_name)
+
+    # ----------------------------------------------------------------------- #
+    # Fetch                                                                   #
+    # ----------------------------------------------------------------------- #
+
+    def _get_cached(self, requests: List[Hashable]) -> List[Hashable]:
+        # Populate fetched values from snapshot or cache and return missed
+        # requests
+        ttl = self.config.get("secret_cache_ttl")
+        negative_ttl = self.config.get("secret_cache_negative_ttl")
+        if not ttl and not negative_ttl and self.snapshot is None:
+            return requests
+
+        missed = []
+        for r in requests:
+            key = self.get_cache_key(r)
+            if self.snapshot is not None and key in self.snapshot:
+                self._values[r] = self.snapshot[key]
+                self._record(r, cache_hits=1)
+                continue
+            if ttl or negative_ttl:
+                hit, value = secret_cache.get(
+                    self._scope_key(key, r), ttl, negative_ttl
+                )
+                if hit:
+                    self._values[r] = value
+                    self._record(r, cache_hits=1)
+                    continue
+            self._record(r, cache_misses=1)
+            missed += [r]
+        return missed
+
+    def _set_value(self, request: Hashable, value: Any) -> None:
+        if request in self.unavailable:
+            # Previous value, if any, is kept
+            return
+        key = self.get_cache_key(request)
+        self._values[request] = value
+        self.fetched[key] = value
+
+        if value is None:
+            ttl = self.config.get("secret_cache_negative_ttl")
+        else:
+            ttl = self.config.get("secret_cache_ttl")
+        if ttl:
+            secret_cache.set(
+                self._scope_key(key, request),
+                value,
+                maxsize=self.config.get("secret_cache_maxsize"),
+            )
+
+    def _is_known_missing(self, location: Any, key: str, request: Hashable) -> bool:
+        # A fetched request is always evaluated as it's free
+        if request in self._values:
+            return False
+        negative_ttl = self.config.get("secret_cache_negative_ttl")
+        if not negative_ttl:
+            return False
+        cache_key = self._scope_key(self.get_key_cache_key(location, key), request)
+        hit, value = secret_cache.get(cache_key, negative_ttl=negative_ttl)
+        return hit and value is None
+
+    def _set_missing(self, location: Any, key: str, request: Hashable) -> None:
+        if not self.config.get("secret_cache_negative_ttl"):
+            return
+        cache_key = self.get_key_cache_key(location, key)
+        if cache_key != self.get_cache_key(request):
+            secret_cache.set(
+                self._scope_key(cache_key, request),
+                None,
+                maxsize=self.config.get("secret_cache_maxsize"),
+            )
+
+    def _record(self, request: Hashable, **stats: float) -> None:
+        with self._stats_lock:
+            _stats = self.request_stats.get(request)
+            if _stats is None:
+                _stats = self.request_stats[request] = dict.fromkeys(_STATS, 0)
+            for k, v in stats.items():
+                _stats[k] += v
+
+    def _span(
+        self, name: str, request: Hashable, **attributes: Any
+    ) -> contextlib.AbstractContextManager:
+        hook = self.config.get("load_span_hook")
+        if hook is None:
+            return contextlib.nullcontext()
+        provider, location, key = self.get_cache_key(request)
+        _attributes = {"settus.provider": provider, "settus.location": str(location)}
+        if key is not None:
+            _attributes["settus.key"] = str(key)
+        for k, v in attributes.items():
+            _attributes[f"settus.{k}"] = v
+        return hook(name, _attributes)
+
+    def _get_breaker(self, request: Hashable) -> Any:
+        threshold = self.config.get("secret_breaker_threshold")
+        if not threshold:
+            return None
+        cooldown = self.config.get("secret_breaker_cooldown")
+        return circuit_breakers.get(
+            self.provider,
+            self.get_endpoint(request),
+            threshold,
+            30.0 if cooldown is None else cooldown,
+        )
+
+    def _get_retry_delay(
+        self, requests: List[Hashable], breaker: Any, delays: Iterator[float]
+    ) -> Union[float, None]:
+        # Record a failed call and return the delay before retrying it. The
+        # requests are marked as unavailable if it should not be retried.
+        if breaker is not None:
+            breaker.record_failure()
+        delay = next(delays, None)
+        if delay is not None and self.deadline is not None:
+            if time.monotonic() + delay >= self.deadline:
+                delay = None
+        if delay is None:
+            self.unavailable.update(requests)
+        return delay
+
+    def _call(self, requests: List[Hashable], call: Callable[[], Any]) -> Any:
+        # Instrumented provider call, with retries and circuit breaker.
+        # `None` is returned if the requests could not be fetched.
+        breaker = self._get_breaker(requests[0])
+        delays = RetryPolicy.from_config(self.config).delays()
+        attributes = {} if len(requests) == 1 else {"requests": len(requests)}
+        while True:
+            if breaker is not None and not breaker.allow():
+                self.unavailable.update(requests)
+                return None
+            t0 = time.perf_counter()
+            try:
+                with self._span("settus.fetch", requests[0], **attributes):
+                    value = call()
+            except Exception as e:
+                if not self.is_transient_error(e):
+                    if breaker is not None:
+                        breaker.release()
+                    raise
+                delay = self._get_retry_delay(requests, breaker, delays)
+                if delay is None:
+                    return None
+            else:
+                if breaker is not None:
+                    breaker.record_success()
+                return value
+            finally:
+                # A single call is shared by all requests of a batch
+                duration = (time.perf_counter() - t0) / len(requests)
+                for i, r in enumerate(requests):
+                    self._record(r, duration=duration, calls=int(i == 0))
+            time.sleep(delay)
+
+    def _fetch(self, request: Hashable) -> Any:
+        return self._call([request], lambda: self.fetch(request))
+
+    def _fetch_batch(self, requests: List[Hashable]) -> Dict[Hashable, Any]:
+        values = self._call(requests, lambda: self.fetch_batch(requests))
+        return {} if values is None else values
+
+    def _map(
+        self, fn: Callable[[Any], Any], items: List[Any], concurrency: int
+    ) -> List[Tuple[bool, Any]]:
+        # Call `fn` on each item, in a thread pool if `concurrency` > 1, and
+        # return whether each call completed and its result. When `deadline`
+        # is set, calls are run in worker threads and the ones still running
+        # at deadline are abandoned.
+        concurrency = min(concurrency, len(items))
+        if self.deadline is None:
+            if concurrency < 2:
+                return [(True, fn(i)) for i in items]
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                return [(True, v) for v in executor.map(fn, items)]
+
+        remaining = self.deadline - time.monotonic()
+        if remaining <= 0:
+            return [(False, None)] * len(items)
+
+        executor = ThreadPoolExecutor(max_workers=max(concurrency, 1))
+        futures = [executor.submit(fn, i) for i in items]
+        done, _ = wait(futures, timeout=remaining)
+        executor.shutdown(wait=False, cancel_futures=True)
+        return [(f in done, f.result() if f in done else None) for f in futures]
+
+    def get_value(self, request: Hashable) -> Any:
+        """
+        Get fetched value for a request. The request is only sent to the
+        provider if it has not been fetched yet and is not cached.
+
+        Parameters
+        ----------
+        request:
+            Request
+
+        Returns
+        -------
+        :
+            Fetched value
+        """
+        if request in self.timed_out:
+            return None
+        if request in self.unavailable:
+            return self._values.get(request)
+        if request not in self._values and self._get_cached([request]):
+            with self._share([request]) as requests:
+                self._fetch_all(requests, 1)
+        return self._values.get(request)
+
+    def _get_missing(self, requests: List[Hashable]) -> List[Hashable]:
+        requests = [
+            r
+            for r in dict.fromkeys(requests)
+            if r not in self._values and r not in self.unavailable
+        ]
+        return self._get_cached(requests)
+
+    def fetch_all(self, requests: List[Hashable], refresh: bool = False) -> None:
+        """
+        Fetch multiple requests concurrently, using a thread pool of size
+        `secret_fetch_concurrency`. Requests already fetched or cached are
+        skipped.
+
+        If the provider sets `batch_size`, requests are first sent in
+        batches of that size using `fetch_batch`, grouped by endpoint.
+        Requests not returned by a batch are then fetched individually, using
+        a thread pool of size `secret_fetch_concurrency` or `batch_size`.
+
+        Parameters
+        ----------
+        requests:
+            Requests
+        refresh:
+            If `True`, requests are fetched even if already fetched or cached.
+        """
+        if refresh:
+            self._send_all(list(dict.fromkeys(requests)))
+            return
+
+        requests = self._get_missing(requests)
+        if not requests:
+            return
+        with self._share(requests) as requests:
+            self._send_all(requests)
+
+    def _send_all(self, requests: List[Hashable]) -> None:
+        concurrency = self._get_concurrency()
+        if self.batch_size:
+            requests = self._fetch_batches(requests, concurrency or 1)
+            concurrency = concurrency or self.batch_size
+        self._fetch_all(requests, concurrency or 1)
+
+    @contextlib.contextmanager
+    def _share(self, requests: List[Hashable]) -> Iterator[List[Hashable]]:
+        # Yield the requests to fetch, excluding the ones claimed by other
+        # sources of the exchange, then publish the fetched values and wait
+        # for the values published by the other sources.
+        if self.exchange is None or not requests:
+            yield requests
+            return
+
+        keys = {self._scope_key(self.get_cache_key(r), r): r for r in requests}
+        claimed, waits = self.exchange.claim(list(keys))
+        try:
+            yield [keys[k] for k in claimed]
+        finally:
+            for k in claimed:
+                r = keys[k]
+                found = r in self._values and r not in self.unavailable
+                self.exchange.publish(k, found, self._values.get(r))
+
+        missed = []
+        for k, future in waits.items():
+            r = keys[k]
+            timeout = None
+            if self.deadline is not None:
+                timeout = max(self.deadline - time.monotonic(), 0)
+            try:
+                found, value = future.result(timeout)
+            except FutureTimeoutError:
+                self.timed_out.add(r)
+                continue
+            if found:
+                self._values[r] = value
+                self.fetched[self.get_cache_key(r)] = value
+            else:
+                missed += [r]
+        if missed:
+            self._fetch_all(missed, 1)
+
+    def _fetch_all(self, requests: List[Hashable], concurrency: int) -> None:
+        requests = [r for r in requests if r not in self.timed_out]
+        if not requests:
+            return
+        for r, (done, v) in zip(
+            requests, self._map(self._fetch, requests, concurrency)
+        ):
+            if done:
+                self._set_value(r, v)
+            else:
+                self.timed_out.add(r)
+
+    def _fetch_batches(
+        self, requests: List[Hashable], concurrency: int
+    ) -> List[Hashable]:
+        # Fetch requests in batches, each sent to a single endpoint, and
+        # return the ones not returned
+        endpoints = {}
+        for r in requests:
+            if r not in self.timed_out:
+                endpoints.setdefault(self.get_endpoint(r), []).append(r)
+        n = self.batch_size
+        batches = [
+            _requests[i : i + n]
+            for _requests in endpoints.values()
+            for i in range(0, len(_requests), n)
+        ]
+        if not batches:
+            return []
+
+        missed = []
+        results = self._map(self._fetch_batch, batches, concurrency)
+        for batch, (done, values) in zip(batches, results):
+            if not done:
+                self.timed_out.update(batch)
+                continue
+            for r in batch:
+                if r in values:
+                    self._set_value(r, values[r])
+                elif r not in self.unavailable:
+                    missed += [r]
+        return missed
+
+    def reset_failures(self) -> None:
+        """
+        Forget requests that timed out or could not be fetched, and the
+        policies applied to the affected fields, so that they are sent again
+        on next resolution.
+        """
+        self.timed_out = set()
+        self.timed_out_fields = {}
+        self.unavailable = set()
+        self.unavailable_fields = {}
+
+    def refresh(self) -> List[Hashable]:
+        """
+        Fetch again the requests for which the provider version changed since
+        they were fetched.
+
+        Returns
+        -------
+        :
+            Requests with an updated value
+        """
+        requests = list(self._values)
+        if not requests:
+            return []
+
+        versions = self.get_versions(requests)
+        stale = [
+            r
+            for r in requests
+            if r not in versions
+            or r not in self.versions
+            or versions[r] != self.versions[r]
+        ]
+        previous = {r: self._values[r] for r in stale}
+        self.unavailable.difference_update(stale)
+        self.fetch_all(stale, refresh=True)
+        return [r for r in stale if self._values[r] != previous[r]]
+
+    async def afetch(self, request: Hashable) -> Any:
+        """
+        Fetch a request from the provider asynchronously. By default, `fetch`
+        is run in a worker thread.
+
+        Parameters
+        ----------
+        request:
+            Request
+
+        Returns
+        -------
+        :
+            Fetched value. `None` if not found.
+        """
+        return await asyncio.to_thread(self.fetch, request)
+
+    async def afetch_all(self, requests: List[Hashable]) -> None:
+        """
+        Fetch multiple requests concurrently on the event loop. The number of
+        pending requests is bounded by `secret_fetch_concurrency` when set.
+        Requests already fetched or cached are skipped.
+
+        Parameters
+        ----------
+        requests:
+            Requests
+        """
+        requests = self._get_missing(requests)
+        if not requests:
+            return
+
+        concurrency = self._get_concurrency() or len(requests)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _afetch(request):
+            async with semaphore:
+                breaker = self._get_breaker(request)
+                delays = RetryPolicy.from_config(self.config).delays()
+                while True:
+                    if breaker is not None and not breaker.allow():
+                        self.unavailable.add(request)
+                        return None
+                    t0 = time.perf_counter()
+                    try:
+                        with self._span("settus.fetch", request):
+                            value = await self.afetch(request)
+                    except asyncio.CancelledError:
+                        # Still pending at deadline
+                        if breaker is not None:
+                            breaker.record_failure()
+                        raise
+                    except Exception as e:
+                        if not self.is_transient_error(e):
+                            if breaker is not None:
+                                breaker.release()
+                            raise
+                        delay = self._get_retry_delay([request], breaker, delays)
+                        if delay is None:
+                            return None
+                    else:
+                        if breaker is not None:
+                            breaker.record_success()
+                        return value
+                    finally:
+                        duration = time.perf_counter() - t0
+                        self._record(request, duration=duration, calls=1)
+                    await asyncio.sleep(delay)
+
+        if self.deadline is None:
+            values = await asyncio.gather(*[_afetch(r) for r in requests])
+            for r, v in zip(requests, values):
+                self._set_value(r, v)
+            return
+
+        requests = [r for r in requests if r not in self.timed_out]
+        remaining = self.deadline - time.monotonic()
+        if remaining <= 0 or not requests:
+            self.timed_out.update(requests)
+            return
+
+        tasks = [asyncio.ensure_future(_afetch(r)) for r in requests]
+        done, pending = await asyncio.wait(tasks, timeout=remaining)
+        for t in pending:
+            t.cancel()
+        for r, t in zip(requests, tasks):
+            if t in done:
+                self._set_value(r, t.result())
+            else:
+                self.timed_out.add(r)
+
+    # ----------------------------------------------------------------------- #
+    # Routes                                                                  #
+    # ----------------------------------------------------------------------- #
+
+    def get_route_key(self) -> Hashable:
+        """
+        Get the key identifying the kind of source in the settings class
+        resolution plan. Sources sharing the same key must route fields
+        identically.
+
+        Returns
+        -------
+        :
+            Route key
+        """
+        return type(self), self.case_sensitive, self.env_prefix
+
+    def compile_route(self, field: FieldInfo, field_name: str) -> FieldRoute:
+        """
+        Compile the route of a field: provider location, candidate keys and
+        associated requests.
+
+        Parameters
+        ----------
+        field:
+            Field
+        field_name
+            Field name
+
+        Returns
+        -------
+        :
+            Field route
+        """
+        location = self.get_field_location(field)
+        if location is None:
+            return FieldRoute(None, (), ())
+        candidates = tuple(self.get_field_candidates(field, field_name))
+        requests = tuple(self.get_request(location, c[1]) for c in candidates)
+        return FieldRoute(location, candidates, requests)
+
+    def get_field_route(self, field: FieldInfo, field_name: str) -> FieldRoute:
+        """
+        Get the route of a field from the settings class resolution plan. The
+        route is compiled on each call if the settings class does not provide
+        a resolution plan.
+
+        Parameters
+        ----------
+        field:
+            Field
+        field_name
+            Field name
+
+        Returns
+        -------
+        :
+            Field route
+        """
+        get_plan = getattr(self.settings_cls, "settings_resolution_plan", None)
+        if get_plan is None:
+            return self.compile_route(field, field_name)
+        return get_plan().get_routes(self)[field_name]
+
+    def get_field_requests(self, field: FieldInfo, field_name: str) -> List[Hashable]:
+        """
+        Get all requests required to resolve a field.
+
+        Parameters
+        ----------
+        field:
+            Field
+        field_name
+            Field name
+
+        Returns
+        -------
+        :
+            Requests, excluding the ones known to be missing
+        """
+        route = self.get_field_route(field, field_name)
+        return [
+            r
+            for (_, key, _), r in zip(route.candidates, route.requests)
+            if not self._is_known_missing(route.location, key, r)
+        ]
+
+    # ----------------------------------------------------------------------- #
+    # Fields                                                                  #
+    # ----------------------------------------------------------------------- #
+
+    def get_field_value(
+        self, field: FieldInfo, field_name: str
+    ) -> Tuple[Any, str, bool]:
+        """
+        Get field value from provider
+
+        Parameters
+        ----------
+        field:
+            Field
+        field_name
+            Field name
+
+        Returns
+        -------
+        field_value, field_key, is_complex
+            Output used in `__call__` method
+        """
+        route = self.get_field_route(field, field_name)
+
+        if route.location is None:
+            return None, field_name, False
+
+        field_key = field_name
+        value_is_complex = False
+        env_val: Union[str, None] = None
+        requests = self._field_requests[field_name] = []
+        self._field_skips[field_name] = 0
+        for i, ((field_key, key, value_is_complex), request) in enumerate(
+            zip(route.candidates, route.requests)
+        ):
+            if self._is_known_missing(route.location, key, request):
+                self._field_skips[field_name] += 1
+                continue
+            requests += [request]
+            value = self.get_value(request)
+            if request in self.timed_out:
+                return self._get_timeout_value(
+                    field, field_name, route, i, self.timed_out_fields
+                )
+            if value is None and request in self.unavailable:
+                return self._get_timeout_value(
+                    field, field_name, route, i, self.unavailable_fields
+                )
+            if value is not None:
+                env_val = self.extract_value(value, key)
+            if env_val is not None:
+                break
+            self._set_missing(route.location, key, request)
+
+        return env_val, field_key, value_is_complex
+
+    def get_timeout_policy(self, field: FieldInfo) -> str:
+        """
+        Get the policy applied when the value of a field could not be fetched
+        before the load deadline or because the provider is unavailable.
+        Field setting has precedence over model config.
+
+        * `default`: the field is not set by the source
+        * `cached`: the last value stored in the secrets cache or snapshot is
+          used, regardless of its age. Not set by the source if not cached.
+        * `raise`: a `SecretLoadTimeoutError` or `SecretUnavailableError` is
+          raised at the end of the load
+
+        Parameters
+        ----------
+        field:
+            Field
+
+        Returns
+        -------
+        :
+            Timeout policy
+        """
+        policy = None
+        if field.json_schema_extra is not None:
+            policy = field.json_schema_extra.get("secret_timeout_policy")
+        if policy is None:
+            policy = self.config.get("secret_timeout_policy") or "default"
+        if policy not in TIMEOUT_POLICIES:
+            raise ValueError(
+                f"Timeout policy '{policy}' is not supported. Use one of"
+                f" {TIMEOUT_POLICIES}."
+            )
+        return policy
+
+    def _get_stale(self, request: Hashable) -> Any:
+        key = self.get_cache_key(request)
+        hit, value = secret_cache.get(self._scope_key(key, request), ttl=float("inf"))
+        if hit:
+            return value
+        if self.snapshot is not None:
+            return self.snapshot.get(key)
+        return None
+
+    def _get_timeout_value(
+        self,
+        field: FieldInfo,
+        field_name: str,
+        route: FieldRoute,
+        start: int,
+        fields: Dict[str, str],
+    ) -> Tuple[Any, str, bool]:
+        # Apply timeout policy, starting from the candidate that could not be
+        # fetched, and record it in `fields`
+        policy = self.get_timeout_policy(field)
+        fields[field_name] = policy
+        if policy == "cached":
+            for (field_key, key, value_is_complex), request in zip(
+                route.candidates[start:], route.requests[start:]
+            ):
+                value = self._values.get(request)
+                if value is None:
+                    value = self._get_stale(request)
+                if value is not None:
+                    value = self.extract_value(value, key)
+                if value is not None:
+                    return value, field_key, value_is_complex
+        return None, field_name, False
+
+    def get_resolved(self) -> Dict[Tuple, Any]:
+        """
+        Get the values resolved by the source, whether fetched or read from
+        the secrets cache or snapshot.
+
+        Returns
+        -------
+        :
+            Values keyed by secrets cache key
+        """
+        return {self.get_cache_key(r): v for r, v in list(self._values.items())}
+
+    def get_field_stats(self, field_name: str) -> Dict[str, float]:
+        """
+        Get the duration, provider calls and cache hits/misses of the
+        requests used to resolve a field. Requests shared by multiple fields
+        are accounted for in each of them. Keys skipped because they are
+        known to be missing are counted as cache hits.
+
+        Parameters
+        ----------
+        field_name
+            Field name
+
+        Returns
+        -------
+        :
+            Field statistics
+        """
+        stats = dict.fromkeys(_STATS, 0)
+        for r in dict.fromkeys(self._field_requests.get(field_name, [])):
+            for k, v in self.request_stats.get(r, {}).items():
+                stats[k] += v
+        stats["cache_hits"] += self._field_skips.get(field_name, 0)
+        return stats
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Get the duration, provider calls and cache hits/misses of all the
+        requests sent by the source.
+
+        Returns
+        -------
+        :
+            Source statistics
+        """
+        stats = dict.fromkeys(_STATS, 0)
+        with self._stats_lock:
+            for _stats in self.request_stats.values():
+                for k, v in _stats.items():
+                    stats[k] += v
+        stats["cache_hits"] += sum(self._field_skips.values())
+        return stats
+
+    def prepare_field_value(
+        self, field_name: str, field: FieldInfo, value: Any, value_is_complex: bool
+    ) -> Any:
+        return value
+
+    def _get_requests(self) -> List[Hashable]:
+        requests = []
+        for field_name, field in self._get_fields():
+            requests += self.get_field_requests(field, field_name)
+        return requests
+
+    async def acall(self) -> Dict[str, Any]:
+        """
+        Asynchronous version of `__call__`. All requests are gathered
+        concurrently before the fields values are resolved.
+
+        Returns
+        -------
+        :
+            Fields values
+        """
+        await self.afetch_all(self._get_requests())
+        return self()
+
+    def __call__(self) -> Dict[str, Any]:
+        d: Dict[str, Any] = {}
+
+        # Nothing to resolve when no field is routed to the provider
+        fields = self._get_fields()
+        if not fields:
+            return d
+
+        if self._get_concurrency() or self.batch_size:
+            self.fetch_all(self._get_requests())
+
+        for field_name, field in fields:
+            field_value, field_key, value_is_complex = self.get_field_value(
+                field, field_name
+            )
+            field_value = self.prepare_field_value(
+                field_name, field, field_value, value_is_complex
+            )
+            if field_value is not None:
+                d[field_key] = field_value
+
+        return d
@@ -0,0 +1,435 @@
+import base64
+import http.client
+import json
+import os
+import queue
+import threading
+from typing import Any, Dict, List, Tuple, Union
+from urllib.parse import urlencode
+from urllib.parse import urlsplit
+
+from pydantic.fields import FieldInfo
+from pydantic_settings import BaseSettings
+
+from settus.settingssources.cloudsettingssource import CloudSettingsSource
+from settus.settingssources.cloudsettingssource import TRANSIENT_STATUS_CODES
+
+
+class DatabricksApiError(Exception):
+    """
+    Error response returned by the Databricks REST API.
+
+    Parameters
+    ----------
+    status_code:
+        HTTP status code
+    error_code:
+        Databricks error code (`RESOURCE_DOES_NOT_EXIST`, `PERMISSION_DENIED`,
+        etc.)
+    message:
+        Error message
+    """
+
+    def __init__(self, status_code: int, error_code: str = None, message: str = ""):
+        super().__init__(f"{status_code} {error_code}: {message}")
+        self.status_code = status_code
+        self.error_code = error_code
+        self.message = message
+
+
+class DatabricksSecretsClient:
+    """
+    Minimal client of the Databricks secrets REST API. HTTP connections are
+    kept alive and pooled, so that concurrent requests each use their own
+    connection and sequential requests re-use the same one.
+
+    Parameters
+    ----------
+    host:
+        Workspace URL. `https://` is assumed when no scheme is provided.
+    token:
+        Personal access token
+    timeout:
+        Connection and read timeout (in seconds)
+    """
+
+    def __init__(self, host: str, token: str = None, timeout: float = 30.0):
+        if "://" not in host:
+            host = f"https://{host}"
+        url = urlsplit(host)
+        self.host = host.rstrip("/")
+        self._https = url.scheme == "https"
+        self._netloc = url.netloc
+        self._token = token
+        self._timeout = timeout
+        self._connections = queue.LifoQueue()
+
+    def _connect(self) -> http.client.HTTPConnection:
+        if self._https:
+            return http.client.HTTPSConnection(self._netloc, timeout=self._timeout)
+        return http.client.HTTPConnection(self._netloc, timeout=self._timeout)
+
+    def _send(self, conn: http.client.HTTPConnection, url: str) -> Tuple[int, bytes]:
+        headers = {}
+        if self._token:
+            headers["Authorization"] = f"Bearer {self._token}"
+        try:
+            conn.request("GET", url, headers=headers)
+            response = conn.getresponse()
+            body = response.read()
+        except Exception:
+            conn.close()
+            raise
+        if response.will_close:
+            conn.close()
+        else:
+            self._connections.put(conn)
+        return response.status, body
+
+    def get(self, path: str, **params: str) -> Dict[str, Any]:
+        """
+        Send a GET request.
+
+        Parameters
+        ----------
+        path:
+            API path
+        params:
+            Query parameters
+
+        Returns
+        -------
+        :
+            JSON response
+        """
+        url = f"{path}?{urlencode(params)}"
+        try:
+            conn = self._connections.get_nowait()
+        except queue.Empty:
+            conn = None
+
+        if conn is None:
+            status, body = self._send(self._connect(), url)
+        else:
+            try:
+                status, body = self._send(conn, url)
+            except (http.client.HTTPException, ConnectionError):
+                # Idle connection closed by the server
+                conn.close()
+                status, body = self._send(self._connect(), url)
+
+        data = json.loads(body) if body else {}
+        if status != 200:
+            raise DatabricksApiError(
+                status, data.get("error_code"), data.get("message", "")
+            )
+        return data
+
+    def list_secrets(self, scope: str) -> Dict[str, Any]:
+        """
+        List the keys of a secret scope.
+
+        Parameters
+        ----------
+        scope:
+            Secret scope
+
+        Returns
+        -------
+        :
+            Last update timestamp of each key
+        """
+        data = self.get("/api/2.0/secrets/list", scope=scope)
+        return {
+            s["key"]: s.get("last_updated_timestamp") for s in data.get("secrets", [])
+        }
+
+    def get_secret(self, scope: str, key: str) -> str:
+        """
+        Get a secret value.
+
+        Parameters
+        ----------
+        scope:
+            Secret scope
+        key:
+            Secret key
+
+        Returns
+        -------
+        :
+            Secret value
+        """
+        data = self.get("/api/2.0/secrets/get", scope=scope, key=key)
+        return base64.b64decode(data["value"]).decode("utf-8")
+
+    def close(self) -> None:
+        """
+        Close all idle connections.
+        """
+        while True:
+            try:
+                self._connections.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class DatabricksClientPool:
+    """
+    Thread-safe pool of Databricks secrets clients, with one client per
+    workspace and token shared across fields, settings classes and settings
+    instances.
+
+    Examples
+    --------
+    ```py
+    from settus.settingssources import databricks_client_pool
+
+    # Close and drop all cached clients
+    databricks_client_pool.clear()
+    ```
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients: Dict[Tuple[str, str], DatabricksSecretsClient] = {}
+
+    def get_client(self, host: str, token: str = None) -> DatabricksSecretsClient:
+        """
+        Get secrets client for a given workspace and token. Clients are
+        created on first request and re-used afterward.
+
+        Parameters
+        ----------
+        host:
+            Workspace URL
+        token:
+            Personal access token
+
+        Returns
+        -------
+        :
+            Secrets client
+        """
+        key = (host.rstrip("/").lower(), token)
+        with self._lock:
+            if key not in self._clients:
+                self._clients[key] = DatabricksSecretsClient(host, token)
+            return self._clients[key]
+
+    def clear(self, close: bool = True) -> None:
+        """
+        Remove all clients from the pool.
+
+        Parameters
+        ----------
+        close:
+            If `True`, pooled connections are closed.
+        """
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients = {}
+
+        if close:
+            for c in clients:
+                c.close()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+
+databricks_client_pool = DatabricksClientPool()
+
+
+class DatabricksSecrets(CloudSettingsSource):
+    """
+    Databricks settings source class that loads variables from Databricks
+    secret scopes.
+
+    The workspace is set with `databricks_host` and `databricks_token` in the
+    model config, or with `DATABRICKS_HOST` and `DATABRICKS_TOKEN` environment
+    variables. When running on a Databricks cluster without a configured
+    workspace, `dbutils.secrets` is used instead of the REST API.
+
+    Each scope is listed once per load and only the keys required by the
+    model and present in the scope are fetched.
+    """
+
+    provider = "databricks"
+
+    def __init__(self, settings_cls: type[BaseSettings], *args, **kwargs):
+        super().__init__(settings_cls, *args, **kwargs)
+        self.host = self.config.get("databricks_host") or os.getenv("DATABRICKS_HOST")
+        self.token = self.config.get("databricks_token") or os.getenv(
+            "DATABRICKS_TOKEN"
+        )
+        self._dbutils = self.config.get("databricks_dbutils")
+        self._scopes: Dict[str, Union[Dict[str, Any], None]] = {}
+        self._scopes_lock = threading.Lock()
+
+    def get_field_location(self, field: FieldInfo) -> Union[str, None]:
+        """
+        Get the secret scope storing the value of a field. Field setting has
+        precedence over model config.
+
+        Parameters
+        ----------
+        field:
+            Field
+
+        Returns
+        -------
+        :
+            Secret scope
+        """
+        scope = None
+
+        # Get scope from field
+        if field.json_schema_extra is not None:
+            scope = field.json_schema_extra.get("databricks_secret_scope")
+
+        # Get scope from config
+        if scope is None:
+            scope = self.config.get("databricks_secret_scope")
+
+        return scope
+
+    def get_request(self, location: str, key: str) -> Tuple[str, str]:
+        return location, key
+
+    def get_cache_key(self, request: Tuple[str, str]) -> Tuple[str, str, str]:
+        scope, key = request
+        host = "dbutils" if self.host is None else self.host.rstrip("/")
+        return self.provider, f"{host}/{scope}", key
+
+    def get_credential_key(self, request: Tuple[str, str]) -> Union[str, None]:
+        # Personal access token, as in `databricks_client_pool`
+        return self.token
+
+    def is_missing_error(self, error: Exception) -> bool:
+        # `DatabricksApiError`
+        return hasattr(error, "status_code") and hasattr(error, "error_code")
+
+    def is_transient_error(self, error: Exception) -> bool:
+        # Throttling or server `DatabricksApiError`, and connection errors
+        if getattr(error, "status_code", None) in TRANSIENT_STATUS_CODES:
+            return True
+        if isinstance(error, http.client.HTTPException):
+            return True
+        return super().is_transient_error(error)
+
+    def get_endpoint(self, request: Tuple[str, str]) -> str:
+        # Workspace
+        return "dbutils" if self.host is None else self.host.rstrip("/")
+
+    def _get_dbutils(self) -> Any:
+        if self._dbutils is None:
+            from pyspark.dbutils import DBUtils
+            from pyspark.sql import SparkSession
+
+            self._dbutils = DBUtils(SparkSession.builder.getOrCreate())
+        return self._dbutils
+
+    def _use_dbutils(self) -> bool:
+        if self._dbutils is not None:
+            return True
+        return self.host is None and "DATABRICKS_RUNTIME_VERSION" in os.environ
+
+    def _list_scope(self, scope: str) -> Dict[str, Any]:
+        if self._use_dbutils():
+            return {s.key: None for s in self._get_dbutils().secrets.list(scope)}
+        client = databricks_client_pool.get_client(self.host, self.token)
+        return client.list_secrets(scope)
+
+    def get_scope(self, scope: str) -> Union[Dict[str, Any], None]:
+        """
+        Get the keys of a scope. The scope is listed on first request only.
+
+        Parameters
+        ----------
+        scope:
+            Secret scope
+
+        Returns
+        -------
+        :
+            Last update timestamp of each key. `None` if the scope can't be
+            listed.
+        """
+        with self._scopes_lock:
+            if scope not in self._scopes:
+                try:
+                    self._scopes[scope] = self._list_scope(scope)
+                except Exception as e:
+                    if self.is_transient_error(e) or not self.is_missing_error(e):
+                        raise
+                    self._scopes[scope] = None
+            return self._scopes[scope]
+
+    def fetch(self, request: Tuple[str, str]) -> Union[str, None]:
+        """
+        Fetch a secret from a scope. Keys not found in the scope listing are
+        not requested.
+
+        Parameters
+        ----------
+        request:
+            Scope and key
+
+        Returns
+        -------
+        :
+            Secret value. `None` if not found.
+        """
+        if self.host is None and not self._use_dbutils():
+            return None
+
+        scope, key = request
+        keys = self.get_scope(scope)
+        if keys is None or key not in keys:
+            self.versions[request] = None
+            return None
+        self.versions[request] = keys[key]
+
+        if self._use_dbutils():
+            return self._get_dbutils().secrets.get(scope=scope, key=key)
+
+        client = databricks_client_pool.get_client(self.host, self.token)
+        try:
+            return client.get_secret(scope, key)
+        except Exception as e:
+            if self.is_transient_error(e) or not self.is_missing_error(e):
+                raise
+            return None
+
+    def get_versions(
+        self, requests: List[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], Any]:
+        """
+        Get the last update time of secrets. Each scope is listed once.
+
+        Parameters
+        ----------
+        requests:
+            Scopes and keys
+
+        Returns
+        -------
+        :
+            Last update timestamp for each request. `None` if secret does not
+            exist.
+        """
+        with self._scopes_lock:
+            self._scopes = {}
+
+        versions = {}
+        for scope, key in requests:
+            keys = self.get_scope(scope)
+            if keys is None:
+                continue
+            if key not in keys:
+                versions[(scope, key)] = None
+            elif keys[key] is not None:
+                # Timestamps are not available from dbutils
+                versions[(scope, key)] = keys[key]
+        return versions
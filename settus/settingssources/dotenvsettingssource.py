@@ -0,0 +1,142 @@
+import os
+import stat
+import threading
+from pathlib import Path
+from typing import Any, Dict, Mapping, Tuple, Union
+
+from pydantic_settings.sources import DotEnvSettingsSource
+from pydantic_settings.sources import EnvSettingsSource
+from pydantic_settings.sources import read_env_file
+
+
+class DotEnvFileCache:
+    """
+    Process-wide cache of parsed dotenv files. Entries are keyed by file
+    path, encoding and case sensitivity, and validated against the file
+    inode, modification time and size: a file is only parsed again when it
+    changes. The number of files parsed is counted in `parses`.
+
+    Examples
+    --------
+    ```py
+    from settus.settingssources import dotenv_cache
+
+    # Force parsing of all dotenv files
+    dotenv_cache.clear()
+    ```
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple, Tuple[Tuple, Mapping[str, Union[str, None]]]] = {}
+        self.parses = 0
+
+    def get(
+        self,
+        path: Path,
+        encoding: Union[str, None] = None,
+        case_sensitive: bool = False,
+    ) -> Mapping[str, Union[str, None]]:
+        """
+        Get the variables of a dotenv file, parsed on first request and when
+        the file changed since it was parsed.
+
+        Parameters
+        ----------
+        path:
+            File path
+        encoding:
+            File encoding. `utf8` if `None`.
+        case_sensitive:
+            If `False`, variable names are lower-cased.
+
+        Returns
+        -------
+        :
+            Variables. Empty if the file does not exist or is not a regular
+            file.
+        """
+        try:
+            st = os.stat(path)
+        except OSError:
+            return {}
+        if not stat.S_ISREG(st.st_mode):
+            return {}
+        signature = (st.st_ino, st.st_mtime_ns, st.st_size)
+        key = (str(path), encoding, case_sensitive)
+
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+
+        values = read_env_file(path, encoding=encoding, case_sensitive=case_sensitive)
+        with self._lock:
+            self._entries[key] = (signature, values)
+            self.parses += 1
+        return values
+
+    def clear(self) -> None:
+        """
+        Remove all parsed files.
+        """
+        with self._lock:
+            self._entries = {}
+            self.parses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+dotenv_cache = DotEnvFileCache()
+
+
+class CachedDotEnvSettingsSource(DotEnvSettingsSource):
+    """
+    Settings source class loading variables from dotenv files set with
+    `env_file` in the model config. Files are parsed once per process and
+    only parsed again when modified, as detected from their inode,
+    modification time and size. As with environment variables, variables
+    which are not fields are ignored, unless extra values are allowed by the
+    model config.
+
+    Examples
+    --------
+    ```py
+    from settus import BaseSettings
+    from settus import Field
+    from settus import SettingsConfigDict
+
+    class Settings(BaseSettings):
+        model_config = SettingsConfigDict(env_file="settings/dev.env")
+        my_env: str = Field(default="undefined")
+
+    settings = Settings()  # Parsed from file
+    settings = Settings()  # Read from dotenv cache
+    ```
+    """
+
+    def __call__(self) -> Dict[str, Any]:
+        if self.config.get("extra") == "allow":
+            return super().__call__()
+        return EnvSettingsSource.__call__(self)
+
+    def _read_env_files(self, case_sensitive: bool) -> Mapping[str, Union[str, None]]:
+        env_files = self.env_file
+        if env_files is None:
+            return {}
+
+        if isinstance(env_files, (str, os.PathLike)):
+            env_files = [env_files]
+
+        dotenv_vars: Dict[str, Union[str, None]] = {}
+        for env_file in env_files:
+            env_path = Path(env_file).expanduser()
+            dotenv_vars.update(
+                dotenv_cache.get(
+                    env_path,
+                    encoding=self.env_file_encoding,
+                    case_sensitive=case_sensitive,
+                )
+            )
+
+        return dotenv_vars
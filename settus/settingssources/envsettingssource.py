@@ -0,0 +1,228 @@
+import os
+import threading
+from types import MappingProxyType
+from typing import Any, Dict, Hashable, Mapping, Tuple, Union
+
+from pydantic.fields import FieldInfo
+from pydantic_settings.sources import EnvSettingsSource
+from pydantic_settings.sources import PydanticBaseEnvSettingsSource
+
+
+def _get_raw_environ() -> Tuple[Mapping, Any, Any]:
+    # Encoded environment and its decoders. This relies on CPython internals:
+    # `os.environ` keeps the encoded variables in its private `_data` dict,
+    # which can be compared without decoding each variable. A decoded copy
+    # is used if `_data` is missing (other implementations, or `os.environ`
+    # replaced by a mapping).
+    data = getattr(os.environ, "_data", None)
+    if data is None:
+        return dict(os.environ), str, str
+    return data, os.environ.decodekey, os.environ.decodevalue
+
+
+class EnvIndex:
+    """
+    Process-wide index of the environment variables, used by
+    `IndexedEnvSettingsSource`. The index holds:
+
+    * `vars`: variables, with names lower-cased when not case-sensitive
+    * `nested`: variables with a name containing the nested delimiter, keyed
+      by each of their `{prefix}{delimiter}` prefixes
+
+    The environment is compared once to the copy the index was built from
+    on each `update`. When it changed, only variables added or changed
+    since are indexed again and applied to the copy. Published mappings are
+    never modified, so that they can be read while the index is updated.
+    Full builds and incremental updates are counted in `builds` and
+    `updates`.
+
+    Parameters
+    ----------
+    case_sensitive:
+        If `False`, variable names are lower-cased.
+    nested_delimiter:
+        Nested delimiter. Nested variables are not indexed if `None`.
+    """
+
+    def __init__(self, case_sensitive: bool, nested_delimiter: Union[str, None]):
+        self.case_sensitive = case_sensitive
+        self.nested_delimiter = nested_delimiter
+        self.vars: Mapping[str, str] = MappingProxyType({})
+        self.nested: Mapping[str, Mapping[str, str]] = MappingProxyType({})
+        self.builds = 0
+        self.updates = 0
+        self._raw: Union[Dict, None] = None
+        self._lock = threading.Lock()
+
+    def _prefixes(self, name: str) -> list:
+        d = self.nested_delimiter
+        if not d:
+            return []
+        prefixes = []
+        i = name.find(d)
+        while i != -1:
+            prefixes += [name[: i + len(d)]]
+            i = name.find(d, i + 1)
+        return prefixes
+
+    def update(self) -> "EnvIndex":
+        """
+        Update the index with the variables changed since last update. The
+        index is re-built if variables were removed.
+
+        Returns
+        -------
+        :
+            Index
+        """
+        raw, decodekey, decodevalue = _get_raw_environ()
+        with self._lock:
+            if raw == self._raw:
+                return self
+
+            old = self._raw
+            if old is not None:
+                changed = {k: v for k, v in raw.items() if old.get(k) != v}
+                added = sum(k not in old for k in changed)
+
+            # Re-built if variables were removed, as fewer remain than the
+            # previous ones plus the added ones
+            if old is None or len(old) + added > len(raw):
+                changed = raw
+                _vars = {}
+                nested = {}
+                self._raw = dict(raw)
+                self.builds += 1
+            else:
+                _vars = dict(self.vars)
+                nested = dict(self.nested)
+                old.update(changed)
+                self.updates += 1
+
+            copied = set()
+            for k, v in changed.items():
+                name = decodekey(k)
+                if not self.case_sensitive:
+                    name = name.lower()
+                value = decodevalue(v)
+                _vars[name] = value
+                for prefix in self._prefixes(name):
+                    if prefix not in copied:
+                        nested[prefix] = dict(nested.get(prefix, {}))
+                        copied.add(prefix)
+                    nested[prefix][name] = value
+
+            self.vars = MappingProxyType(_vars)
+            self.nested = MappingProxyType(nested)
+        return self
+
+
+_indexes: Dict[Tuple[bool, Union[str, None]], EnvIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_env_index(case_sensitive: bool, nested_delimiter: Union[str, None]) -> EnvIndex:
+    """
+    Get the up-to-date environment index for a case sensitivity and nested
+    delimiter.
+
+    Parameters
+    ----------
+    case_sensitive:
+        If `False`, variable names are lower-cased.
+    nested_delimiter:
+        Nested delimiter
+
+    Returns
+    -------
+    :
+        Environment index
+    """
+    key = (bool(case_sensitive), nested_delimiter or None)
+    index = _indexes.get(key)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.setdefault(key, EnvIndex(*key))
+    return index.update()
+
+
+class IndexedEnvSettingsSource(EnvSettingsSource):
+    """
+    Settings source class loading variables from the environment.
+
+    Instead of copying and scanning the whole environment for each settings
+    load, the source reads the process-wide `EnvIndex`, which is updated
+    incrementally when the environment changes. Environment variable names
+    of each field are compiled once per settings class, so that each field
+    lookup, including nested variables, is a dictionary lookup.
+    """
+
+    def _load_env_vars(self) -> Mapping[str, Union[str, None]]:
+        self.index = get_env_index(self.case_sensitive, self.env_nested_delimiter)
+        return self.index.vars
+
+    def get_route_key(self) -> Hashable:
+        """
+        Get the key identifying the kind of source in the settings class
+        resolution plan.
+
+        Returns
+        -------
+        :
+            Route key
+        """
+        return type(self), self.case_sensitive, self.env_prefix
+
+    def compile_field_info(
+        self, field: FieldInfo, field_name: str
+    ) -> Tuple[Tuple[str, str, bool], ...]:
+        """
+        Compile the field key, environment variable name and is_complex of
+        each candidate of a field.
+
+        Parameters
+        ----------
+        field:
+            Field
+        field_name
+            Field name
+
+        Returns
+        -------
+        :
+            Candidates, in order of priority
+        """
+        return tuple(
+            PydanticBaseEnvSettingsSource._extract_field_info(self, field, field_name)
+        )
+
+    def _extract_field_info(
+        self, field: FieldInfo, field_name: str
+    ) -> list[tuple[str, str, bool]]:
+        get_plan = getattr(self.settings_cls, "settings_resolution_plan", None)
+        if get_plan is None:
+            return super()._extract_field_info(field, field_name)
+        infos = get_plan().get_field_infos(self)
+        if field_name not in infos:
+            return super()._extract_field_info(field, field_name)
+        return list(infos[field_name])
+
+    def explode_env_vars(
+        self,
+        field_name: str,
+        field: FieldInfo,
+        env_vars: Mapping[str, Union[str, None]],
+    ) -> Dict[str, Any]:
+        if env_vars is not self.env_vars:
+            return super().explode_env_vars(field_name, field, env_vars)
+
+        # Only the variables nested under the field names are processed
+        d = self.env_nested_delimiter
+        if not d:
+            return {}
+        _env_vars = {}
+        for _, env_name, _ in self._extract_field_info(field, field_name):
+            _env_vars.update(self.index.nested.get(f"{env_name}{d}", {}))
+        if not _env_vars:
+            return {}
+        return super().explode_env_vars(field_name, field, _env_vars)
@@ -0,0 +1,257 @@
+import json
+import os
+import threading
+from typing import Any, Dict, Hashable, List, Tuple, Union
+
+from pydantic.fields import FieldInfo
+
+from settus.settingssources.cloudsettingssource import CloudSettingsSource
+from settus.settingssources.cloudsettingssource import CredentialClients
+from settus.settingssources.cloudsettingssource import TRANSIENT_STATUS_CODES
+
+TRANSIENT_GRPC_CODES = (
+    "UNAVAILABLE",
+    "DEADLINE_EXCEEDED",
+    "RESOURCE_EXHAUSTED",
+    "INTERNAL",
+    "ABORTED",
+)
+
+
+class GCPClientPool:
+    """
+    Thread-safe pool of GCP Secret Manager clients. A single client, and
+    therefore a single gRPC channel, is created per process for each
+    credentials and shared across fields, settings classes and settings
+    instances.
+
+    Examples
+    --------
+    ```py
+    from settus.settingssources import gcp_client_pool
+
+    # Drop all cached clients
+    gcp_client_pool.clear()
+    ```
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients = CredentialClients()
+
+    @staticmethod
+    def _create_client(credentials: Any = None):
+        # Default credentials
+        # https://cloud.google.com/docs/authentication/application-default-credentials
+        # The most common approach here is to set the following environment variable:
+        #  - GOOGLE_APPLICATION_CREDENTIALS
+        from google.cloud.secretmanager import SecretManagerServiceClient
+
+        return SecretManagerServiceClient(credentials=credentials)
+
+    def get_client(self, credentials: Any = None) -> Any:
+        """
+        Get secret manager client for given credentials. Clients are created
+        on first request and re-used afterward.
+
+        Parameters
+        ----------
+        credentials:
+            Google credentials. Application default credentials are used if
+            `None`.
+
+        Returns
+        -------
+        :
+            Secret manager client
+        """
+        with self._lock:
+            return self._clients.get(
+                None, credentials, lambda: self._create_client(credentials)
+            )
+
+    def clear(self) -> None:
+        """
+        Remove all clients from the pool.
+        """
+        with self._lock:
+            self._clients.clear()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+
+gcp_client_pool = GCPClientPool()
+
+
+class GCPSecretManager(CloudSettingsSource):
+    """
+    GCP Secret Manager settings source class that loads variables from
+    Google Cloud secrets.
+
+    Only fields with `gcp_project_id` or `gcp_secret_name` set on the field
+    or in the model config are read. The project is read from the
+    `GOOGLE_CLOUD_PROJECT` environment variable when only `gcp_secret_name`
+    is set. By default, each field key (field name or alias) is a secret of the
+    project. When `gcp_secret_name` is set, the field is read from a JSON
+    document secret instead, which is fetched and parsed only once per load.
+
+    Secret versions of all the fields are accessed concurrently, in a single
+    pass, before fields are resolved.
+    """
+
+    provider = "gcp"
+    fetch_concurrency = 8
+
+    def get_route_key(self) -> Hashable:
+        # Default project is read from the environment
+        return super().get_route_key() + (os.getenv("GOOGLE_CLOUD_PROJECT"),)
+
+    def get_field_location(
+        self, field: FieldInfo
+    ) -> Union[Tuple[str, Union[str, None], str], None]:
+        """
+        Get project, document secret name and version of a field. Field
+        settings have precedence over model config.
+
+        Parameters
+        ----------
+        field:
+            Field
+
+        Returns
+        -------
+        :
+            Project, secret name (`None` if each key is a secret) and version.
+            `None` if the field is not stored in GCP Secret Manager.
+        """
+        location = {}
+        keys = ["gcp_project_id", "gcp_secret_name", "gcp_secret_version"]
+
+        # Get location from field
+        if field.json_schema_extra is not None:
+            location = {k: field.json_schema_extra.get(k) for k in keys}
+
+        # Get location from config
+        for k in keys:
+            if location.get(k) is None:
+                location[k] = self.config.get(k)
+
+        # Only fields opting in with a project or a secret name are routed
+        if location["gcp_project_id"] is None and location["gcp_secret_name"] is None:
+            return None
+
+        project = location["gcp_project_id"] or os.getenv("GOOGLE_CLOUD_PROJECT")
+        if project is None:
+            return None
+
+        version = location["gcp_secret_version"] or "latest"
+        return project, location["gcp_secret_name"], str(version)
+
+    def get_request(
+        self, location: Tuple[str, Union[str, None], str], key: str
+    ) -> Tuple[str, bool]:
+        # Secret version resource name and whether it's a JSON document
+        project, secret_name, version = location
+        document = secret_name is not None
+        secret_id = secret_name if document else key
+        return f"projects/{project}/secrets/{secret_id}/versions/{version}", document
+
+    def get_cache_key(self, request: Tuple[str, bool]) -> Tuple[str, str, None]:
+        return self.provider, request[0], None
+
+    def get_key_cache_key(
+        self, location: Tuple[str, Union[str, None], str], key: str
+    ) -> Tuple[str, str, Union[str, None]]:
+        name, document = self.get_request(location, key)
+        return self.provider, name, key if document else None
+
+    def get_credential_key(self, request: Tuple[str, bool]) -> Hashable:
+        # Credentials object, as in `gcp_client_pool`
+        credentials = self.config.get("gcp_credentials")
+        return None if credentials is None else id(credentials)
+
+    def is_missing_error(self, error: Exception) -> bool:
+        # `google.api_core.exceptions.GoogleAPICallError`, including `NotFound`
+        return hasattr(error, "grpc_status_code")
+
+    def is_transient_error(self, error: Exception) -> bool:
+        # `ServiceUnavailable`, `TooManyRequests`, `DeadlineExceeded`, etc.
+        if self.is_missing_error(error):
+            code = getattr(error.grpc_status_code, "name", error.grpc_status_code)
+            return code in TRANSIENT_GRPC_CODES or error.code in TRANSIENT_STATUS_CODES
+        return super().is_transient_error(error)
+
+    def get_endpoint(self, request: Tuple[str, bool]) -> str:
+        # Project
+        return request[0].split("/")[1]
+
+    def _get_client(self) -> Any:
+        return gcp_client_pool.get_client(self.config.get("gcp_credentials"))
+
+    def fetch(self, request: Tuple[str, bool]) -> Union[str, Dict[str, Any], None]:
+        """
+        Access a secret version. JSON documents are parsed into a key/value
+        index.
+
+        Parameters
+        ----------
+        request:
+            Secret version resource name and whether it's a JSON document
+
+        Returns
+        -------
+        :
+            Secret value or document index. `None` if not found.
+        """
+        name, document = request
+        try:
+            response = self._get_client().access_secret_version(name=name)
+        except Exception as e:
+            if self.is_transient_error(e) or not self.is_missing_error(e):
+                raise
+            self.versions[request] = None
+            return None
+        self.versions[request] = response.name
+
+        value = response.payload.data.decode("utf-8")
+        if not document:
+            return value
+
+        value = json.loads(value)
+        if not isinstance(value, dict):
+            raise TypeError("Secret variable should by type key/value pair")
+        return value
+
+    def get_versions(
+        self, requests: List[Tuple[str, bool]]
+    ) -> Dict[Tuple[str, bool], Union[str, None]]:
+        """
+        Get the resolved version (e.g. `latest` alias target) of secrets.
+
+        Parameters
+        ----------
+        requests:
+            Secret version resource names
+
+        Returns
+        -------
+        :
+            Version resource name for each request. `None` if secret version
+            does not exist.
+        """
+        client = self._get_client()
+        versions = {}
+        for request in requests:
+            try:
+                versions[request] = client.get_secret_version(name=request[0]).name
+            except Exception as e:
+                if not self.is_missing_error(e):
+                    raise
+                versions[request] = None
+        return versions
+
+    def extract_value(self, value: Union[str, Dict[str, Any]], key: str) -> Any:
+        if isinstance(value, dict):
+            return value.get(key)
+        return value
@@ -0,0 +1,228 @@
+import os
+import stat
+import threading
+import warnings
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Tuple, Union
+
+from pydantic.fields import FieldInfo
+from pydantic_settings.sources import SecretsSettingsSource
+from pydantic_settings.utils import path_type_label
+
+
+class SecretsDirIndex:
+    """
+    Process-wide index of a secrets directory, with one file per secret as
+    mounted by Docker or Kubernetes.
+
+    The directory is listed once and listed again only when its inode or
+    modification time changes. Files are read on first request and read
+    again only when the inode, modification time or size of the file changes.
+    Files are checked through their symbolic links, so that the atomic swap
+    of the Kubernetes `..data` link, which points the secret links to a new
+    timestamped directory, is detected. Entries starting with `..` are not
+    indexed. Listings and file reads are counted in `listings` and `reads`.
+
+    Parameters
+    ----------
+    path:
+        Secrets directory path
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.names: Mapping[str, str] = MappingProxyType({})
+        self.lower_names: Mapping[str, str] = MappingProxyType({})
+        self.listings = 0
+        self.reads = 0
+        self._signature: Union[Tuple, None] = None
+        self._files: Dict[str, Tuple[Tuple, str]] = {}
+        self._lock = threading.Lock()
+
+    def update(self) -> "SecretsDirIndex":
+        """
+        List the directory again if it changed since last update.
+
+        Returns
+        -------
+        :
+            Index
+        """
+        st = os.stat(self.path)
+        signature = (st.st_ino, st.st_mtime_ns)
+        if signature == self._signature:
+            return self
+
+        with self._lock:
+            names = [n for n in sorted(os.listdir(self.path)) if not n.startswith("..")]
+            lower_names = {}
+            for n in names:
+                lower_names.setdefault(n.lower(), n)
+            self.names = MappingProxyType({n: n for n in names})
+            self.lower_names = MappingProxyType(lower_names)
+            self._signature = signature
+            self.listings += 1
+        return self
+
+    def find(self, name: str, case_sensitive: bool) -> Union[str, None]:
+        """
+        Find the entry matching a secret name. An exact match has precedence
+        over a case-insensitive match.
+
+        Parameters
+        ----------
+        name:
+            Secret name
+        case_sensitive:
+            If `False`, the entry name case is ignored.
+
+        Returns
+        -------
+        :
+            Entry name. `None` if not found.
+        """
+        if name in self.names:
+            return name
+        if not case_sensitive:
+            return self.lower_names.get(name.lower())
+        return None
+
+    def read(self, name: str) -> Union[str, None]:
+        """
+        Read the value of a secret file, stripped of surrounding whitespace.
+        The value is only read again if the file changed.
+
+        Parameters
+        ----------
+        name:
+            Entry name
+
+        Returns
+        -------
+        :
+            Secret value. `None` if the entry is not a file or was removed.
+        """
+        path = self.path / name
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if not stat.S_ISREG(st.st_mode):
+            return None
+
+        cached = self._files.get(name)
+        if cached is not None and cached[0] == (st.st_ino, st.st_mtime_ns, st.st_size):
+            return cached[1]
+
+        # Signature of the file actually read, in case it's swapped meanwhile
+        try:
+            with open(path) as fp:
+                st = os.fstat(fp.fileno())
+                value = fp.read().strip()
+        except OSError:
+            return None
+        with self._lock:
+            self._files[name] = ((st.st_ino, st.st_mtime_ns, st.st_size), value)
+            self.reads += 1
+        return value
+
+
+_indexes: Dict[str, SecretsDirIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_secrets_dir_index(path: Union[str, Path]) -> SecretsDirIndex:
+    """
+    Get the up-to-date index of a secrets directory.
+
+    Parameters
+    ----------
+    path:
+        Secrets directory path
+
+    Returns
+    -------
+    :
+        Secrets directory index
+    """
+    key = str(path)
+    index = _indexes.get(key)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.setdefault(key, SecretsDirIndex(path))
+    return index.update()
+
+
+class SecretsDirSettingsSource(SecretsSettingsSource):
+    """
+    Settings source class loading variables from the files of `secrets_dir`
+    set in the model config, such as Docker secrets or Kubernetes secrets
+    mounted as a volume.
+
+    The directory is read through the process-wide `SecretsDirIndex`: it is
+    only listed again when modified, and only the files of the fields
+    required by the model are read, and read again only when changed. Only
+    fields listed in `field_names` are resolved, which is used by
+    `BaseSettings` to skip fields already resolved by higher priority
+    sources. All fields are resolved when `None`.
+
+    Examples
+    --------
+    ```py
+    from settus import BaseSettings
+    from settus import Field
+    from settus import SettingsConfigDict
+
+    class Settings(BaseSettings):
+        model_config = SettingsConfigDict(secrets_dir="/etc/secrets")
+        my_secret: str = Field(default="undefined", alias="my-secret")
+
+    settings = Settings()  # Read from /etc/secrets/my-secret
+    settings = Settings()  # Not read again unless the file changed
+    ```
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.field_names: Union[List[str], None] = None
+        self.index: Union[SecretsDirIndex, None] = None
+
+    def __call__(self) -> Dict[str, Any]:
+        self.index = None
+        return super().__call__()
+
+    def get_field_value(
+        self, field: FieldInfo, field_name: str
+    ) -> Tuple[Any, str, bool]:
+        if self.field_names is not None and field_name not in self.field_names:
+            return None, field_name, False
+
+        if self.index is None:
+            self.index = get_secrets_dir_index(self.secrets_path)
+
+        field_key = field_name
+        value_is_complex = False
+        for field_key, env_name, value_is_complex in self._extract_field_info(
+            field, field_name
+        ):
+            name = self.index.find(env_name, self.case_sensitive)
+            if name is None:
+                continue
+
+            value = self.index.read(name)
+            if value is not None:
+                return value, field_key, value_is_complex
+
+            path = self.index.path / name
+            if path.exists():
+                warnings.warn(
+                    f'attempted to load secret file "{path}" but found a'
+                    f" {path_type_label(path)} instead.",
+                    stacklevel=4,
+                )
+
+        return None, field_key, value_is_complex
+
+    def __repr__(self) -> str:
+        return f"SecretsDirSettingsSource(secrets_dir={self.secrets_dir!r})"
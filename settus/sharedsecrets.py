@@ -0,0 +1,172 @@
+import atexit
+import contextlib
+import json
+import os
+import tempfile
+import threading
+import warnings
+from pathlib import Path
+from typing import Any, Dict, Tuple, Union
+
+SHARED_SECRETS_ENV = "SETTUS_SHARED_SECRETS"
+
+
+class SharedSecrets:
+    """
+    Values resolved from cloud secrets providers by a parent process and
+    shared with its worker processes (gunicorn workers, multiprocessing
+    pools, etc.), so that workers build their settings without sending any
+    request to the providers.
+
+    Once published, values are available to the loads of:
+
+    * the publishing process and its forked children, from memory
+    * spawned children, from an owner-only file in `/dev/shm` (or the temp
+      directory) whose path is passed through the `SETTUS_SHARED_SECRETS`
+      environment variable
+
+    Cloud sources are warm-started from shared values as they are from a
+    `SecretSnapshot`. Values are kept until published again or closed, and
+    the file is removed when the publishing process exits.
+
+    Examples
+    --------
+    ```py
+    from settus import BaseSettings
+    from settus import Field
+    from settus import SettingsConfigDict
+    from settus import shared_secrets
+
+    class Settings(BaseSettings):
+        model_config = SettingsConfigDict(
+            keyvault_url="https://o3-kv-settus-dev.vault.azure.net/"
+        )
+        my_azure_secret: str = Field(default="undefined", alias="my-secret")
+
+    # Parent process, before forking or spawning workers
+    settings = Settings()  # Fetched from keyvault
+    shared_secrets.publish(settings)
+
+    # Worker process
+    settings = Settings()  # Read from shared values
+    ```
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values: Union[Dict[Tuple, Any], None] = None
+        self._path: Union[str, None] = None
+        self._owner: Union[int, None] = None
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._after_fork)
+        atexit.register(self.close)
+
+    def _after_fork(self) -> None:
+        # The lock might have been held by another thread of the parent
+        self._lock = threading.Lock()
+
+    def publish(self, *settings: Any, directory: Union[str, Path, None] = None) -> str:
+        """
+        Publish the values resolved by the cloud sources of settings
+        instances, replacing previously published values.
+
+        Parameters
+        ----------
+        settings:
+            Settings instances
+        directory:
+            Directory of the shared file. `/dev/shm` if available, temp
+            directory otherwise.
+
+        Returns
+        -------
+        :
+            Shared file path, also set in `SETTUS_SHARED_SECRETS`
+        """
+        from settus.settingssources.cloudsettingssource import CloudSettingsSource
+
+        values = {}
+        for _settings in settings:
+            for s in _settings._settus_sources:
+                if isinstance(s, CloudSettingsSource):
+                    values.update(s.get_resolved())
+
+        if directory is None:
+            directory = "/dev/shm" if os.path.isdir("/dev/shm") else None
+        data = json.dumps([[k, v] for k, v in values.items()]).encode()
+
+        # Written atomically, only readable by its owner
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix="settus-", suffix=".json")
+        try:
+            with os.fdopen(fd, "wb") as fp:
+                fp.write(data)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+        with self._lock:
+            self._remove()
+            self._values = values
+            self._path = tmp
+            self._owner = os.getpid()
+            os.environ[SHARED_SECRETS_ENV] = tmp
+        return tmp
+
+    def attach(self) -> Union[Dict[Tuple, Any], None]:
+        """
+        Get shared values. In a spawned worker, the shared file is read on
+        first call only.
+
+        Returns
+        -------
+        :
+            Values keyed by secrets cache key. `None` if no values were
+            published, or if the shared file can't be read.
+        """
+        if self._values is not None:
+            return self._values or None
+
+        path = os.getenv(SHARED_SECRETS_ENV)
+        if not path:
+            return None
+
+        with self._lock:
+            if self._path != path:
+                self._values = self._read(path)
+                self._path = path
+        return self._values or None
+
+    @staticmethod
+    def _read(path: str) -> Dict[Tuple, Any]:
+        try:
+            items = json.loads(Path(path).read_bytes())
+        except (OSError, ValueError) as e:
+            warnings.warn(f"Could not read shared secrets {path}: {e}")
+            return {}
+        return {tuple(k): v for k, v in items}
+
+    def _remove(self) -> None:
+        # Remove the shared file, if created by this process
+        if self._path is None or self._owner != os.getpid():
+            return
+        if os.environ.get(SHARED_SECRETS_ENV) == self._path:
+            del os.environ[SHARED_SECRETS_ENV]
+        with contextlib.suppress(OSError):
+            os.unlink(self._path)
+
+    def close(self) -> None:
+        """
+        Stop sharing values. The shared file is removed if created by this
+        process.
+        """
+        with self._lock:
+            self._remove()
+            self._values = None
+            self._path = None
+            self._owner = None
+
+    def __len__(self) -> int:
+        return len(self._values or {})
+
+
+shared_secrets = SharedSecrets()
@@ -0,0 +1,263 @@
+import contextlib
+import json
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from datetime import timezone
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator
+
+from settus.circuitbreaker import circuit_breakers
+from settus.secretcache import secret_cache
+from settus.settingssources import aws_client_pool
+from settus.settingssources import gcp_client_pool
+from settus.settingssources import keyvault_client_pool
+
+UPDATED_ON = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class FakeHttpResponseError(Exception):
+    """Mimics `azure.core.exceptions.HttpResponseError`"""
+
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
+        self.response = None
+
+
+class FakeClientError(Exception):
+    """Mimics `botocore.exceptions.ClientError`"""
+
+    def __init__(self, code: str, operation_name: str):
+        super().__init__(f"An error occurred ({code}) when calling {operation_name}")
+        self.response = {"Error": {"Code": code, "Message": code}}
+        self.operation_name = operation_name
+
+
+class FakeGoogleAPICallError(Exception):
+    """Mimics `google.api_core.exceptions.GoogleAPICallError`"""
+
+    def __init__(self, message: str, code: int, grpc_status_code: str):
+        super().__init__(message)
+        self.code = code
+        self.grpc_status_code = grpc_status_code
+
+
+class FakeBackend:
+    """
+    In-memory secrets backend counting calls and injecting latency and
+    transient errors. Calls in progress are counted in `in_flight`, and their
+    peak number in `max_in_flight`.
+
+    Parameters
+    ----------
+    secrets:
+        Stored secrets
+    latency:
+        Duration, in seconds, of each call
+    error_rate:
+        Probability for each call to fail with a transient error
+    seed:
+        Seed of the errors random generator
+    """
+
+    def __init__(
+        self,
+        secrets: Dict[str, Any],
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        self.secrets = secrets
+        self.latency = latency
+        self.error_rate = error_rate
+        self.calls = Counter()
+        self.errors = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _call(self, operation: str) -> bool:
+        with self._lock:
+            self.calls[operation] += 1
+            failed = self._random.random() < self.error_rate
+            self.errors += failed
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        return failed
+
+    @property
+    def call_count(self) -> int:
+        return sum(self.calls.values())
+
+    def reset(self) -> None:
+        self.calls.clear()
+        self.errors = 0
+        self.max_in_flight = 0
+
+    def close(self) -> None:
+        pass
+
+
+class FakeSecretClient(FakeBackend):
+    """Mimics `azure.keyvault.secrets.SecretClient`"""
+
+    def get_secret(self, name: str) -> SimpleNamespace:
+        if self._call("get_secret"):
+            raise FakeHttpResponseError("Service unavailable", 503)
+        if name not in self.secrets:
+            raise FakeHttpResponseError(f"Secret {name} not found", 404)
+        return SimpleNamespace(
+            name=name,
+            value=self.secrets[name],
+            properties=SimpleNamespace(name=name, updated_on=UPDATED_ON),
+        )
+
+    def list_properties_of_secrets(self) -> list:
+        if self._call("list_properties_of_secrets"):
+            raise FakeHttpResponseError("Service unavailable", 503)
+        return [SimpleNamespace(name=k, updated_on=UPDATED_ON) for k in self.secrets]
+
+
+class FakeSecretsManagerClient(FakeBackend):
+    """
+    Mimics boto3 `secretsmanager` client. Secrets listed in `denied` can't
+    be retrieved, and batch retrieval is rejected if `batch` is `False`, or
+    fails with `batch_error` code if set.
+    """
+
+    def __init__(self, *args, batch: bool = True, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.batch = batch
+        self.batch_error = None
+        self.denied = set()
+
+    def _get_secret(self, SecretId: str) -> Dict[str, Any]:
+        return {
+            "ARN": f"arn:aws:secretsmanager:us-east-1:0:secret:{SecretId}",
+            "Name": SecretId,
+            "SecretString": json.dumps(self.secrets[SecretId]),
+            "VersionId": "v1",
+        }
+
+    def get_secret_value(self, SecretId: str) -> Dict[str, Any]:
+        if self._call("get_secret_value"):
+            raise FakeClientError("InternalServiceError", "GetSecretValue")
+        if SecretId in self.denied:
+            raise FakeClientError("AccessDeniedException", "GetSecretValue")
+        if SecretId not in self.secrets:
+            raise FakeClientError("ResourceNotFoundException", "GetSecretValue")
+        return self._get_secret(SecretId)
+
+    def batch_get_secret_value(self, SecretIdList: list) -> Dict[str, Any]:
+        if self._call("batch_get_secret_value"):
+            raise FakeClientError("InternalServiceError", "BatchGetSecretValue")
+        if not self.batch:
+            raise FakeClientError("AccessDeniedException", "BatchGetSecretValue")
+        if self.batch_error is not None:
+            raise FakeClientError(self.batch_error, "BatchGetSecretValue")
+        if len(SecretIdList) > 20:
+            raise FakeClientError("ValidationException", "BatchGetSecretValue")
+        values = []
+        errors = []
+        for secret_id in SecretIdList:
+            if secret_id in self.denied:
+                code = "AccessDeniedException"
+            elif secret_id not in self.secrets:
+                code = "ResourceNotFoundException"
+            else:
+                values += [self._get_secret(secret_id)]
+                continue
+            errors += [{"SecretId": secret_id, "ErrorCode": code, "ErrorMessage": code}]
+        return {"SecretValues": values, "Errors": errors}
+
+    def describe_secret(self, SecretId: str) -> Dict[str, Any]:
+        if self._call("describe_secret"):
+            raise FakeClientError("InternalServiceError", "DescribeSecret")
+        if SecretId not in self.secrets:
+            raise FakeClientError("ResourceNotFoundException", "DescribeSecret")
+        return {"Name": SecretId, "VersionIdsToStages": {"v1": ["AWSCURRENT"]}}
+
+
+class FakeSecretManagerServiceClient(FakeBackend):
+    """
+    Mimics `google.cloud.secretmanager.SecretManagerServiceClient`. Secrets
+    are keyed by secret id, with dict values stored as JSON documents, and
+    their current version number is stored in `versions`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.versions = {}
+
+    def _get_name(self, name: str) -> str:
+        _, project, _, secret_id, _, version = name.split("/")
+        if secret_id not in self.secrets:
+            raise FakeGoogleAPICallError(f"Secret {name} not found", 404, "NOT_FOUND")
+        if version == "latest":
+            version = self.versions.get(secret_id, 1)
+        return f"projects/{project}/secrets/{secret_id}/versions/{version}"
+
+    def access_secret_version(self, name: str) -> SimpleNamespace:
+        if self._call("access_secret_version"):
+            raise FakeGoogleAPICallError("Service unavailable", 503, "UNAVAILABLE")
+        name = self._get_name(name)
+        value = self.secrets[name.split("/")[3]]
+        if isinstance(value, dict):
+            value = json.dumps(value)
+        return SimpleNamespace(
+            name=name, payload=SimpleNamespace(data=value.encode("utf-8"))
+        )
+
+    def get_secret_version(self, name: str) -> SimpleNamespace:
+        if self._call("get_secret_version"):
+            raise FakeGoogleAPICallError("Service unavailable", 503, "UNAVAILABLE")
+        return SimpleNamespace(name=self._get_name(name))
+
+
+@contextlib.contextmanager
+def fake_clients(
+    keyvault: FakeSecretClient = None,
+    secretsmanager: FakeSecretsManagerClient = None,
+    gcp: FakeSecretManagerServiceClient = None,
+) -> Iterator[None]:
+    """
+    Route keyvault, secrets manager and GCP secret manager requests to fake
+    clients. Secrets cache, client pools and circuit breakers are cleared on
+    enter and exit.
+    """
+    keyvault_client_pool.clear()
+    aws_client_pool.clear()
+    gcp_client_pool.clear()
+    secret_cache.clear()
+    circuit_breakers.reset()
+    if keyvault is not None:
+        keyvault_client_pool._create_default_credential = lambda: object()
+        keyvault_client_pool._create_client = lambda url, credential: keyvault
+    if secretsmanager is not None:
+        aws_client_pool._create_session = lambda profile=None: None
+        aws_client_pool._create_client = lambda *args: secretsmanager
+    if gcp is not None:
+        gcp_client_pool._create_client = lambda credentials=None: gcp
+    try:
+        yield
+    finally:
+        keyvault_client_pool.__dict__.pop("_create_default_credential", None)
+        keyvault_client_pool.__dict__.pop("_create_client", None)
+        keyvault_client_pool.clear(close=False)
+        aws_client_pool.__dict__.pop("_create_session", None)
+        aws_client_pool.__dict__.pop("_create_client", None)
+        aws_client_pool.clear()
+        gcp_client_pool.__dict__.pop("_create_client", None)
+        gcp_client_pool.clear()
+        secret_cache.clear()
+        circuit_breakers.reset()
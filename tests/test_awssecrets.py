@@ -1,10 +1,15 @@
 import os
 
+import pytest
 from pydantic import AliasChoices
+from pydantic import create_model
 
 from settus import BaseSettings
 from settus import Field
 from settus import SettingsConfigDict
+from settus import secret_cache
+from tests.fakes import FakeSecretsManagerClient
+from tests.fakes import fake_clients
 
 os.environ["ENV_1"] = "v1"
 
@@ -39,5 +44,220 @@ def test_aws_secrets():
     assert settings.kv_4 == "undefined"
 
 
+def test_aws_secrets_fetch_once(monkeypatch):
+    from settus.settingssources import AWSSecretsManager
+
+    secrets = {
+        "vault-1": {"my-secret": "secretsauce", "top": "topsecret"},
+        "vault-2": {"my-other-secret": "othersauce"},
+    }
+    calls = []
+
+    def fetch(self, request):
+        calls.append(request[0])
+        return secrets.get(request[0])
+
+    monkeypatch.setattr(AWSSecretsManager, "fetch", fetch)
+    monkeypatch.setattr(AWSSecretsManager, "batch_size", None)
+
+    class Settings(BaseSettings):
+        model_config = SettingsConfigDict(aws_secret_name="vault-1")
+        top: str = Field(default="undefined")
+        kv_1: str = Field(default="undefined", alias="my-secret")
+        kv_2: str = Field(
+            default="undefined", alias=AliasChoices("not-my-secret", "my-secret")
+        )
+        kv_3: str = Field(
+            default="undefined", alias="my-other-secret", aws_secret_name="vault-2"
+        )
+        kv_4: str = Field(default="undefined", alias=AliasChoices("not-my-secret"))
+        kv_5: str = Field(
+            default="undefined", alias="my-third-secret", aws_secret_name="vault-3"
+        )
+
+    settings = Settings()
+    assert settings.top == "topsecret"
+    assert settings.kv_1 == "secretsauce"
+    assert settings.kv_2 == "secretsauce"
+    assert settings.kv_3 == "othersauce"
+    assert settings.kv_4 == "undefined"
+    assert settings.kv_5 == "undefined"
+    assert calls == ["vault-1", "vault-2", "vault-3"]
+
+
+def test_aws_secrets_refresh(monkeypatch):
+    from settus.settingssources import AWSSecretsManager
+
+    secrets = {
+        "vault-1": ("v1", {"my-secret": "secretsauce"}),
+        "vault-2": ("v1", {"my-other-secret": "othersauce"}),
+    }
+    calls = []
+
+    def fetch(self, request):
+        calls.append(request[0])
+        version, value = secrets[request[0]]
+        self.versions[request] = version
+        return dict(value)
+
+    def get_versions(self, requests):
+        return {r: secrets[r[0]][0] for r in requests}
+
+    monkeypatch.setattr(AWSSecretsManager, "fetch", fetch)
+    monkeypatch.setattr(AWSSecretsManager, "batch_size", None)
+    monkeypatch.setattr(AWSSecretsManager, "get_versions", get_versions)
+
+    class Settings(BaseSettings):
+        model_config = SettingsConfigDict(aws_secret_name="vault-1")
+        kv_1: str = Field(default="undefined", alias="my-secret")
+        kv_2: str = Field(
+            default="undefined", alias="my-other-secret", aws_secret_name="vault-2"
+        )
+
+    settings = Settings()
+    assert calls == ["vault-1", "vault-2"]
+
+    # No rotation
+    assert settings.refresh() == []
+    assert calls == ["vault-1", "vault-2"]
+
+    # Rotation
+    secrets["vault-2"] = ("v2", {"my-other-secret": "newsauce"})
+    assert settings.refresh() == ["kv_2"]
+    assert calls == ["vault-1", "vault-2", "vault-2"]
+    assert settings.kv_1 == "secretsauce"
+    assert settings.kv_2 == "newsauce"
+
+    # Background refresher
+    import threading
+
+    refreshed = threading.Event()
+    secrets["vault-1"] = ("v2", {"my-secret": "newsauce"})
+    settings.start_refresher(0.01, callback=lambda changed: refreshed.set())
+    assert refreshed.wait(5)
+    settings.stop_refresher()
+    assert settings.kv_1 == "newsauce"
+
+    # A failing callback does not stop the refresher
+    def callback(changed):
+        refreshed.set()
+        raise RuntimeError("callback failed")
+
+    refreshed.clear()
+    secrets["vault-1"] = ("v3", {"my-secret": "moresauce"})
+    with pytest.warns(UserWarning, match="callback failed"):
+        settings.start_refresher(0.01, callback=callback)
+        assert refreshed.wait(5)
+        refreshed.clear()
+        secrets["vault-2"] = ("v3", {"my-other-secret": "moresauce"})
+        assert refreshed.wait(5)
+        settings.stop_refresher()
+    assert (settings.kv_1, settings.kv_2) == ("moresauce", "moresauce")
+
+
+def build_batch_settings(secrets: int) -> type[BaseSettings]:
+    definitions = {
+        f"s{i}": (
+            str,
+            Field(default="undefined", alias=f"key-{i}", aws_secret_name=f"doc-{i}"),
+        )
+        for i in range(secrets)
+    }
+    return create_model("Settings", __base__=BaseSettings, **definitions)
+
+
+def test_aws_secrets_batch():
+    secrets = {f"doc-{i}": {f"key-{i}": f"value-{i}"} for i in range(24)}
+    client = FakeSecretsManagerClient(secrets)
+    client.denied = {"doc-1"}
+    Settings = build_batch_settings(26)
+
+    with fake_clients(secretsmanager=client):
+        settings = Settings()
+
+    assert settings.s0 == "value-0"
+    assert settings.s23 == "value-23"
+    assert settings.s1 == "undefined"
+    assert settings.s25 == "undefined"
+
+    # 26 secrets in 2 batches, per-secret errors reported
+    assert client.calls == {"batch_get_secret_value": 2}
+    report = settings.model_load_report
+    aws = next(s for s in report.sources if s.name == "AWSSecretsManager")
+    assert aws.calls == 2
+    assert aws.errors == {"doc-1": "AccessDeniedException: AccessDeniedException"}
+
+
+def test_aws_secrets_batch_denied():
+    secrets = {f"doc-{i}": {f"key-{i}": f"value-{i}"} for i in range(8)}
+    client = FakeSecretsManagerClient(secrets, latency=0.05, batch=False)
+    Settings = build_batch_settings(8)
+
+    with fake_clients(secretsmanager=client):
+        settings = Settings()
+
+        # Concurrent fallback to individual retrieval
+        assert settings.s7 == "value-7"
+        assert client.calls == {"batch_get_secret_value": 1, "get_secret_value": 8}
+        assert client.max_in_flight == 8
+
+        # Denial remembered by later loads
+        Settings()
+        assert client.calls == {"batch_get_secret_value": 1, "get_secret_value": 16}
+
+
+def test_aws_secrets_batch_error():
+    from settus.settingssources import aws_client_pool
+
+    secrets = {f"doc-{i}": {f"key-{i}": f"value-{i}"} for i in range(8)}
+    client = FakeSecretsManagerClient(secrets)
+    client.batch_error = "ValidationException"
+    Settings = build_batch_settings(8)
+
+    with fake_clients(secretsmanager=client):
+        # Fallback to individual retrieval for this load only
+        assert Settings().s7 == "value-7"
+        assert client.calls == {"batch_get_secret_value": 1, "get_secret_value": 8}
+        assert not aws_client_pool.is_batch_denied(None, None, None)
+
+        client.batch_error = None
+        client.reset()
+        assert Settings().s7 == "value-7"
+        assert client.calls == {"batch_get_secret_value": 1}
+
+
+def test_aws_secrets_regions(monkeypatch):
+    from settus.settingssources import aws_client_pool
+
+    clients = {
+        "us-east-1": FakeSecretsManagerClient({"doc": {"east-key": "east"}}),
+        "eu-west-1": FakeSecretsManagerClient({"doc": {"west-key": "west"}}),
+    }
+
+    class Settings(BaseSettings):
+        model_config = SettingsConfigDict(
+            aws_secret_name="doc", aws_region="us-east-1", secret_cache_ttl=60
+        )
+        east: str = Field(default="undefined", alias="east-key")
+        west: str = Field(default="undefined", alias="west-key", aws_region="eu-west-1")
+
+    with fake_clients(secretsmanager=clients["us-east-1"]):
+        monkeypatch.setattr(
+            aws_client_pool,
+            "_create_client",
+            lambda session, region, endpoint_url, n: clients[region],
+        )
+        settings = Settings()
+        Settings()
+        assert len(aws_client_pool) == 2
+        assert secret_cache.get(("aws", "eu-west-1/doc", None), ttl=60)[0]
+
+    # One batch per region, clients shared across instances
+    assert settings.east == "east"
+    assert settings.west == "west"
+    assert clients["us-east-1"].calls == {"batch_get_secret_value": 1}
+    assert clients["eu-west-1"].calls == {"batch_get_secret_value": 1}
+
+
 if __name__ == "__main__":
     test_aws_secrets()
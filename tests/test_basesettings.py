@@ -81,7 +81,127 @@ def test_type_cast():
     assert isinstance(settings.s2, int)
 
 
+def test_aload():
+    import asyncio
+
+    class Settings(BaseSettings):
+        my_secret: str = ""
+        your_secret: int = 25
+        s1: str = Field(default="s1", alias="e1")
+
+    s = asyncio.run(Settings.aload(your_secret=3))
+    assert s.my_secret == "12345"
+    assert s.your_secret == 3
+    assert s.s1 == "v1"
+
+    with pytest.raises(AttributeError):
+        asyncio.run(Settings.aload(e1="i1"))
+
+
+def test_sources_priority():
+    from settus.settingssources import CloudSettingsSource
+
+    class DictSource(CloudSettingsSource):
+        requests = []
+
+        def get_field_location(self, field):
+            return "vault"
+
+        def get_request(self, location, key):
+            return key
+
+        def fetch(self, request):
+            self.requests.append(request)
+            return {"s2": "c2", "s3": "c3"}.get(request)
+
+    class Settings(BaseSettings):
+        s1: str = Field(default="s1", alias="e1")
+        s2: str = Field(default="s2", alias=AliasChoices("e2", "s2"))
+        s3: str = "s3"
+
+        @classmethod
+        def settings_customise_sources(
+            cls,
+            settings_cls,
+            init_settings,
+            env_settings,
+            dotenv_settings,
+            file_secret_settings,
+        ):
+            return init_settings, env_settings, DictSource(settings_cls)
+
+    # Only unresolved fields are requested
+    settings = Settings()
+    assert settings.s1 == "v1"
+    assert settings.s2 == "v2"
+    assert settings.s3 == "c3"
+    assert DictSource.requests == ["s3"]
+
+    # Source not called when all fields are resolved
+    DictSource.requests.clear()
+    settings = Settings(s3="i3")
+    assert settings.s3 == "i3"
+    assert DictSource.requests == []
+
+
+def test_resolution_plan():
+    from settus.settingssources import AzureKeyVault
+
+    class Settings(BaseSettings):
+        s1: str = Field(default="s1", alias="e1")
+        s2: str = Field(default="s2", alias=AliasChoices("e2", "e1"))
+        s3: str = Field(default="s3", keyvault_url="https://my-vault.vault.azure.net/")
+
+    plan = Settings.settings_resolution_plan()
+    assert dict(plan.alias_map) == {"e1": ("s1", "s2"), "e2": ("s2",)}
+    assert plan.aliases == {"e1", "e2"}
+    assert Settings(s3="i3").model_field_alias == [
+        ("s1", "e1"),
+        ("s2", "e2"),
+        ("s2", "e1"),
+    ]
+
+    # Routes compiled with the class
+    routes = plan.get_routes(AzureKeyVault(Settings))
+    assert routes["s1"].location is None
+    assert routes["s3"].location == ("https://my-vault.vault.azure.net/", None)
+    assert routes["s3"].candidates == (("s3", "s3", False),)
+
+    # Plan re-used across instances
+    Settings(s1="i1", s3="i3")
+    assert Settings.settings_resolution_plan() is plan
+    assert plan.get_routes(AzureKeyVault(Settings)) is routes
+
+    # Fields routed to each source
+    assert list(plan.get_routed_fields(AzureKeyVault(Settings))) == ["s3"]
+
+
+def test_unrouted_sources(monkeypatch):
+    from settus.settingssources import CloudSettingsSource
+
+    calls = []
+
+    def get_field_route(self, field, field_name):
+        calls.append((self.provider, field_name))
+        return original(self, field, field_name)
+
+    original = CloudSettingsSource.get_field_route
+    monkeypatch.setattr(CloudSettingsSource, "get_field_route", get_field_route)
+
+    class Settings(BaseSettings):
+        s1: str = Field(default="s1", alias="e1")
+        s2: str = Field(default="s2")
+        s3: str = Field(default="s3", keyvault_url="https://my-vault.vault.azure.net/")
+
+    # Cloud sources only resolve the fields routed to their provider
+    Settings(s3="i3")
+    assert calls == []
+
+
 if __name__ == "__main__":
     test_basesettings()
     test_name_conflicts()
     test_type_cast()
+    test_aload()
+    test_sources_priority()
+    test_resolution_plan()
@@ -0,0 +1,249 @@
+"""
+Offline benchmarks of settings loads against fake keyvault and secrets
+manager backends. Run `python -m tests.test_benchmarks` for a full report.
+"""
+
+import statistics
+import time
+import tracemalloc
+from typing import Any, Dict
+
+from pydantic import AliasChoices
+from pydantic import create_model
+
+from settus import BaseSettings
+from settus import Field
+from settus import SettingsConfigDict
+from tests.fakes import FakeSecretClient
+from tests.fakes import FakeSecretsManagerClient
+from tests.fakes import fake_clients
+
+KEYVAULT_URL = "https://bench.vault.azure.net/"
+
+
+def build_settings(
+    provider: str,
+    fields: int,
+    aliases: int,
+    secrets: int,
+    **config,
+) -> type[BaseSettings]:
+    """
+    Build a settings class with `fields` fields, each having `aliases`
+    aliases. Only the last alias of a field is stored in the backend. Azure
+    fields are stored in individual secrets while AWS fields are spread over
+    `secrets` documents.
+    """
+    if provider == "azure":
+        config["keyvault_url"] = KEYVAULT_URL
+
+    class _Settings(BaseSettings):
+        model_config = SettingsConfigDict(**config)
+
+    definitions = {}
+    for i in range(fields):
+        names = [f"missing-{i}-{j}" for j in range(aliases - 1)] + [f"secret-{i}"]
+        extra = {}
+        if provider == "aws":
+            extra["aws_secret_name"] = f"doc-{i % secrets}"
+        definitions[f"field_{i}"] = (
+            str,
+            Field(default="undefined", alias=AliasChoices(*names), **extra),
+        )
+
+    return create_model("Settings", __base__=_Settings, **definitions)
+
+
+def build_backend(provider: str, fields: int, secrets: int, **kwargs):
+    if provider == "azure":
+        values = {f"secret-{i}": f"value-{i}" for i in range(min(fields, secrets))}
+        return FakeSecretClient(values, **kwargs)
+
+    values = {f"doc-{i}": {} for i in range(secrets)}
+    for i in range(fields):
+        values[f"doc-{i % secrets}"][f"secret-{i}"] = f"value-{i}"
+    return FakeSecretsManagerClient(values, **kwargs)
+
+
+def run_benchmark(
+    provider: str,
+    fields: int = 10,
+    aliases: int = 1,
+    secrets: int = 10,
+    latency: float = 0.0,
+    error_rate: float = 0.0,
+    repeat: int = 5,
+    **config,
+) -> Dict[str, Any]:
+    """
+    Load settings `repeat` times against a fake backend.
+
+    Parameters
+    ----------
+    provider:
+        `"azure"` or `"aws"`
+    fields:
+        Number of fields
+    aliases:
+        Number of aliases per field
+    secrets:
+        Number of secrets (azure) or secret documents (aws)
+    latency:
+        Duration, in seconds, of each provider call
+    error_rate:
+        Probability for each provider call to fail
+    repeat:
+        Number of loads
+    config:
+        Settings model config
+
+    Returns
+    -------
+    :
+        Median wall time (s), provider calls, provider errors, peak
+        concurrent provider calls, peak traced memory (KiB) and allocated
+        memory blocks per load, and the last loaded settings
+    """
+    settings_cls = build_settings(provider, fields, aliases, secrets, **config)
+    backend = build_backend(
+        provider, fields, secrets, latency=latency, error_rate=error_rate
+    )
+    clients = {"keyvault" if provider == "azure" else "secretsmanager": backend}
+
+    times = []
+    calls = []
+    in_flight = []
+    peaks = []
+    blocks = []
+    with fake_clients(**clients):
+        for _ in range(repeat):
+            backend.reset()
+            tracemalloc.start()
+            before = tracemalloc.take_snapshot()
+            t0 = time.perf_counter()
+            settings = settings_cls()
+            times.append(time.perf_counter() - t0)
+            after = tracemalloc.take_snapshot()
+            peaks.append(tracemalloc.get_traced_memory()[1] / 1024)
+            tracemalloc.stop()
+            blocks.append(
+                sum(s.count_diff for s in after.compare_to(before, "filename"))
+            )
+            calls.append(backend.call_count)
+            in_flight.append(backend.max_in_flight)
+
+    return {
+        "provider": provider,
+        "fields": fields,
+        "aliases": aliases,
+        "secrets": secrets,
+        "concurrency": config.get("secret_fetch_concurrency") or 1,
+        "wall_time": statistics.median(times),
+        "calls": calls[-1],
+        "calls_first": calls[0],
+        "errors": backend.errors,
+        "max_in_flight": max(in_flight),
+        "peak_kib": statistics.median(peaks),
+        "blocks": statistics.median(blocks),
+        "settings": settings,
+    }
+
+
+def report(results: list) -> str:
+    columns = [
+        "provider",
+        "fields",
+        "aliases",
+        "secrets",
+        "concurrency",
+        "calls",
+        "errors",
+        "wall_time",
+        "peak_kib",
+        "blocks",
+    ]
+    lines = [" ".join(f"{c:>11}" for c in columns)]
+    for r in results:
+        lines += [
+            " ".join(
+                f"{r[c]:>11.4f}" if isinstance(r[c], float) else f"{r[c]:>11}"
+                for c in columns
+            )
+        ]
+    return "\n".join(lines)
+
+
+def test_benchmark_keyvault():
+    r = run_benchmark("azure", fields=20, aliases=3, secrets=15, repeat=2)
+    settings = r["settings"]
+    assert settings.field_0 == "value-0"
+    assert settings.field_14 == "value-14"
+    assert settings.field_15 == "undefined"
+    # Every alias of every field is requested once
+    assert r["calls"] == 20 * 3
+    assert r["errors"] == 0
+
+
+def test_benchmark_awssecrets():
+    r = run_benchmark("aws", fields=20, aliases=3, secrets=4, repeat=2)
+    settings = r["settings"]
+    assert settings.field_0 == "value-0"
+    assert settings.field_19 == "value-19"
+    # Each document is requested once, no matter the number of fields/aliases,
+    # in a single batch
+    assert r["calls"] == 1
+
+
+def test_benchmark_concurrency():
+    r = run_benchmark(
+        "azure",
+        fields=20,
+        secrets=20,
+        latency=0.05,
+        repeat=1,
+        secret_fetch_concurrency=10,
+    )
+    assert r["calls"] == 20
+    assert r["settings"].field_19 == "value-19"
+    assert r["max_in_flight"] == 10
+
+
+def test_benchmark_errors():
+    r = run_benchmark("azure", fields=20, secrets=20, error_rate=0.5, repeat=1)
+    values = r["settings"].model_dump().values()
+    assert r["calls"] == 20
+    assert 0 < r["errors"] < 20
+    assert list(values).count("undefined") == r["errors"]
+
+
+def test_benchmark_cache():
+    for provider in ["azure", "aws"]:
+        r = run_benchmark(
+            provider,
+            fields=10,
+            secrets=5,
+            secret_cache_ttl=60,
+            secret_cache_negative_ttl=60,
+        )
+        assert r["calls_first"] > 0
+        assert r["calls"] == 0
+
+
+if __name__ == "__main__":
+    results = []
+    for provider in ["azure", "aws"]:
+        for fields, aliases, secrets in [(10, 1, 10), (50, 2, 10), (200, 3, 20)]:
+            for concurrency in [None, 16]:
+                results += [
+                    run_benchmark(
+                        provider,
+                        fields=fields,
+                        aliases=aliases,
+                        secrets=secrets,
+                        latency=0.005,
+                        error_rate=0.01,
+                        repeat=3,
+                        secret_fetch_concurrency=concurrency,
+                    )
+                ]
+    print(report(results))
@@ -0,0 +1,236 @@
+import asyncio
+import time
+
+import pytest
+
+from settus import BaseSettings
+from settus import Field
+from settus import RetryPolicy
+from settus import SecretUnavailableError
+from settus import SettingsConfigDict
+from settus import circuit_breakers
+from settus.settingssources import AsyncAzureKeyVault
+from tests.fakes import FakeHttpResponseError
+from tests.fakes import FakeSecretClient
+from tests.fakes import FakeSecretsManagerClient
+from tests.fakes import fake_clients
+
+KEYVAULT_URL = "https://breaker.vault.azure.net/"
+
+SECRETS = {f"secret-{i}": f"value-{i}" for i in range(5)}
+
+
+def build_settings(**config):
+    class Settings(BaseSettings):
+        model_config = SettingsConfigDict(keyvault_url=KEYVAULT_URL, **config)
+        s0: str = Field(default="undefined", alias="secret-0")
+        s1: str = Field(default="undefined", alias="secret-1")
+        s2: str = Field(default="undefined", alias="secret-2")
+        s3: str = Field(default="undefined", alias="secret-3")
+        s4: str = Field(default="undefined", alias="secret-4")
+
+    return Settings
+
+
+def test_retry_policy():
+    policy = RetryPolicy(attempts=5, backoff=0.1, max_backoff=0.3)
+    delays = list(policy.delays())
+    assert len(delays) == 4
+    for i, d in enumerate(delays):
+        assert 0 <= d <= min(0.3, 0.1 * 2**i)
+
+    policy = RetryPolicy.from_config({"secret_retry_attempts": 3})
+    assert policy.attempts == 3
+    assert policy.backoff == 0.1
+    assert list(RetryPolicy.from_config({}).delays()) == []
+
+
+def test_retry():
+    keyvault = FakeSecretClient(SECRETS, error_rate=0.5)
+    Settings = build_settings(secret_retry_attempts=20, secret_retry_backoff=0)
+
+    with fake_clients(keyvault=keyvault):
+        settings = Settings()
+
+    assert settings.model_dump() == {f"s{i}": f"value-{i}" for i in range(5)}
+    assert keyvault.errors > 0
+    assert keyvault.call_count == 5 + keyvault.errors
+
+
+def test_transient_errors_not_cached():
+    keyvault = FakeSecretClient(SECRETS, error_rate=1.0)
+    Settings = build_settings(secret_cache_ttl=60, secret_cache_negative_ttl=60)
+
+    with fake_clients(keyvault=keyvault):
+        settings = Settings()
+        assert settings.s0 == "undefined"
+        assert settings.model_load_report.fields["s0"].unavailable
+
+        # Provider recovered: failed requests are sent again
+        keyvault.error_rate = 0.0
+        settings = Settings()
+        assert settings.s0 == "value-0"
+
+
+def test_circuit_breaker():
+    keyvault = FakeSecretClient(SECRETS, error_rate=1.0)
+    Settings = build_settings(secret_breaker_threshold=2, secret_breaker_cooldown=0.1)
+
+    with fake_clients(keyvault=keyvault):
+        settings = Settings()
+        assert settings.s4 == "undefined"
+
+        # Circuit opened after 2 failures, remaining requests skipped
+        assert keyvault.call_count == 2
+        assert circuit_breakers.states() == [
+            {
+                "provider": "azure",
+                "endpoint": KEYVAULT_URL.rstrip("/"),
+                "state": "open",
+                "failures": 2,
+            }
+        ]
+
+        # Circuit shared across loads
+        Settings()
+        assert keyvault.call_count == 2
+
+        # Trial request after cooldown closes the circuit
+        keyvault.error_rate = 0.0
+        time.sleep(0.1)
+        assert circuit_breakers.states()[0]["state"] == "half_open"
+        settings = Settings()
+        assert settings.s4 == "value-4"
+        assert circuit_breakers.states()[0]["state"] == "closed"
+
+
+def test_circuit_breaker_raise():
+    keyvault = FakeSecretClient(SECRETS, error_rate=1.0)
+    Settings = build_settings(secret_breaker_threshold=1, secret_timeout_policy="raise")
+
+    with fake_clients(keyvault=keyvault):
+        with pytest.raises(SecretUnavailableError) as e:
+            Settings()
+    assert keyvault.call_count == 1
+    assert list(e.value.fields) == ["s0", "s1", "s2", "s3", "s4"]
+    assert "s0 (azure)" in str(e.value)
+
+
+def test_circuit_breaker_refresh():
+    keyvault = FakeSecretClient(SECRETS)
+    Settings = build_settings(secret_breaker_threshold=1)
+
+    with fake_clients(keyvault=keyvault):
+        settings = Settings()
+
+        # Previous values are kept while the provider is unavailable
+        keyvault.error_rate = 1.0
+        assert settings.refresh() == []
+        assert settings.s0 == "value-0"
+        assert circuit_breakers.states()[0]["state"] == "open"
+
+
+def test_circuit_breaker_endpoints():
+    keyvault = FakeSecretClient(SECRETS, error_rate=1.0)
+    secretsmanager = FakeSecretsManagerClient({"document": {"secret-1": "value-1"}})
+
+    class Settings(BaseSettings):
+        model_config = SettingsConfigDict(
+            keyvault_url=KEYVAULT_URL, secret_breaker_threshold=1
+        )
+        s0: str = Field(default="undefined", alias="secret-0")
+        s1: str = Field(
+            default="undefined", alias="secret-1", aws_secret_name="document"
+        )
+
+    with fake_clients(keyvault=keyvault, secretsmanager=secretsmanager):
+        settings = Settings()
+
+    # An open circuit does not affect other providers
+    assert settings.s1 == "value-1"
+    assert keyvault.call_count == 1
+    assert secretsmanager.call_count == 1
+
+
+def test_circuit_breaker_async():
+    class Transport:
+        def __init__(self):
+            self.calls = 0
+
+        async def fetch(self, request):
+            self.calls += 1
+            raise FakeHttpResponseError("Too many requests", 429)
+
+    class Settings(build_settings(secret_breaker_threshold=2)):
+        @classmethod
+        def settings_customise_sources(cls, settings_cls, **kwargs):
+            return (AsyncAzureKeyVault(settings_cls, transport=transport),)
+
+    transport = Transport()
+    with fake_clients():
+        settings = asyncio.run(Settings.aload())
+
+    assert settings.s0 == "undefined"
+    assert transport.calls == 2
+
+
+def test_circuit_breaker_trial_error(monkeypatch):
+    keyvault = FakeSecretClient(SECRETS, error_rate=1.0)
+    Settings = build_settings(secret_breaker_threshold=1, secret_breaker_cooldown=0.05)
+
+    def get_secret(name):
+        raise RuntimeError("Unexpected error")
+
+    with fake_clients(keyvault=keyvault):
+        Settings()
+        time.sleep(0.05)
+
+        # Trial request failing with a non-transient error is released
+        with monkeypatch.context() as m:
+            m.setattr(keyvault, "get_secret", get_secret)
+            with pytest.raises(RuntimeError):
+                Settings()
+        assert circuit_breakers.states()[0]["state"] == "half_open"
+
+        keyvault.error_rate = 0.0
+        assert Settings().s0 == "value-0"
+        assert circuit_breakers.states()[0]["state"] == "closed"
+
+
+def test_circuit_breaker_trial_cancelled():
+    class Transport:
+        def __init__(self):
+            self.latency = 0.0
+
+        async def fetch(self, request):
+            await asyncio.sleep(self.latency)
+            return SECRETS[request[2]]
+
+    class Settings(
+        build_settings(
+            secret_breaker_threshold=1,
+            secret_breaker_cooldown=0.05,
+            secret_load_timeout=0.05,
+        )
+    ):
+        @classmethod
+        def settings_customise_sources(cls, settings_cls, **kwargs):
+            return (AsyncAzureKeyVault(settings_cls, transport=transport),)
+
+    transport = Transport()
+    with fake_clients():
+        breaker = circuit_breakers.get("azure", KEYVAULT_URL.rstrip("/"), 1, 0.05)
+        breaker.record_failure()
+        time.sleep(0.05)
+
+        # Trial request cancelled at deadline is a failure
+        transport.latency = 1.0
+        settings = asyncio.run(Settings.aload())
+        assert settings.s0 == "undefined"
+        assert breaker.state == "open"
+
+        transport.latency = 0.0
+        time.sleep(0.05)
+        settings = asyncio.run(Settings.aload())
+        assert settings.s0 == "value-0"
+        assert breaker.state == "closed"
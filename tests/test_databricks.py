@@ -0,0 +1,177 @@
+import base64
+import json
+import threading
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from types import SimpleNamespace
+from urllib.parse import parse_qs
+from urllib.parse import urlsplit
+
+import pytest
+from pydantic import AliasChoices
+
+from settus import BaseSettings
+from settus import Field
+from settus import SettingsConfigDict
+from settus.settingssources import databricks_client_pool
+
+TOKEN = "dapi-test"
+
+SCOPES = {
+    "scope-1": {"my-secret": "secretsauce", "top": "topsecret"},
+    "scope-2": {"my-other-secret": "othersauce"},
+}
+
+
+class DatabricksHandler(BaseHTTPRequestHandler):
+    """Stand-in of the Databricks secrets REST API"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, data):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        server = self.server
+        with server.lock:
+            server.calls.append((url.path, params))
+            server.ports.add(self.client_address[1])
+
+        if self.headers.get("Authorization") != f"Bearer {TOKEN}":
+            return self._reply(401, {"error_code": "UNAUTHENTICATED"})
+
+        scope = server.scopes.get(params.get("scope"))
+        if scope is None:
+            return self._reply(
+                404, {"error_code": "RESOURCE_DOES_NOT_EXIST", "message": "No scope"}
+            )
+
+        if url.path == "/api/2.0/secrets/list":
+            secrets = [
+                {"key": k, "last_updated_timestamp": server.timestamps.get(k, 1)}
+                for k in scope
+            ]
+            return self._reply(200, {"secrets": secrets})
+
+        if url.path == "/api/2.0/secrets/get":
+            key = params["key"]
+            if key not in scope:
+                return self._reply(404, {"error_code": "RESOURCE_DOES_NOT_EXIST"})
+            value = base64.b64encode(scope[key].encode()).decode()
+            return self._reply(200, {"key": key, "value": value})
+
+        self._reply(404, {"error_code": "ENDPOINT_NOT_FOUND"})
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), DatabricksHandler)
+    server.scopes = json.loads(json.dumps(SCOPES))
+    server.timestamps = {}
+    server.calls = []
+    server.ports = set()
+    server.lock = threading.Lock()
+    server.host = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    databricks_client_pool.clear()
+    server.shutdown()
+    server.server_close()
+
+
+def test_databricks_secrets(server):
+    class Settings(BaseSettings):
+        model_config = SettingsConfigDict(
+            databricks_host=server.host,
+            databricks_token=TOKEN,
+            databricks_secret_scope="scope-1",
+        )
+        top: str = Field(default="undefined")
+        kv_1: str = Field(default="undefined", alias="my-secret")
+        kv_2: str = Field(
+            default="undefined", alias=AliasChoices("not-my-secret", "my-secret")
+        )
+        kv_3: str = Field(
+            default="undefined",
+            alias="my-other-secret",
+            databricks_secret_scope="scope-2",
+        )
+        kv_4: str = Field(default="undefined", alias="not-my-secret")
+        kv_5: str = Field(
+            default="undefined",
+            alias="my-third-secret",
+            databricks_secret_scope="scope-3",
+        )
+
+    settings = Settings()
+    assert settings.top == "topsecret"
+    assert settings.kv_1 == "secretsauce"
+    assert settings.kv_2 == "secretsauce"
+    assert settings.kv_3 == "othersauce"
+    assert settings.kv_4 == "undefined"
+    assert settings.kv_5 == "undefined"
+
+    # Each scope listed once, only existing keys fetched once
+    lists = [p["scope"] for path, p in server.calls if path.endswith("/list")]
+    gets = [(p["scope"], p["key"]) for path, p in server.calls if path.endswith("/get")]
+    assert lists == ["scope-1", "scope-2", "scope-3"]
+    assert gets == [
+        ("scope-1", "top"),
+        ("scope-1", "my-secret"),
+        ("scope-2", "my-other-secret"),
+    ]
+
+    # Keep-alive connection re-used across requests and loads
+    Settings()
+    assert len(server.calls) == 12
+    assert len(server.ports) == 1
+    assert len(databricks_client_pool) == 1
+
+    # Refresh
+    server.scopes["scope-1"]["top"] = "newsecret"
+    server.timestamps["top"] = 2
+    assert settings.refresh() == ["top"]
+    assert settings.top == "newsecret"
+
+
+def test_databricks_dbutils():
+    calls = []
+
+    class Secrets:
+        def list(self, scope):
+            calls.append(("list", scope))
+            return [SimpleNamespace(key=k) for k in SCOPES.get(scope, {})]
+
+        def get(self, scope, key):
+            calls.append(("get", scope, key))
+            return SCOPES[scope][key]
+
+    class Settings(BaseSettings):
+        model_config = SettingsConfigDict(
+            databricks_dbutils=SimpleNamespace(secrets=Secrets()),
+            databricks_secret_scope="scope-1",
+        )
+        top: str = Field(default="undefined")
+        kv_1: str = Field(
+            default="undefined", alias=AliasChoices("not-my-secret", "my-secret")
+        )
+
+    settings = Settings()
+    assert settings.top == "topsecret"
+    assert settings.kv_1 == "secretsauce"
+    assert calls == [
+        ("list", "scope-1"),
+        ("get", "scope-1", "top"),
+        ("get", "scope-1", "my-secret"),
+    ]
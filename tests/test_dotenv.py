@@ -0,0 +1,70 @@
+import os
+from pathlib import Path
+
+from settus import BaseSettings
+from settus import Field
+from settus import SettingsConfigDict
+from settus.settingssources import dotenv_cache
+
+DEV_ENV = Path(__file__).parents[1] / "settings" / "dev.env"
+
+
+def test_dotenv(tmp_path, monkeypatch):
+    path = tmp_path / "settings" / "dev.env"
+    path.parent.mkdir()
+    path.write_text("DOTENV_1=d1\nDOTENV_2=d2\n")
+    monkeypatch.setenv("DOTENV_2", "e2")
+    dotenv_cache.clear()
+
+    class Settings(BaseSettings):
+        model_config = SettingsConfigDict(env_file=path)
+        dotenv_1: str = Field(default="undefined")
+        dotenv_2: str = Field(default="undefined")
+        dotenv_3: str = Field(default="undefined", alias="dotenv-3")
+
+    # Environment variables have precedence
+    settings = Settings()
+    assert settings.dotenv_1 == "d1"
+    assert settings.dotenv_2 == "e2"
+    assert settings.model_load_report.fields["dotenv_1"].source == (
+        "CachedDotEnvSettingsSource"
+    )
+
+    # Parsed once
+    for _ in range(3):
+        Settings()
+    assert dotenv_cache.parses == 1
+
+    # Parsed again when modified
+    path.write_text("DOTENV_1=new\nDOTENV_2=d2\ndotenv-3=d3\n")
+    settings = Settings()
+    assert settings.dotenv_1 == "new"
+    assert settings.dotenv_3 == "d3"
+    assert dotenv_cache.parses == 2
+
+    # Missing file
+    settings = Settings(_env_file=tmp_path / "missing.env")
+    assert settings.dotenv_1 == "undefined"
+    assert len(dotenv_cache) == 1
+
+    # Same signature, but another inode
+    tmp = tmp_path / "tmp.env"
+    tmp.write_text("DOTENV_1=swp\nDOTENV_2=d2\ndotenv-3=d3\n")
+    os.utime(tmp, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns))
+    os.replace(tmp, path)
+    assert Settings().dotenv_1 == "swp"
+    dotenv_cache.clear()
+
+
+def test_dotenv_extra():
+    class Settings(BaseSettings):
+        model_config = SettingsConfigDict(env_file=DEV_ENV)
+        my_env: str = Field(default="undefined")
+
+    # Variables which are not fields are ignored
+    assert Settings().my_env == "undefined"
+
+    class ExtraSettings(Settings):
+        model_config = SettingsConfigDict(extra="allow")
+
+    assert ExtraSettings().model_extra["aws_region"]
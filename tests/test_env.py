@@ -0,0 +1,90 @@
+import os
+
+from pydantic import BaseModel
+from pydantic_settings.sources import EnvSettingsSource
+
+from settus import BaseSettings
+from settus import Field
+from settus import SettingsConfigDict
+from settus.settingssources import IndexedEnvSettingsSource
+from settus.settingssources import get_env_index
+
+
+class Database(BaseModel):
+    host: str = "localhost"
+    port: int = 5432
+    options: dict = {}
+
+
+class Settings(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="app_", env_nested_delimiter="__")
+    name: str = Field(default="undefined")
+    alias_1: str = Field(default="undefined", alias="app-alias")
+    database: Database = Database()
+
+
+def test_env(monkeypatch):
+    monkeypatch.setenv("APP_NAME", "settus")
+    monkeypatch.setenv("app-alias", "aliased")
+    monkeypatch.setenv("APP_DATABASE__HOST", "db")
+    monkeypatch.setenv("APP_DATABASE__OPTIONS", '{"ssl": true}')
+    monkeypatch.setenv("APP_DATABASE__OPTIONS__TIMEOUT", "10")
+
+    settings = Settings()
+    assert settings.name == "settus"
+    assert settings.alias_1 == "aliased"
+    assert settings.database.host == "db"
+    assert settings.database.options == {"ssl": True, "timeout": "10"}
+
+    # Same values as pydantic-settings source
+    kwargs = {"env_prefix": "app_", "env_nested_delimiter": "__"}
+    assert IndexedEnvSettingsSource(Settings, **kwargs)() == (
+        EnvSettingsSource(Settings, **kwargs)()
+    )
+
+
+def test_env_index(monkeypatch):
+    monkeypatch.setenv("APP_NAME", "settus")
+    index = get_env_index(False, "__")
+    builds = index.builds
+    updates = index.updates
+
+    # Unchanged environment
+    Settings()
+    Settings()
+    assert (index.builds, index.updates) == (builds, updates)
+
+    # Incremental update
+    monkeypatch.setenv("APP_NAME", "new")
+    monkeypatch.setenv("APP_DATABASE__PORT", "1234")
+    settings = Settings()
+    assert settings.name == "new"
+    assert settings.database.port == 1234
+    assert (index.builds, index.updates) == (builds, updates + 1)
+    assert index.nested["app_database__"]["app_database__port"] == "1234"
+
+    # Re-built on removal
+    monkeypatch.delenv("APP_DATABASE__PORT")
+    settings = Settings()
+    assert settings.database.port == 5432
+    assert index.builds == builds + 1
+    assert "app_database__port" not in index.vars
+
+
+def test_env_index_fallback(monkeypatch):
+    # Environment without the CPython `_data` encoded variables
+    environ = {k: v for k, v in os.environ.items() if not k.startswith("APP_")}
+    environ["APP_NAME"] = "fallback"
+    monkeypatch.setattr(os, "environ", environ)
+    index = get_env_index(False, "__")
+    updates = index.updates
+
+    settings = Settings()
+    assert settings.name == "fallback"
+    assert "app_name" in index.vars
+
+    # Incremental update
+    environ["APP_DATABASE__PORT"] = "1234"
+    assert Settings().database.port == 1234
+    assert index.updates == updates + 1
+    assert index.nested["app_database__"]["app_database__port"] == "1234"
@@ -0,0 +1,101 @@
+from pydantic import AliasChoices
+
+from settus import BaseSettings
+from settus import Field
+from settus import SettingsConfigDict
+from settus.settingssources import gcp_client_pool
+from tests.fakes import FakeSecretManagerServiceClient
+from tests.fakes import fake_clients
+
+PROJECT_ID = "settus-dev"
+
+
+def test_gcp_secrets():
+    client = FakeSecretManagerServiceClient(
+        {
+            "my-secret": "secretsauce",
+            "top": "topsecret",
+            "vault": {"my-doc-secret": "docsauce", "my-other-doc-secret": "othersauce"},
+        }
+    )
+
+    class Settings(BaseSettings):
+        model_config = SettingsConfigDict(gcp_project_id=PROJECT_ID)
+        top: str = Field(default="undefined")
+        kv_1: str = Field(default="undefined", alias="my-secret")
+        kv_2: str = Field(
+            default="undefined", alias=AliasChoices("not-my-secret", "my-secret")
+        )
+        kv_3: str = Field(
+            default="undefined", alias="my-doc-secret", gcp_secret_name="vault"
+        )
+        kv_4: str = Field(
+            default="undefined", alias="my-other-doc-secret", gcp_secret_name="vault"
+        )
+        kv_5: str = Field(default="undefined", alias="not-my-other-secret")
+
+    with fake_clients(gcp=client):
+        settings = Settings()
+        assert settings.top == "topsecret"
+        assert settings.kv_1 == "secretsauce"
+        assert settings.kv_2 == "secretsauce"
+        assert settings.kv_3 == "docsauce"
+        assert settings.kv_4 == "othersauce"
+        assert settings.kv_5 == "undefined"
+
+        # Each secret version accessed once, document parsed once
+        assert client.calls["access_secret_version"] == 5
+
+        # Single client per process
+        Settings()
+        assert len(gcp_client_pool) == 1
+
+        # Refresh
+        client.secrets["top"] = "newsecret"
+        client.versions["top"] = 2
+        assert settings.refresh() == ["top"]
+        assert settings.top == "newsecret"
+
+
+def test_gcp_secrets_concurrency():
+    client = FakeSecretManagerServiceClient(
+        {f"secret-{i}": f"value-{i}" for i in range(8)}, latency=0.05
+    )
+
+    class Settings(BaseSettings):
+        model_config = SettingsConfigDict(gcp_project_id=PROJECT_ID)
+        s0: str = Field(default="undefined", alias="secret-0")
+        s1: str = Field(default="undefined", alias="secret-1")
+        s2: str = Field(default="undefined", alias="secret-2")
+        s3: str = Field(default="undefined", alias="secret-3")
+        s4: str = Field(default="undefined", alias="secret-4")
+        s5: str = Field(default="undefined", alias="secret-5")
+        s6: str = Field(default="undefined", alias="secret-6")
+        s7: str = Field(default="undefined", alias="secret-7")
+
+    with fake_clients(gcp=client):
+        settings = Settings()
+
+    assert settings.s7 == "value-7"
+    assert client.call_count == 8
+    assert client.max_in_flight == 8
+
+
+def test_gcp_secrets_opt_in(monkeypatch):
+    monkeypatch.setenv("GOOGLE_CLOUD_PROJECT", PROJECT_ID)
+    client = FakeSecretManagerServiceClient(
+        {"my-env": "secretsauce", "vault": {"my-doc-secret": "docsauce"}}
+    )
+
+    class Settings(BaseSettings):
+        my_env: str = Field(default="x", alias="my-env")
+        kv_1: str = Field(
+            default="undefined", alias="my-doc-secret", gcp_secret_name="vault"
+        )
+
+    # Project from environment only used by fields opting in
+    with fake_clients(gcp=client):
+        settings = Settings()
+    assert settings.my_env == "x"
+    assert settings.kv_1 == "docsauce"
+    assert client.calls["access_secret_version"] == 1
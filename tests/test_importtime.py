@@ -0,0 +1,82 @@
+"""
+Import time regression benchmark. Cloud providers SDK must only be imported
+when a provider source runs. Run `python -m tests.test_importtime` for a
+report of the slowest imports.
+"""
+
+import os
+import subprocess
+import sys
+from typing import Dict
+
+SDK_PACKAGES = ["azure", "boto3", "botocore", "cryptography", "google", "pyspark"]
+
+# Importable stand-ins shadowing the SDKs, so that any import is detected
+# whether the SDKs are installed or not.
+SDK_MODULES = {
+    "azure/__init__.py": "",
+    "azure/core/__init__.py": "",
+    "azure/core/credentials.py": "TokenCredential = object\n",
+    "boto3/__init__.py": "",
+    "botocore/__init__.py": "",
+    "cryptography/__init__.py": "",
+    "google/__init__.py": "",
+    "pyspark/__init__.py": "",
+}
+
+
+def import_times(module: str = "settus", pythonpath: str = None) -> Dict[str, int]:
+    """
+    Import a module in a new interpreter with `python -X importtime`.
+
+    Parameters
+    ----------
+    module:
+        Module name
+    pythonpath:
+        Path prepended to `PYTHONPATH`
+
+    Returns
+    -------
+    :
+        Cumulative import time (in microseconds) of each imported module
+    """
+    env = dict(os.environ)
+    if pythonpath is not None:
+        env["PYTHONPATH"] = os.pathsep.join(
+            [pythonpath, os.getcwd(), env.get("PYTHONPATH", "")]
+        )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_import_sdk_free(tmp_path):
+    for path, content in SDK_MODULES.items():
+        path = tmp_path / path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+    times = import_times("settus", pythonpath=str(tmp_path))
+    assert "settus" in times
+    imported = [m for m in times if m.split(".")[0] in SDK_PACKAGES]
+    assert imported == []
+
+
+if __name__ == "__main__":
+    times = import_times("settus")
+    print(f"{'module':<50} {'cumulative (us)':>15}")
+    for name, t in sorted(times.items(), key=lambda x: -x[1])[:20]:
+        print(f"{name:<50} {t:>15}")
@@ -39,5 +39,136 @@ def test_keyvault():
     assert settings.kv_4 == "undefined"
 
 
+def test_keyvault_client_pool(monkeypatch):
+    from settus.settingssources import KeyVaultClientPool
+
+    class Closable:
+        def __init__(self, *args):
+            self.args = args
+            self.closed = False
+
+        def close(self):
+            self.closed = True
+
+    pool = KeyVaultClientPool()
+    monkeypatch.setattr(pool, "_create_default_credential", Closable)
+    monkeypatch.setattr(pool, "_create_client", Closable)
+
+    client = pool.get_client(KEYVAULT_URL)
+    assert pool.get_client(KEYVAULT_URL) is client
+    assert pool.get_client(KEYVAULT_URL.rstrip("/")) is client
+    assert client.args == (KEYVAULT_URL, pool.get_credential())
+
+    credential = Closable()
+    other_client = pool.get_client(KEYVAULT_URL, credential)
+    assert other_client is not client
+    assert other_client.args[1] is credential
+    assert len(pool) == 2
+
+    default_credential = pool.get_credential()
+    pool.clear()
+    assert len(pool) == 0
+    assert client.closed
+    assert other_client.closed
+    assert default_credential.closed
+    assert not credential.closed
+
+
+def test_keyvault_concurrency(monkeypatch):
+    import threading
+    import time
+    from settus.settingssources import AzureKeyVault
+
+    secrets = {"top": "topsecret", "my-secret": "secretsauce"}
+    calls = []
+    threads = set()
+
+    def fetch(self, request):
+        time.sleep(0.05)
+        calls.append(request)
+        threads.add(threading.get_ident())
+        return secrets.get(request[-1])
+
+    monkeypatch.setattr(AzureKeyVault, "fetch", fetch)
+
+    class Settings(BaseSettings):
+        model_config = SettingsConfigDict(
+            keyvault_url=KEYVAULT_URL, secret_fetch_concurrency=8
+        )
+        env_1: str = Field(default="undefined")
+        top: str = Field(default="undefined")
+        kv_1: str = Field(default="undefined", alias="my-secret")
+        kv_2: str = Field(
+            default="undefined", alias=AliasChoices("not-my-secret", "my-secret")
+        )
+        kv_4: str = Field(default="undefined", alias=AliasChoices("not-my-secret"))
+
+    settings = Settings()
+    assert settings.env_1 == "v1"
+    assert settings.top == "topsecret"
+    assert settings.kv_1 == "secretsauce"
+    assert settings.kv_2 == "secretsauce"
+    assert settings.kv_4 == "undefined"
+
+    # Each distinct request sent once, using multiple threads
+    assert sorted(r[-1] for r in calls) == ["my-secret", "not-my-secret", "top"]
+    assert len(threads) > 1
+
+
+def test_keyvault_async():
+    import asyncio
+    from settus.settingssources import AsyncAzureKeyVault
+
+    class FakeTransport:
+        def __init__(self, secrets):
+            self.secrets = secrets
+            self.pending = 0
+            self.max_pending = 0
+            self.calls = []
+
+        async def fetch(self, request):
+            self.pending += 1
+            self.max_pending = max(self.max_pending, self.pending)
+            await asyncio.sleep(0.01)
+            self.pending -= 1
+            self.calls.append(request)
+            return self.secrets.get(request[-1])
+
+    transport = FakeTransport({"top": "topsecret", "my-secret": "secretsauce"})
+
+    class Settings(BaseSettings):
+        model_config = SettingsConfigDict(keyvault_url=KEYVAULT_URL)
+        env_1: str = Field(default="undefined")
+        top: str = Field(default="undefined")
+        kv_2: str = Field(
+            default="undefined", alias=AliasChoices("not-my-secret", "my-secret")
+        )
+        kv_4: str = Field(default="undefined", alias=AliasChoices("not-my-secret"))
+
+        @classmethod
+        def settings_customise_sources(
+            cls,
+            settings_cls,
+            init_settings,
+            env_settings,
+            dotenv_settings,
+            file_secret_settings,
+        ):
+            return (
+                init_settings,
+                env_settings,
+                AsyncAzureKeyVault(settings_cls, transport=transport),
+            )
+
+    settings = asyncio.run(Settings.aload(top="init"))
+    assert settings.env_1 == "v1"
+    assert settings.top == "init"
+    assert settings.kv_2 == "secretsauce"
+    assert settings.kv_4 == "undefined"
+    # Field `top` resolved by init values is not requested
+    assert sorted(r[-1] for r in transport.calls) == ["my-secret", "not-my-secret"]
+    assert transport.max_pending == 2
+
+
 if __name__ == "__main__":
     test_keyvault()
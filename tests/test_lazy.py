@@ -0,0 +1,186 @@
+import asyncio
+import copy
+import os
+import threading
+
+import pytest
+from pydantic import ValidationError
+
+from settus import BaseSettings
+from settus import Field
+from settus import SettingsConfigDict
+from settus.settingssources import AsyncAzureKeyVault
+from tests.fakes import FakeSecretClient
+from tests.fakes import FakeSecretManagerServiceClient
+from tests.fakes import fake_clients
+
+KEYVAULT_URL = "https://lazy.vault.azure.net/"
+
+SECRETS = {
+    "my-secret": "secretsauce",
+    "my-other-secret": "othersauce",
+    "my-number": "not-a-number",
+}
+
+
+class Settings(BaseSettings):
+    model_config = SettingsConfigDict(keyvault_url=KEYVAULT_URL, secret_lazy=True)
+    kv_1: str = Field(default="undefined", alias="my-secret")
+    kv_2: str = Field(default="undefined", alias="my-other-secret")
+    kv_3: str = Field(default="undefined", alias="my-eager-secret", secret_lazy=False)
+    kv_4: int = Field(default=0, alias="my-number")
+    kv_5: str = Field(default="undefined", alias="my-missing-secret")
+
+
+def test_lazy():
+    keyvault = FakeSecretClient(SECRETS)
+
+    with fake_clients(keyvault=keyvault):
+        settings = Settings()
+
+        # Only the eager field is fetched
+        assert keyvault.calls["get_secret"] == 1
+        assert settings.kv_3 == "undefined"
+        assert settings.model_load_report.fields["kv_1"].lazy
+
+        # Resolved on first access and memoized
+        assert settings.kv_1 == "secretsauce"
+        assert settings.kv_1 == "secretsauce"
+        assert keyvault.calls["get_secret"] == 2
+        report = settings.model_load_report.fields["kv_1"]
+        assert report.source == "AzureKeyVault"
+        assert report.calls == 1
+
+        # Default when not found
+        assert settings.kv_5 == "undefined"
+
+        # Validated on first access
+        with pytest.raises(ValidationError, match="kv_4"):
+            _ = settings.kv_4
+
+        # Pending fields resolved before dump
+        settings.kv_4 = 1
+        assert settings.model_dump(exclude={"kv_4"}) == {
+            "kv_1": "secretsauce",
+            "kv_2": "othersauce",
+            "kv_3": "undefined",
+            "kv_5": "undefined",
+        }
+        assert keyvault.calls["get_secret"] == 5
+
+
+def test_lazy_report():
+    keyvault = FakeSecretClient(SECRETS)
+
+    with fake_clients(keyvault=keyvault):
+        settings = Settings()
+
+        # Resolved before the load report is built
+        assert settings.kv_1 == "secretsauce"
+        report = settings.model_load_report.fields["kv_1"]
+        assert report.lazy
+        assert report.source == "AzureKeyVault"
+        assert report.calls == 1
+        assert not settings.model_load_report.fields["kv_3"].lazy
+
+
+def test_lazy_env():
+    os.environ["my-other-secret"] = "envsauce"
+    keyvault = FakeSecretClient(SECRETS)
+    try:
+        with fake_clients(keyvault=keyvault):
+            settings = Settings()
+            assert settings.resolve_lazy_fields(["kv_1", "kv_2"]) == ["kv_1"]
+    finally:
+        del os.environ["my-other-secret"]
+
+    # Environment values are resolved eagerly
+    assert settings.kv_2 == "envsauce"
+    assert settings.kv_1 == "secretsauce"
+    assert keyvault.calls["get_secret"] == 2
+
+
+def test_lazy_threads():
+    keyvault = FakeSecretClient(SECRETS, latency=0.01)
+
+    with fake_clients(keyvault=keyvault):
+        settings = Settings()
+        values = []
+        threads = [
+            threading.Thread(target=lambda: values.append(settings.kv_1))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    assert values == ["secretsauce"] * 8
+    assert keyvault.calls["get_secret"] == 2
+
+
+def test_lazy_copy_refresh():
+    client = FakeSecretManagerServiceClient(dict(SECRETS))
+
+    class GCPSettings(BaseSettings):
+        model_config = SettingsConfigDict(gcp_project_id="settus-dev", secret_lazy=True)
+        kv_1: str = Field(default="undefined", alias="my-secret")
+        kv_2: str = Field(default="undefined", alias="my-other-secret")
+
+    with fake_clients(gcp=client):
+        settings = GCPSettings()
+        assert settings.kv_1 == "secretsauce"
+
+        # Pending fields are not refreshed
+        client.secrets["my-secret"] = "newsauce"
+        client.secrets["my-other-secret"] = "newothersauce"
+        client.versions = {"my-secret": 2, "my-other-secret": 2}
+        assert settings.refresh() == ["kv_1"]
+        assert settings.kv_1 == "newsauce"
+        assert settings.kv_2 == "newothersauce"
+
+        other = copy.copy(settings)
+        assert other == settings
+
+
+def test_lazy_instances_lock():
+    keyvault = FakeSecretClient(SECRETS)
+
+    with fake_clients(keyvault=keyvault):
+        settings = [Settings(), Settings()]
+        values = []
+        thread = threading.Thread(target=lambda: values.append(settings[1].kv_1))
+
+        # Resolution is not blocked by other instances
+        with settings[0]._settus_lock:
+            thread.start()
+            thread.join(timeout=5)
+        assert values == ["secretsauce"]
+
+
+def test_lazy_async():
+    class Transport:
+        def __init__(self):
+            self.calls = 0
+
+        async def fetch(self, request):
+            self.calls += 1
+            return {**SECRETS, "my-number": "1"}.get(request[2])
+
+    class AsyncSettings(Settings):
+        @classmethod
+        def settings_customise_sources(cls, settings_cls, **kwargs):
+            return (AsyncAzureKeyVault(settings_cls, transport=transport),)
+
+    transport = Transport()
+    keyvault = FakeSecretClient(SECRETS)
+    with fake_clients(keyvault=keyvault):
+        settings = asyncio.run(AsyncSettings.aload())
+
+        # Resolved during load, with the asynchronous transport
+        assert not settings.model_load_report.fields["kv_1"].lazy
+        assert settings.kv_1 == "secretsauce"
+        assert settings.kv_5 == "undefined"
+
+    assert transport.calls == 5
+    assert keyvault.call_count == 0
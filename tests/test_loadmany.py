@@ -0,0 +1,176 @@
+from pydantic import ValidationError
+
+from settus import BaseSettings
+from settus import Field
+from settus import SettingsConfigDict
+from settus.settingssources import keyvault_client_pool
+from tests.fakes import FakeSecretClient
+from tests.fakes import FakeSecretsManagerClient
+from tests.fakes import fake_clients
+
+VAULTS = {
+    "https://tenant-a.vault.azure.net/": {
+        "tenant-name": "a",
+        "shared-secret": "shared-a",
+    },
+    "https://tenant-b.vault.azure.net/": {
+        "tenant-name": "b",
+        "shared-secret": "shared-b",
+    },
+}
+
+
+class Settings(BaseSettings):
+    name: str
+    tenant: str = Field(default="undefined", alias="tenant-name")
+    shared: str = Field(default="undefined", alias="shared-secret")
+
+
+def test_load_many(monkeypatch):
+    clients = {
+        url: FakeSecretClient(secrets, latency=0.01) for url, secrets in VAULTS.items()
+    }
+    variations = [
+        {"name": f"{url[8:16]}-{i}", "_config": {"keyvault_url": url}}
+        for i in range(10)
+        for url in VAULTS
+    ]
+
+    with fake_clients(keyvault=FakeSecretClient({})):
+        monkeypatch.setattr(
+            keyvault_client_pool, "_create_client", lambda url, credential: clients[url]
+        )
+        settings = Settings.load_many(variations, concurrency=8)
+
+    assert len(settings) == 20
+    assert all(isinstance(s, Settings) for s in settings)
+    assert settings[0].name == "tenant-a-0"
+    assert settings[0].tenant == "a"
+    assert settings[1].shared == "shared-b"
+
+    # Each secret fetched once across all instances
+    for client in clients.values():
+        assert client.calls["get_secret"] == 2
+
+    # Subclasses are created once per config
+    assert type(settings[0]) is type(settings[2])
+    assert type(settings[0]) is not type(settings[1])
+
+
+def test_load_many_errors():
+    keyvault = FakeSecretClient({"tenant-name": "a"})
+    variations = [
+        {"name": "a"},
+        {},
+        {"name": "b"},
+    ]
+
+    class Settings(BaseSettings):
+        model_config = SettingsConfigDict(keyvault_url="https://a.vault.azure.net/")
+        name: str
+        tenant: str = Field(default="undefined", alias="tenant-name")
+
+    with fake_clients(keyvault=keyvault):
+        settings = Settings.load_many(variations)
+
+    assert settings[0].tenant == "a"
+    assert isinstance(settings[1], ValidationError)
+    assert settings[2].name == "b"
+    # "name" only looked up for the instance missing it
+    assert keyvault.calls["get_secret"] == 2
+
+
+def test_load_many_shared_documents():
+    secrets = {f"doc-{i}": {f"key-{i}": f"value-{i}"} for i in range(4)}
+    client = FakeSecretsManagerClient(secrets, latency=0.01, batch=False)
+
+    class Settings(BaseSettings):
+        common: str = Field(default="undefined", alias="key-0", aws_secret_name="doc-0")
+        tenant_1: str = Field(default="undefined", alias="key-1")
+        tenant_2: str = Field(default="undefined", alias="key-2")
+
+    variations = [
+        {"_config": {"aws_secret_name": f"doc-{i % 3 + 1}"}} for i in range(9)
+    ]
+    with fake_clients(secretsmanager=client):
+        settings = Settings.load_many(variations, concurrency=9)
+
+    assert [s.common for s in settings] == ["value-0"] * 9
+    assert settings[0].tenant_1 == "value-1"
+    assert settings[1].tenant_2 == "value-2"
+    assert settings[2].tenant_1 == "undefined"
+
+    # Shared and tenant documents fetched once
+    assert client.calls["get_secret_value"] == 4
+
+
+def test_load_many_credentials(monkeypatch):
+    url = "https://tenant-a.vault.azure.net/"
+    allowed = object()
+    denied = object()
+    clients = {
+        id(allowed): FakeSecretClient(VAULTS[url], latency=0.01),
+        id(denied): FakeSecretClient({}, latency=0.01),
+    }
+    variations = [
+        {"name": f"{i}", "_config": {"keyvault_url": url, "keyvault_credentials": c}}
+        for i in range(4)
+        for c in [allowed, denied]
+    ]
+
+    with fake_clients(keyvault=FakeSecretClient({})):
+        monkeypatch.setattr(
+            keyvault_client_pool,
+            "_create_client",
+            lambda url, credential: clients[id(credential)],
+        )
+
+        # Values are not shared with a caller using other credentials
+        settings = Settings.load_many(variations, concurrency=8)
+        assert [s.tenant for s in settings] == ["a", "undefined"] * 4
+
+        # Nor through the secrets cache
+        config = {"keyvault_url": url, "secret_cache_ttl": 60}
+        Settings._settus_variant({**config, "keyvault_credentials": allowed})(name="a")
+        settings = Settings._settus_variant({**config, "keyvault_credentials": denied})(
+            name="b"
+        )
+        assert settings.tenant == "undefined"
+
+    for client in clients.values():
+        assert client.calls["get_secret"] == 4
+
+
+def test_load_many_variants():
+    class Settings(BaseSettings):
+        name: str = "undefined"
+
+    # Subclasses are created once per config value
+    config = {"aws_secret_name": "doc", "load_span_hook": None, "extra": "ignore"}
+    variants = [
+        Settings._settus_variant({**config, "json_schema_extra": {"a": [1, {2}]}})
+        for _ in range(3)
+    ]
+    assert variants[0] is variants[1] is variants[2]
+    assert len(Settings._settus_variants) == 1
+    variant = Settings._settus_variant({**config, "json_schema_extra": {"a": (1,)}})
+    assert variant is not variants[0]
+
+    settings = Settings.load_many([{"_config": {"title": bytearray(b"a")}}])
+    assert isinstance(settings[0], TypeError)
+
+
+def test_load_many_variants_bounded(monkeypatch):
+    monkeypatch.setattr("settus.basesettings.MAX_LOAD_VARIANTS", 2)
+
+    class Settings(BaseSettings):
+        name: str = "undefined"
+
+    # Least recently used variant discarded
+    v1 = Settings._settus_variant({"env_prefix": "a_"})
+    v2 = Settings._settus_variant({"env_prefix": "b_"})
+    assert Settings._settus_variant({"env_prefix": "a_"}) is v1
+    Settings._settus_variant({"env_prefix": "c_"})
+    assert len(Settings._settus_variants) == 2
+    assert Settings._settus_variant({"env_prefix": "a_"}) is v1
+    assert Settings._settus_variant({"env_prefix": "b_"}) is not v2
@@ -0,0 +1,139 @@
+import asyncio
+import contextlib
+
+from pydantic import AliasChoices
+
+from settus import BaseSettings
+from settus import Field
+from settus import LoadReport
+from settus import SettingsConfigDict
+from tests.fakes import FakeSecretClient
+from tests.fakes import FakeSecretsManagerClient
+from tests.fakes import fake_clients
+
+KEYVAULT_URL = "https://report.vault.azure.net/"
+
+
+def test_load_report(monkeypatch):
+    monkeypatch.setenv("ENV_1", "v1")
+    keyvault = FakeSecretClient({"kv-secret": "kv-value"})
+    secretsmanager = FakeSecretsManagerClient({"doc": {"aws-secret": "aws-value"}})
+
+    reports = []
+    spans = []
+
+    @contextlib.contextmanager
+    def span(name, attributes):
+        spans.append((name, attributes))
+        yield
+
+    class Settings(BaseSettings):
+        model_config = SettingsConfigDict(
+            keyvault_url=KEYVAULT_URL,
+            aws_secret_name="doc",
+            secret_cache_ttl=60,
+            secret_cache_negative_ttl=60,
+            load_report_callback=reports.append,
+            load_span_hook=span,
+        )
+        env_1: str = Field(default="undefined")
+        kv_1: str = Field(
+            default="undefined", alias=AliasChoices("kv-missing", "kv-secret")
+        )
+        aws_1: str = Field(default="undefined", alias="aws-secret")
+        other: str = Field(default="undefined", alias="other-secret")
+
+    with fake_clients(keyvault=keyvault, secretsmanager=secretsmanager):
+        settings = Settings()
+        report = settings.model_load_report
+        assert reports == [report]
+        assert settings.aws_1 == "aws-value"
+
+        # Sources
+        assert [s.name for s in report.sources] == [
+            "InitSettingsSource",
+            "IndexedEnvSettingsSource",
+            "CachedDotEnvSettingsSource",
+            "SecretsDirSettingsSource",
+            "AzureKeyVault",
+            "AWSSecretsManager",
+            "GCPSecretManager",
+            "DatabricksSecrets",
+        ]
+        sources = {s.name: s for s in report.sources}
+        azure = sources["AzureKeyVault"]
+        aws = sources["AWSSecretsManager"]
+        assert azure.fields == ["kv_1"]
+        assert azure.calls == 4  # kv-missing, kv-secret, aws-secret, other-secret
+        assert azure.cache_misses == 4
+        assert aws.fields == ["aws_1"]
+        assert aws.calls == 1
+        assert report.calls == 5
+
+        # Fields
+        assert report.fields["env_1"].source == "IndexedEnvSettingsSource"
+        assert report.fields["env_1"].calls == 0
+        assert report.fields["kv_1"].source == "AzureKeyVault"
+        assert report.fields["kv_1"].calls == 2
+        assert report.fields["aws_1"].source == "AWSSecretsManager"
+        assert report.fields["aws_1"].calls == 2
+        assert report.fields["other"].source is None
+
+        # Spans
+        names = [n for n, _ in spans]
+        assert names[0] == "settus.load"
+        assert names.count("settus.source") == 8
+        assert names.count("settus.fetch") == 5
+        attributes = {
+            "settus.provider": "azure",
+            "settus.location": KEYVAULT_URL.rstrip("/"),
+            "settus.key": "kv-secret",
+        }
+        assert ("settus.fetch", attributes) in spans
+
+        # Cached load
+        settings = Settings()
+        report = settings.model_load_report
+        assert report.calls == 0
+        assert report.fields["kv_1"].cache_hits == 2
+        assert report.fields["kv_1"].source == "AzureKeyVault"
+        assert len(reports) == 2
+
+
+def test_load_report_async():
+    keyvault = FakeSecretClient({"kv-secret": "kv-value"})
+
+    class Settings(BaseSettings):
+        model_config = SettingsConfigDict(keyvault_url=KEYVAULT_URL)
+        kv_1: str = Field(default="undefined", alias="kv-secret")
+
+    with fake_clients(keyvault=keyvault):
+        settings = asyncio.run(Settings.aload())
+
+    report = settings.model_load_report
+    assert isinstance(report, LoadReport)
+    assert report.fields["kv_1"].source == "AzureKeyVault"
+    assert report.fields["kv_1"].calls == 1
+    assert report.duration > 0
+
+
+def test_load_report_deferred(monkeypatch):
+    monkeypatch.setenv("ENV_1", "v1")
+    keyvault = FakeSecretClient({"kv-secret": "kv-value"})
+
+    class Settings(BaseSettings):
+        model_config = SettingsConfigDict(keyvault_url=KEYVAULT_URL)
+        env_1: str = Field(default="undefined")
+        kv_1: str = Field(default="undefined", alias="kv-secret")
+
+    with fake_clients(keyvault=keyvault):
+        settings = Settings()
+
+    # Only built when requested
+    assert settings._settus_report is None
+    report = settings.model_load_report
+    assert settings.model_load_report is report
+    assert report.fields["env_1"].source == "IndexedEnvSettingsSource"
+    assert report.fields["kv_1"].source == "AzureKeyVault"
+    assert report.fields["kv_1"].calls == 1
+    assert report.duration > 0
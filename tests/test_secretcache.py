@@ -0,0 +1,178 @@
+from pydantic import AliasChoices
+
+from settus import BaseSettings
+from settus import Field
+from settus import SecretCache
+from settus import SettingsConfigDict
+from settus import secret_cache
+
+
+class Clock:
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+
+def test_secret_cache(monkeypatch):
+    import settus.secretcache
+
+    clock = Clock()
+    monkeypatch.setattr(settus.secretcache.time, "monotonic", clock)
+
+    cache = SecretCache()
+    cache.set(("azure", "vault", "a"), "va")
+    cache.set(("azure", "vault", "b"), None)
+    cache.set(("aws", "doc", None), {"a": "va"})
+
+    # TTL
+    assert cache.get(("azure", "vault", "a"), ttl=10) == (True, "va")
+    assert cache.get(("azure", "vault", "b"), ttl=10) == (False, None)
+    assert cache.get(("azure", "vault", "b"), ttl=10, negative_ttl=5) == (True, None)
+    clock.t = 6
+    assert cache.get(("azure", "vault", "a"), ttl=10) == (True, "va")
+    assert cache.get(("azure", "vault", "b"), ttl=10, negative_ttl=5) == (False, None)
+    clock.t = 11
+    assert cache.get(("azure", "vault", "a"), ttl=10) == (False, None)
+
+    # Invalidation
+    assert cache.invalidate(provider="azure") == 2
+    assert len(cache) == 1
+    cache.clear()
+    assert len(cache) == 0
+
+    # LRU eviction
+    cache.set(("azure", "vault", "a"), "va", maxsize=2)
+    cache.set(("azure", "vault", "b"), "vb", maxsize=2)
+    cache.get(("azure", "vault", "a"), ttl=10)
+    cache.set(("azure", "vault", "c"), "vc", maxsize=2)
+    assert cache.get(("azure", "vault", "a"), ttl=10) == (True, "va")
+    assert cache.get(("azure", "vault", "b"), ttl=10) == (False, None)
+    assert cache.get(("azure", "vault", "c"), ttl=10) == (True, "vc")
+
+
+def test_cached_source(monkeypatch):
+    from settus.settingssources import AWSSecretsManager
+
+    calls = []
+
+    def fetch(self, request):
+        calls.append(request[0])
+        return {"vault": {"my-secret": "secretsauce"}}.get(request[0])
+
+    monkeypatch.setattr(AWSSecretsManager, "fetch", fetch)
+    monkeypatch.setattr(AWSSecretsManager, "batch_size", None)
+    secret_cache.clear()
+
+    class Settings(BaseSettings):
+        model_config = SettingsConfigDict(
+            aws_secret_name="vault",
+            secret_cache_ttl=60,
+            secret_cache_negative_ttl=60,
+        )
+        kv_1: str = Field(default="undefined", alias="my-secret")
+        kv_2: str = Field(
+            default="undefined", alias="my-secret", aws_secret_name="missing"
+        )
+
+    for _ in range(3):
+        Settings()
+    assert calls == ["vault", "missing"]
+
+    secret_cache.invalidate(provider="aws", location="vault")
+    Settings()
+    assert calls == ["vault", "missing", "vault"]
+    secret_cache.clear()
+
+
+def test_cache_invalidate_region(monkeypatch):
+    from settus.settingssources import AWSSecretsManager
+
+    calls = []
+
+    def fetch(self, request):
+        calls.append(request[:2])
+        return {"my-secret": "secretsauce"}
+
+    monkeypatch.setattr(AWSSecretsManager, "fetch", fetch)
+    monkeypatch.setattr(AWSSecretsManager, "batch_size", None)
+    secret_cache.clear()
+
+    class Settings(BaseSettings):
+        model_config = SettingsConfigDict(aws_secret_name="vault", secret_cache_ttl=60)
+        kv_1: str = Field(default="undefined", alias="my-secret")
+        kv_2: str = Field(
+            default="undefined", alias="my-secret", aws_region="eu-west-1"
+        )
+
+    Settings()
+    assert calls == [("vault", None), ("vault", "eu-west-1")]
+
+    # Scoped location
+    assert secret_cache.invalidate(provider="aws", location="eu-west-1/vault") == 1
+    Settings()
+    assert calls[2:] == [("vault", "eu-west-1")]
+
+    # Unscoped location, for all regions
+    assert secret_cache.invalidate(provider="aws", location="vault") == 2
+    Settings()
+    assert len(calls) == 5
+    secret_cache.clear()
+
+
+def test_negative_cache(monkeypatch):
+    from settus.settingssources import AWSSecretsManager
+    from settus.settingssources import AzureKeyVault
+
+    aws_calls = []
+    azure_calls = []
+
+    def aws_fetch(self, request):
+        aws_calls.append(request[0])
+        return {"vault-1": {"my-secret": "secretsauce"}, "vault-2": {}}.get(request[0])
+
+    def azure_fetch(self, request):
+        azure_calls.append(request[-1])
+        return {"my-azure-secret": "secretsauce"}.get(request[-1])
+
+    monkeypatch.setattr(AWSSecretsManager, "fetch", aws_fetch)
+    monkeypatch.setattr(AWSSecretsManager, "batch_size", None)
+    monkeypatch.setattr(AzureKeyVault, "fetch", azure_fetch)
+    secret_cache.clear()
+    secret_cache.reset_stats()
+
+    class Settings(BaseSettings):
+        model_config = SettingsConfigDict(
+            aws_secret_name="vault-1",
+            secret_cache_negative_ttl=60,
+        )
+        kv_1: str = Field(default="undefined", alias="my-secret")
+        kv_2: str = Field(
+            default="undefined", alias="missing-key", aws_secret_name="vault-2"
+        )
+        kv_3: str = Field(
+            default="undefined",
+            alias=AliasChoices("not-my-azure-secret", "my-azure-secret"),
+            keyvault_url="https://my-vault.vault.azure.net/",
+        )
+
+    settings = Settings()
+    assert settings.kv_1 == "secretsauce"
+    assert settings.kv_2 == "undefined"
+    assert settings.kv_3 == "secretsauce"
+    assert aws_calls == ["vault-1", "vault-2"]
+    assert azure_calls == ["not-my-azure-secret", "my-azure-secret"]
+
+    # Known missing keys are skipped
+    settings = Settings()
+    assert settings.kv_3 == "secretsauce"
+    assert aws_calls == ["vault-1", "vault-2", "vault-1"]
+    assert azure_calls == [
+        "not-my-azure-secret",
+        "my-azure-secret",
+        "my-azure-secret",
+    ]
+    assert secret_cache.stats()["negative_hits"] == 2
+
+    secret_cache.clear()
@@ -0,0 +1,95 @@
+import os
+
+from settus import BaseSettings
+from settus import Field
+from settus import SettingsConfigDict
+from settus.settingssources import get_secrets_dir_index
+
+
+def test_secrets_dir(tmp_path, monkeypatch):
+    (tmp_path / "secret_1").write_text("s1\n")
+    (tmp_path / "secret_2").write_text("s2")
+    (tmp_path / "Secret-3").write_text("s3")
+    (tmp_path / "unused").write_text("unused")
+    monkeypatch.setenv("SECRET_2", "e2")
+
+    class Settings(BaseSettings):
+        model_config = SettingsConfigDict(secrets_dir=tmp_path)
+        secret_1: str = Field(default="undefined")
+        secret_2: str = Field(default="undefined")
+        secret_3: str = Field(default="undefined", alias="secret-3")
+
+    # Environment variables have precedence and only required files are read
+    settings = Settings()
+    assert settings.secret_1 == "s1"
+    assert settings.secret_2 == "e2"
+    assert settings.secret_3 == "s3"
+    assert settings.model_load_report.fields["secret_1"].source == (
+        "SecretsDirSettingsSource"
+    )
+    index = get_secrets_dir_index(tmp_path)
+    assert (index.listings, index.reads) == (1, 2)
+
+    # Unchanged directory
+    for _ in range(3):
+        Settings()
+    assert (index.listings, index.reads) == (1, 2)
+
+    # Only modified files are read again
+    (tmp_path / "secret_1").write_text("new")
+    assert Settings().secret_1 == "new"
+    assert (index.listings, index.reads) == (1, 3)
+
+
+def test_secrets_dir_kubernetes(tmp_path):
+    # Kubernetes mounted secrets layout
+    data_1 = tmp_path / "..2024_01_01"
+    data_1.mkdir()
+    (data_1 / "secret_1").write_text("v1")
+    (data_1 / "secret_2").write_text("v2")
+    os.symlink(data_1.name, tmp_path / "..data")
+    for name in ["secret_1", "secret_2"]:
+        os.symlink(f"..data/{name}", tmp_path / name)
+
+    class Settings(BaseSettings):
+        model_config = SettingsConfigDict(secrets_dir=tmp_path)
+        secret_1: str = Field(default="undefined")
+        secret_2: str = Field(default="undefined")
+
+    settings = Settings()
+    assert (settings.secret_1, settings.secret_2) == ("v1", "v2")
+    index = get_secrets_dir_index(tmp_path)
+    assert sorted(index.names) == ["secret_1", "secret_2"]
+
+    # Atomic swap of ..data, with files of same size and modification time
+    data_2 = tmp_path / "..2024_01_02"
+    data_2.mkdir()
+    for name, value in [("secret_1", "w1"), ("secret_2", "v2")]:
+        (data_2 / name).write_text(value)
+        st = (data_1 / name).stat()
+        os.utime(data_2 / name, ns=(st.st_atime_ns, st.st_mtime_ns))
+    os.symlink(data_2.name, tmp_path / "..data_tmp")
+    os.replace(tmp_path / "..data_tmp", tmp_path / "..data")
+
+    settings = Settings()
+    assert (settings.secret_1, settings.secret_2) == ("w1", "v2")
+    assert index.reads == 4
+
+
+def test_secrets_dir_case(tmp_path):
+    (tmp_path / "SECRET_1").write_text("upper")
+    (tmp_path / "Secret_2").write_text("mixed")
+
+    class Settings(BaseSettings):
+        model_config = SettingsConfigDict(secrets_dir=tmp_path)
+        secret_1: str = Field(default="undefined")
+        secret_2: str = Field(default="undefined")
+
+    settings = Settings()
+    assert (settings.secret_1, settings.secret_2) == ("upper", "mixed")
+
+    class CaseSettings(Settings):
+        model_config = SettingsConfigDict(case_sensitive=True)
+
+    settings = CaseSettings()
+    assert (settings.secret_1, settings.secret_2) == ("undefined", "undefined")
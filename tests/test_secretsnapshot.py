@@ -0,0 +1,108 @@
+from settus import BaseSettings
+from settus import Field
+from settus import SettingsConfigDict
+
+
+def test_secret_snapshot(monkeypatch, tmp_path):
+    try:
+        from cryptography.fernet import Fernet
+    except ModuleNotFoundError:
+        return
+    from settus.settingssources import AWSSecretsManager
+
+    calls = []
+
+    def fetch(self, request):
+        calls.append(request[0])
+        return {"vault": {"my-secret": "secretsauce"}}.get(request[0])
+
+    monkeypatch.setattr(AWSSecretsManager, "fetch", fetch)
+    monkeypatch.setattr(AWSSecretsManager, "batch_size", None)
+
+    path = tmp_path / "settus.snapshot"
+    key = Fernet.generate_key()
+
+    class Settings(BaseSettings):
+        model_config = SettingsConfigDict(
+            aws_secret_name="vault",
+            secret_snapshot_path=str(path),
+            secret_snapshot_key=key,
+            secret_snapshot_max_age=3600,
+        )
+        kv_1: str = Field(default="undefined", alias="my-secret")
+        kv_2: str = Field(
+            default="undefined", alias="my-other-secret", aws_secret_name="missing"
+        )
+
+    # Cold start
+    settings = Settings()
+    assert settings.kv_1 == "secretsauce"
+    assert calls == ["vault", "missing"]
+    assert path.exists()
+    assert b"secretsauce" not in path.read_bytes()
+
+    # Warm start
+    settings = Settings()
+    assert settings.kv_1 == "secretsauce"
+    assert settings.kv_2 == "undefined"
+    assert calls == ["vault", "missing"]
+
+    # Corrupted snapshot
+    path.write_bytes(b"corrupted")
+    settings = Settings()
+    assert settings.kv_1 == "secretsauce"
+    assert calls == ["vault", "missing"] * 2
+
+    # Snapshot encrypted with another key
+    Settings.model_config["secret_snapshot_key"] = Fernet.generate_key()
+    settings = Settings()
+    assert settings.kv_1 == "secretsauce"
+    assert calls == ["vault", "missing"] * 3
+
+
+def test_secret_snapshot_max_age(monkeypatch, tmp_path):
+    try:
+        from cryptography.fernet import Fernet
+    except ModuleNotFoundError:
+        return
+    from settus.settingssources import AWSSecretsManager
+
+    calls = []
+    documents = {"vault": {"my-secret": "a1"}, "other": {"my-other-secret": "b1"}}
+
+    def fetch(self, request):
+        calls.append(request[0])
+        return documents.get(request[0])
+
+    now = [1_000_000.0]
+    monkeypatch.setattr(AWSSecretsManager, "fetch", fetch)
+    monkeypatch.setattr(AWSSecretsManager, "batch_size", None)
+    monkeypatch.setattr("settus.secretsnapshot.time.time", lambda: now[0])
+
+    class Settings(BaseSettings):
+        model_config = SettingsConfigDict(
+            aws_secret_name="vault",
+            secret_snapshot_path=str(tmp_path / "settus.snapshot"),
+            secret_snapshot_key=Fernet.generate_key(),
+            secret_snapshot_max_age=100,
+        )
+        kv_1: str = Field(default="undefined", alias="my-secret")
+
+    class OtherSettings(Settings):
+        kv_2: str = Field(
+            default="undefined", alias="my-other-secret", aws_secret_name="other"
+        )
+
+    assert Settings().kv_1 == "a1"
+
+    # Snapshot re-written with a new value, older values keep their age
+    now[0] += 60
+    assert OtherSettings().kv_2 == "b1"
+    assert calls == ["vault", "other"]
+
+    # Rotated secret fetched again once expired
+    documents["vault"]["my-secret"] = "a2"
+    now[0] += 60
+    settings = OtherSettings()
+    assert (settings.kv_1, settings.kv_2) == ("a2", "b1")
+    assert calls == ["vault", "other", "vault"]
@@ -0,0 +1,86 @@
+import multiprocessing
+import os
+
+import pytest
+
+from settus import BaseSettings
+from settus import Field
+from settus import SettingsConfigDict
+from settus import SharedSecrets
+from settus import shared_secrets
+from settus.sharedsecrets import SHARED_SECRETS_ENV
+from tests.fakes import FakeSecretClient
+from tests.fakes import fake_clients
+
+SECRETS = {"my-secret": "secretsauce"}
+
+
+class Settings(BaseSettings):
+    model_config = SettingsConfigDict(keyvault_url="https://shared.vault.azure.net/")
+    kv_1: str = Field(default="undefined", alias="my-secret")
+    kv_2: str = Field(default="undefined", alias="my-missing-secret")
+
+
+def build_worker_settings(queue: multiprocessing.Queue) -> None:
+    # Worker with an empty keyvault: values can only come from the parent
+    keyvault = FakeSecretClient({})
+    with fake_clients(keyvault=keyvault):
+        settings = Settings()
+    queue.put((settings.kv_1, settings.kv_2, keyvault.call_count))
+
+
+@pytest.fixture
+def published(tmp_path):
+    keyvault = FakeSecretClient(SECRETS)
+    with fake_clients(keyvault=keyvault):
+        settings = Settings()
+    path = shared_secrets.publish(settings, directory=tmp_path)
+    yield path
+    shared_secrets.close()
+
+
+def test_shared_secrets(published):
+    assert os.environ[SHARED_SECRETS_ENV] == published
+    assert oct(os.stat(published).st_mode)[-3:] == "600"
+    assert len(shared_secrets) == 2
+
+    # No request sent by later loads
+    keyvault = FakeSecretClient({})
+    with fake_clients(keyvault=keyvault):
+        settings = Settings()
+    assert settings.kv_1 == "secretsauce"
+    assert keyvault.call_count == 0
+
+    # Values read from the shared file by another process
+    shared = SharedSecrets()
+    assert shared.attach() == shared_secrets.attach()
+
+    shared_secrets.close()
+    assert not os.path.exists(published)
+    assert SHARED_SECRETS_ENV not in os.environ
+
+
+@pytest.mark.parametrize("method", ["fork", "spawn"])
+def test_shared_secrets_workers(published, method):
+    if method not in multiprocessing.get_all_start_methods():
+        pytest.skip(f"{method} start method not available")
+
+    ctx = multiprocessing.get_context(method)
+    queue = ctx.Queue()
+    worker = ctx.Process(target=build_worker_settings, args=(queue,))
+    worker.start()
+    result = queue.get(timeout=30)
+    worker.join()
+
+    assert result == ("secretsauce", "undefined", 0)
+
+    # Shared file is kept by workers exit
+    assert os.path.exists(published)
+
+
+def test_shared_secrets_unreadable(monkeypatch, tmp_path):
+    monkeypatch.setenv(SHARED_SECRETS_ENV, str(tmp_path / "missing.json"))
+    shared = SharedSecrets()
+    with pytest.warns(UserWarning):
+        assert shared.attach() is None
+    assert shared.attach() is None
@@ -0,0 +1,99 @@
+import asyncio
+import time
+
+import pytest
+
+from settus import BaseSettings
+from settus import Field
+from settus import SecretLoadTimeoutError
+from settus import SettingsConfigDict
+from tests.fakes import FakeSecretClient
+from tests.fakes import fake_clients
+
+KEYVAULT_URL = "https://timeout.vault.azure.net/"
+
+
+def build_settings(**config):
+    class Settings(BaseSettings):
+        model_config = SettingsConfigDict(keyvault_url=KEYVAULT_URL, **config)
+        kv_1: str = Field(default="undefined", alias="my-secret")
+        kv_2: str = Field(default="undefined", alias="my-other-secret")
+        kv_3: str = Field(
+            default="undefined",
+            alias="my-third-secret",
+            secret_timeout_policy="raise",
+        )
+
+    return Settings
+
+
+SECRETS = {
+    "my-secret": "secretsauce",
+    "my-other-secret": "othersauce",
+    "my-third-secret": "thirdsauce",
+}
+
+
+def test_load_timeout_default():
+    keyvault = FakeSecretClient(SECRETS, latency=0.5)
+    Settings = build_settings(secret_load_timeout=0.1)
+
+    with fake_clients(keyvault=keyvault):
+        with pytest.raises(SecretLoadTimeoutError) as e:
+            Settings()
+        # Returned without waiting for the pending call
+        assert keyvault.in_flight == 1
+
+    # Budget is shared: only the first call was sent
+    assert keyvault.call_count == 1
+    assert e.value.fields == {"kv_3": "azure"}
+    assert "kv_3 (azure)" in str(e.value)
+
+    # No error when all fields fall back to defaults
+    Settings = build_settings(secret_load_timeout=0.1, secret_fetch_concurrency=3)
+    keyvault = FakeSecretClient(SECRETS, latency=0.5)
+    with fake_clients(keyvault=keyvault):
+        settings = Settings(kv_3="init")
+    assert settings.kv_1 == "undefined"
+    assert settings.kv_2 == "undefined"
+    assert settings.model_load_report.fields["kv_1"].timed_out
+
+
+def test_load_timeout_cached():
+    keyvault = FakeSecretClient(SECRETS)
+    Settings = build_settings(
+        secret_load_timeout=0.1,
+        secret_timeout_policy="cached",
+        secret_cache_ttl=0.01,
+        secret_fetch_concurrency=3,
+    )
+
+    with fake_clients(keyvault=keyvault):
+        settings = Settings()
+        assert settings.kv_1 == "secretsauce"
+
+        # Cache is expired and provider is slow: stale values are used
+        time.sleep(0.02)
+        keyvault.latency = 0.5
+        keyvault.secrets["my-secret"] = "newsauce"
+        with pytest.raises(SecretLoadTimeoutError):
+            Settings()
+        settings = Settings(kv_3="init")
+        assert settings.kv_1 == "secretsauce"
+        assert settings.kv_2 == "othersauce"
+
+
+def test_load_timeout_async():
+    keyvault = FakeSecretClient(SECRETS, latency=0.5)
+    Settings = build_settings(secret_load_timeout=0.1)
+
+    async def load():
+        settings = await Settings.aload(kv_3="init")
+        return settings, keyvault.in_flight
+
+    with fake_clients(keyvault=keyvault):
+        settings, in_flight = asyncio.run(load())
+    # Returned without waiting for the pending calls
+    assert in_flight > 0
+    assert settings.kv_1 == "undefined"
+    assert settings.kv_3 == "init"